@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .store import BlobStore
+
+
+def _backups_root(dest: Path) -> Path:
+    return Path(dest) / ".bldrx" / "backups"
+
+
+class BackupRun:
+    """Files backed up by a single apply; written as `runs/<id>.json` when saved."""
+
+    def __init__(self, store: "BackupStore", template_name: str):
+        self.store = store
+        ts = datetime.now().strftime("%Y%m%d%H%M%S%f")
+        self.id = f"{template_name.replace('/', '_')}-{ts}"
+        self.template = template_name
+        self.created_at = datetime.now(timezone.utc).isoformat()
+        self.files: Dict[str, Dict[str, Any]] = {}
+
+    def add(self, path: Path, link: bool = False) -> str:
+        """Back up `path` (a file under the store's `dest`) and return its blob digest.
+
+        Pass `link=True` only when `path` is about to be replaced by rename: the blob then shares the original
+        inode and no bytes are copied. A path written more than once in a run (several templates merging into it)
+        keeps its first, pre-apply content in the run index.
+        """
+        path = Path(path)
+        st = path.stat()
+        digest = self.store.blobs.put_file(path, link=link)
+        rel = str(path.relative_to(self.store.dest)).replace("\\", "/")
+        self.files.setdefault(
+            rel, {"hash": digest, "size": st.st_size, "mode": st.st_mode}
+        )
+        return digest
+
+    def restore(self, path: Path, digest: str) -> None:
+        """Copy the blob `digest` back over `path` (used to roll back a failed apply)."""
+        self.store.blobs.materialize(digest, path, link=False)
+
+    def save(self) -> Optional[Path]:
+        """Write the run index (atomically) if anything was backed up and apply the retention policy."""
+        if not self.files:
+            return None
+        runs = self.store.runs_dir
+        runs.mkdir(parents=True, exist_ok=True)
+        path = runs / f"{self.id}.json"
+        tmp = runs / f".{self.id}.json.tmp"
+        tmp.write_text(
+            json.dumps(
+                {
+                    "id": self.id,
+                    "template": self.template,
+                    "created_at": self.created_at,
+                    "files": self.files,
+                },
+                indent=2,
+            ),
+            encoding="utf-8",
+        )
+        os.replace(str(tmp), str(path))
+        self.store.apply_retention()
+        return path
+
+
+class BackupStore:
+    """Deduplicated backups for one project: `dest/.bldrx/backups/{blobs,runs}`.
+
+    Each overwritten file is stored once as a content-addressed blob (hardlinked where possible) and every apply
+    writes a small run index mapping relative paths to blob hashes. Restoring a run is one copy (or link) per file.
+
+    Retention defaults come from `BLDRX_BACKUP_KEEP_RUNS` and `BLDRX_BACKUP_MAX_BYTES` and are applied after each
+    run is saved; `prune()` applies them explicitly.
+    """
+
+    def __init__(
+        self,
+        dest: Path,
+        keep_runs: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ):
+        self.dest = Path(dest)
+        self.root = _backups_root(self.dest)
+        self.blobs = BlobStore(self.root / "blobs")
+        self.runs_dir = self.root / "runs"
+        env_keep = os.getenv("BLDRX_BACKUP_KEEP_RUNS")
+        env_max = os.getenv("BLDRX_BACKUP_MAX_BYTES")
+        self.keep_runs = (
+            keep_runs
+            if keep_runs is not None
+            else (int(env_keep) if env_keep else None)
+        )
+        self.max_bytes = (
+            max_bytes if max_bytes is not None else (int(env_max) if env_max else None)
+        )
+
+    def begin(self, template_name: str) -> BackupRun:
+        self.root.mkdir(parents=True, exist_ok=True)
+        return BackupRun(self, template_name)
+
+    def list_runs(self) -> List[Dict[str, Any]]:
+        """Return run indexes, oldest first."""
+        if not self.runs_dir.exists():
+            return []
+        out = []
+        for p in sorted(self.runs_dir.glob("*.json")):
+            try:
+                out.append(json.loads(p.read_text(encoding="utf-8")))
+            except ValueError:
+                continue
+        out.sort(key=lambda r: (r.get("created_at", ""), r.get("id", "")))
+        return out
+
+    def get_run(self, run_id: str) -> Dict[str, Any]:
+        path = self.runs_dir / f"{run_id}.json"
+        if not path.exists():
+            raise KeyError(f"Backup run '{run_id}' not found")
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def restore(
+        self, run_id: str, link: bool = False, only: Optional[List[str]] = None
+    ) -> List[str]:
+        """Put every file of `run_id` back into `dest` and return the restored relative paths.
+
+        Files are restored as independent copies by default. `link=True` makes each one a hardlink to its blob
+        (one link per file, no bytes copied); bldrx replaces files by rename, but any tool that edits a linked
+        file in place also changes the blob and every run that shares it.
+        """
+        run = self.get_run(run_id)
+        restored: List[str] = []
+        for rel, info in sorted(run.get("files", {}).items()):
+            if only is not None and rel not in only:
+                continue
+            self.blobs.materialize(info["hash"], self.dest / rel, link=link)
+            restored.append(rel)
+        return restored
+
+    def _referenced(self, runs: List[Dict[str, Any]]) -> Dict[str, int]:
+        sizes: Dict[str, int] = {}
+        for r in runs:
+            for info in r.get("files", {}).values():
+                sizes[info["hash"]] = int(info.get("size", 0))
+        return sizes
+
+    def prune(
+        self, keep_runs: Optional[int] = None, max_bytes: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Drop the oldest runs beyond `keep_runs` and until the referenced blobs fit in `max_bytes`, then
+        delete unreferenced blobs. The most recent run is always kept.
+
+        Returns {'removed_runs': [ids], 'freed_bytes': int}.
+        """
+        runs = self.list_runs()
+        removed: List[str] = []
+        if keep_runs is not None:
+            keep = max(int(keep_runs), 1)
+            while len(runs) > keep:
+                removed.append(runs.pop(0)["id"])
+        if max_bytes is not None:
+            while len(runs) > 1 and sum(self._referenced(runs).values()) > max_bytes:
+                removed.append(runs.pop(0)["id"])
+        for run_id in removed:
+            try:
+                (self.runs_dir / f"{run_id}.json").unlink()
+            except FileNotFoundError:
+                pass
+        live = self._referenced(runs)
+        freed = 0
+        for digest in list(self.blobs.digests()):
+            if digest not in live:
+                freed += self.blobs.remove(digest)
+        return {"removed_runs": removed, "freed_bytes": freed}
+
+    def apply_retention(self) -> Optional[Dict[str, Any]]:
+        if self.keep_runs is None and self.max_bytes is None:
+            return None
+        return self.prune(keep_runs=self.keep_runs, max_bytes=self.max_bytes)
@@ -106,6 +106,48 @@ def cli(ctx, developer_metadata, whoami):
     is_flag=True,
     help="Verify template integrity using bldrx-manifest.json before applying",
 )
+@click.option(
+    "--paranoid",
+    is_flag=True,
+    help="With --verify, re-hash every template file instead of trusting the verification cache",
+)
+@click.option(
+    "--stream",
+    "stream_output",
+    is_flag=True,
+    help="Stream rendered output to disk in chunks (constant memory for very large generated files)",
+)
+@click.option(
+    "--journal",
+    "use_journal",
+    is_flag=True,
+    help="Record writes in a write-ahead journal under .bldrx/journal (enables `bldrx recover` / `bldrx undo`)",
+)
+@click.option(
+    "--staged",
+    "use_staging",
+    is_flag=True,
+    help="Render every file into a staging tree first and rename into place only if all succeed",
+)
+@click.option(
+    "--durability",
+    type=click.Choice(["none", "batch", "strict"]),
+    default="none",
+    help="fsync policy for written files: none (default), batch (grouped fsyncs) or strict (per file)",
+)
+@click.option(
+    "--on-conflict",
+    type=click.Choice(["error", "first", "last", "merge"]),
+    default=None,
+    help="When several templates write the same path: fail, keep the first/last template's file, or merge them with "
+    "--merge (default: merge with --merge, else last with --force, otherwise first)",
+)
+@click.option(
+    "--preflight/--no-preflight",
+    "run_preflight",
+    default=True,
+    help="Check variables, target writability and merges before rendering or writing anything (default: on)",
+)
 @click.pass_context
 def new(
     ctx,
@@ -123,7 +165,14 @@ def new(
     only_files,
     exclude_files,
     verify_integrity,
+    paranoid,
     license_id,
+    stream_output,
+    use_journal,
+    use_staging,
+    durability,
+    on_conflict,
+    run_preflight,
 ):
     """Scaffold a new project"""
     engine = Engine()
@@ -169,13 +218,8 @@ def new(
     all_actions = []
 
     # parse only/exclude lists
-    def _parse_csv(s):
-        if not s:
-            return None
-        return [p.strip().replace("\\", "/") for p in s.split(",") if p.strip()]
-
-    only_list = _parse_csv(only_files)
-    exclude_list = _parse_csv(exclude_files)
+    only_list = _split_paths(only_files)
+    exclude_list = _split_paths(exclude_files)
 
     # Inject license template if requested
     if license_id:
@@ -257,35 +301,44 @@ def new(
             )
             raise SystemExit(1)
 
-    for t in cleaned:
-        click.echo(f"Applying template: {t}")
+    if dry_run and as_json:
+        for t in cleaned:
+            click.echo(f"Applying template: {t}")
+            preview = engine.preview_apply(
+                t, dest, metadata, force=force, templates_dir=None
+            )
+            all_actions.extend(preview)
+            for e in preview:
+                click.echo(f"  {e['action']}: {e['path']}")
+    else:
+        # all selected templates form one plan: one conflict check, one transaction, one commit
+        click.echo(f"Applying templates: {', '.join(cleaned)}")
         try:
-            if dry_run and as_json:
-                preview = engine.preview_apply(
-                    t, dest, metadata, force=force, templates_dir=None
-                )
-                all_actions.extend(preview)
-                for e in preview:
-                    click.echo(f"  {e['action']}: {e['path']}")
-            else:
-                for path, status in engine.apply_template(
-                    t,
-                    dest,
-                    metadata,
-                    force=force,
-                    dry_run=dry_run,
-                    atomic=True,
-                    merge=merge_strategy,
-                    verify=verify_integrity,
-                    only_files=only_list,
-                    except_files=exclude_list,
-                ):
-                    click.echo(f"  {status}: {path}")
+            for path, status in engine.apply_templates(
+                cleaned,
+                dest,
+                metadata,
+                on_conflict=_conflict_policy(on_conflict, force, merge_strategy),
+                force=force,
+                dry_run=dry_run,
+                atomic=True,
+                merge=merge_strategy,
+                verify=verify_integrity,
+                paranoid=paranoid,
+                only_files=only_list,
+                except_files=exclude_list,
+                stream=stream_output,
+                journal=use_journal,
+                staged=use_staging,
+                durability=durability,
+                preflight=run_preflight,
+            ):
+                click.echo(f"  {status}: {path}")
         except FileNotFoundError as e:
             click.echo(str(e))
             raise SystemExit(1)
         except Exception as e:
-            click.echo(f"ERROR applying template {t}: {e}")
+            click.echo(f"ERROR applying templates {', '.join(cleaned)}: {e}")
             raise SystemExit(1)
     if dry_run and as_json:
         import json
@@ -328,6 +381,42 @@ def list_templates(as_json, templates_dir, details):
                 click.echo("      (could not list files)")
 
 
+def _project_metadata(ctx, dest, author, email, github_username, meta):
+    """Metadata for rendering into `dest` from the shared author/--meta options."""
+    metadata = {
+        "project_name": dest.name,
+        "author_name": author or "",
+        "email": email or "",
+        "github_username": github_username or "",
+    }
+    # Attach developer metadata if global flag set
+    if ctx.obj.get("developer_metadata"):
+        metadata["developer"] = True
+        metadata["bldrx_version"] = __version__
+        metadata["dev_timestamp"] = datetime.utcnow().isoformat() + "Z"
+    # parse extra metadata
+    for item in meta:
+        if "=" in item:
+            k, v = item.split("=", 1)
+            metadata[k.strip()] = v.strip()
+    return metadata
+
+
+def _conflict_policy(on_conflict, force, merge_strategy):
+    """`--on-conflict` value, or its default: merge when a merge strategy is given, else last/first by --force."""
+    if on_conflict:
+        return on_conflict
+    if merge_strategy:
+        return "merge"
+    return "last" if force else "first"
+
+
+def _split_paths(s):
+    if not s:
+        return None
+    return [p.strip().replace("\\", "/") for p in s.split(",") if p.strip()]
+
+
 @cli.command("add-templates")
 @click.argument("project_path")
 @click.option(
@@ -392,6 +481,55 @@ def list_templates(as_json, templates_dir, details):
     is_flag=True,
     help="Verify template integrity using bldrx-manifest.json before applying",
 )
+@click.option(
+    "--paranoid",
+    is_flag=True,
+    help="With --verify, re-hash every template file instead of trusting the verification cache",
+)
+@click.option(
+    "--stream",
+    "stream_output",
+    is_flag=True,
+    help="Stream rendered output to disk in chunks (constant memory for very large generated files)",
+)
+@click.option(
+    "--journal",
+    "use_journal",
+    is_flag=True,
+    help="Record writes in a write-ahead journal under .bldrx/journal (enables `bldrx recover` / `bldrx undo`)",
+)
+@click.option(
+    "--staged",
+    "use_staging",
+    is_flag=True,
+    help="Render every file into a staging tree first and rename into place only if all succeed",
+)
+@click.option(
+    "--durability",
+    type=click.Choice(["none", "batch", "strict"]),
+    default="none",
+    help="fsync policy for written files: none (default), batch (grouped fsyncs) or strict (per file)",
+)
+@click.option(
+    "--on-conflict",
+    type=click.Choice(["error", "first", "last", "merge"]),
+    default=None,
+    help="When several templates write the same path: fail, keep the first/last template's file, or merge them with "
+    "--merge (default: merge with --merge, else last with --force, otherwise first)",
+)
+@click.option(
+    "--preflight/--no-preflight",
+    "run_preflight",
+    default=True,
+    help="Check variables, target writability and merges before rendering or writing anything (default: on)",
+)
+@click.option(
+    "--locked",
+    "use_lock",
+    is_flag=True,
+    help="Apply the templates pinned in the project's bldrx.lock (see `bldrx lock`) from their recorded source "
+    "(user or package templates, or --templates-dir) without searching other sources; fail if any template changed",
+)
 @click.pass_context
 def add_templates(
     ctx,
@@ -409,7 +547,15 @@ def add_templates(
     only_files,
     exclude_files,
     verify_integrity,
+    paranoid,
     license_id,
+    stream_output,
+    use_journal,
+    use_staging,
+    durability,
+    on_conflict,
+    run_preflight,
+    use_lock,
 ):
     """Inject templates into existing project"""
     engine = Engine()
@@ -417,6 +563,30 @@ def add_templates(
     if not dest.exists():
         click.echo(f"Destination {dest} does not exist")
         raise SystemExit(1)
+    if use_lock:
+        return _add_locked_templates(
+            engine,
+            dest,
+            templates,
+            license_id,
+            _project_metadata(ctx, dest, author, email, github_username, meta),
+            paranoid=paranoid,
+            apply_options=dict(
+                on_conflict=_conflict_policy(on_conflict, force, merge_strategy),
+                force=force,
+                dry_run=dry_run,
+                atomic=True,
+                merge=merge_strategy,
+                only_files=_split_paths(only_files),
+                except_files=_split_paths(exclude_files),
+                stream=stream_output,
+                journal=use_journal,
+                staged=use_staging,
+                durability=durability,
+                preflight=run_preflight,
+            ),
+            templates_dir=templates_dir,
+        )
     if not templates:
         # If a license is provided, use it as the chosen template to avoid interactive prompt
         if license_id:
@@ -431,31 +601,11 @@ def add_templates(
             )
             templates = chosen
     templates = [t.strip() for t in templates.split(",") if t.strip()]
-    metadata = {
-        "project_name": dest.name,
-        "author_name": author or "",
-        "email": email or "",
-        "github_username": github_username or "",
-    }
-    # Attach developer metadata if global flag set
-    if ctx.obj.get("developer_metadata"):
-        metadata["developer"] = True
-        metadata["bldrx_version"] = __version__
-        metadata["dev_timestamp"] = datetime.utcnow().isoformat() + "Z"
-    # parse extra metadata
-    for item in meta:
-        if "=" in item:
-            k, v = item.split("=", 1)
-            metadata[k.strip()] = v.strip()
+    metadata = _project_metadata(ctx, dest, author, email, github_username, meta)
     all_actions = []
 
-    def _parse_csv(s):
-        if not s:
-            return None
-        return [p.strip().replace("\\", "/") for p in s.split(",") if p.strip()]
-
-    only_list = _parse_csv(only_files)
-    exclude_list = _parse_csv(exclude_files)
+    only_list = _split_paths(only_files)
+    exclude_list = _split_paths(exclude_files)
 
     # Inject license template if requested
     if license_id:
@@ -545,35 +695,45 @@ def add_templates(
             )
             raise SystemExit(1)
 
-    for t in cleaned:
-        click.echo(f"Applying template: {t}")
+    if dry_run and as_json:
+        for t in cleaned:
+            click.echo(f"Applying template: {t}")
+            preview = engine.preview_apply(
+                t, dest, metadata, force=force, templates_dir=templates_dir
+            )
+            all_actions.extend(preview)
+            for e in preview:
+                click.echo(f"  {e['action']}: {e['path']}")
+    else:
+        # all selected templates form one plan: one conflict check, one transaction, one commit
+        click.echo(f"Applying templates: {', '.join(cleaned)}")
         try:
-            if dry_run and as_json:
-                preview = engine.preview_apply(
-                    t, dest, metadata, force=force, templates_dir=templates_dir
-                )
-                all_actions.extend(preview)
-                for e in preview:
-                    click.echo(f"  {e['action']}: {e['path']}")
-            else:
-                for path, status in engine.apply_template(
-                    t,
-                    dest,
-                    metadata,
-                    force=force,
-                    dry_run=dry_run,
-                    templates_dir=templates_dir,
-                    atomic=True,
-                    merge=merge_strategy,
-                    only_files=only_list,
-                    except_files=exclude_list,
-                ):
-                    click.echo(f"  {status}: {path}")
+            for path, status in engine.apply_templates(
+                cleaned,
+                dest,
+                metadata,
+                on_conflict=_conflict_policy(on_conflict, force, merge_strategy),
+                force=force,
+                dry_run=dry_run,
+                templates_dir=templates_dir,
+                atomic=True,
+                merge=merge_strategy,
+                verify=verify_integrity,
+                paranoid=paranoid,
+                only_files=only_list,
+                except_files=exclude_list,
+                stream=stream_output,
+                journal=use_journal,
+                staged=use_staging,
+                durability=durability,
+                preflight=run_preflight,
+            ):
+                click.echo(f"  {status}: {path}")
         except FileNotFoundError as e:
             click.echo(str(e))
             raise SystemExit(1)
         except Exception as e:
-            click.echo(f"ERROR applying template {t}: {e}")
+            click.echo(f"ERROR applying templates {', '.join(cleaned)}: {e}")
             raise SystemExit(1)
     if dry_run and as_json:
         import json
@@ -583,6 +743,108 @@ def add_templates(
     click.echo("Done.")
 
 
+def _add_locked_templates(
+    engine,
+    dest,
+    templates,
+    license_id,
+    metadata,
+    paranoid,
+    apply_options,
+    templates_dir=None,
+):
+    """`add-templates --locked`: apply the templates pinned in bldrx.lock at their locked paths."""
+    names = [t.strip() for t in templates.split(",") if t.strip()] or None
+    if license_id:
+        names = (names or []) + [f"licenses/{license_id}"]
+    try:
+        sources = engine.check_lock(
+            dest, names, metadata, paranoid=paranoid, templates_dir=templates_dir
+        )
+    except (FileNotFoundError, ValueError, RuntimeError) as e:
+        click.echo(str(e))
+        raise SystemExit(1)
+    names = list(sources)
+    click.echo(f"Applying locked templates: {', '.join(names)}")
+    try:
+        for path, status in engine.apply_templates(
+            names, dest, metadata, sources=sources, **apply_options
+        ):
+            click.echo(f"  {status}: {path}")
+    except Exception as e:
+        click.echo(f"ERROR applying templates {', '.join(names)}: {e}")
+        raise SystemExit(1)
+    click.echo("Done.")
+
+
+@cli.command("lock")
+@click.argument("project_path")
+@click.option(
+    "--templates",
+    default="",
+    help="Comma separated templates to lock (default: re-lock the templates already in bldrx.lock)",
+)
+@click.option(
+    "--templates-dir",
+    default=None,
+    help="Optional templates root to use for this command",
+)
+@click.option("--author", default=None)
+@click.option("--email", default=None)
+@click.option(
+    "--github-username", default=None, help="GitHub username to populate templates"
+)
+@click.option(
+    "--meta",
+    multiple=True,
+    help="Additional metadata as KEY=VAL; can be passed multiple times",
+)
+@click.option(
+    "--algorithm",
+    type=click.Choice(["sha256", "blake2b"]),
+    default="sha256",
+    help="Digest algorithm for the recorded template hashes",
+)
+@click.option("--json", "as_json", is_flag=True, help="Print the lockfile as JSON")
+@click.pass_context
+def lock_command(
+    ctx,
+    project_path,
+    templates,
+    templates_dir,
+    author,
+    email,
+    github_username,
+    meta,
+    algorithm,
+    as_json,
+):
+    """Pin template sources and hashes in PROJECT_PATH/bldrx.lock (used by `add-templates --locked`)"""
+    import json
+
+    dest = Path(project_path)
+    if not dest.exists():
+        click.echo(f"Destination {dest} does not exist")
+        raise SystemExit(1)
+    engine = Engine()
+    names = [t.strip() for t in templates.split(",") if t.strip()] or None
+    metadata = _project_metadata(ctx, dest, author, email, github_username, meta)
+    try:
+        data = engine.lock_templates(
+            dest, names, metadata, templates_dir=templates_dir, algorithm=algorithm
+        )
+    except (FileNotFoundError, ValueError) as e:
+        click.echo(str(e))
+        raise SystemExit(1)
+    if as_json:
+        click.echo(json.dumps(data, indent=2, sort_keys=True))
+        return
+    for name, entry in sorted(data["templates"].items()):
+        version = entry.get("version") or "-"
+        click.echo(f"  {name} {version} {entry['root'][:12]} ({entry['source']})")
+    click.echo(f"Wrote {dest / 'bldrx.lock'}")
+
+
 @cli.command("remove-template")
 @click.argument("project_path")
 @click.argument("template_name")
@@ -629,8 +891,157 @@ def remove_template(project_path, template_name, templates_dir, yes, force, dry_
     click.echo("Done.")
 
 
+@cli.command("recover")
+@click.argument("project_path")
+def recover(project_path):
+    """Roll back interrupted (crashed) journaled applies in a project"""
+    from .journal import recover as recover_journals
+    from .locks import LockManager
+
+    dest = Path(project_path)
+    if not dest.exists():
+        click.echo(f"Destination {dest} does not exist")
+        raise SystemExit(1)
+    # an apply in progress holds this lock, so its live journal is never mistaken for a crashed one
+    with LockManager().destination(dest):
+        results = recover_journals(dest)
+    if not results:
+        click.echo("Nothing to recover.")
+        return
+    for r in results:
+        verb = "Replayed" if r["action"] == "replayed" else "Rolled back"
+        click.echo(f"{verb} {r['template']} ({r['journal']}):")
+        for path in r["restored"]:
+            click.echo(f"  restored: {path}")
+    click.echo("Done.")
+
+
+@cli.command("undo")
+@click.argument("project_path")
+@click.option("--yes", is_flag=True, help="Skip confirmation")
+def undo(project_path, yes):
+    """Undo the most recent journaled apply in a project"""
+    from .journal import undo as undo_journal
+    from .locks import LockManager
+
+    dest = Path(project_path)
+    if not dest.exists():
+        click.echo(f"Destination {dest} does not exist")
+        raise SystemExit(1)
+    if not yes:
+        confirm = click.confirm(
+            f"Are you sure you want to undo the last apply in {dest}?"
+        )
+        if not confirm:
+            click.echo("Aborted.")
+            raise SystemExit(1)
+    try:
+        with LockManager().destination(dest):
+            r = undo_journal(dest)
+    except FileNotFoundError as e:
+        click.echo(str(e))
+        raise SystemExit(1)
+    click.echo(f"Undid {r['template']} ({r['journal']}):")
+    for path in r["restored"]:
+        click.echo(f"  restored: {path}")
+    click.echo("Done.")
+
+
+@cli.group("backups")
+def backups_group():
+    """Deduplicated apply backups (list/restore/prune)"""
+    pass
+
+
+def _backup_store(project_path):
+    from .backups import BackupStore
+
+    dest = Path(project_path)
+    if not dest.exists():
+        click.echo(f"Destination {dest} does not exist")
+        raise SystemExit(1)
+    return BackupStore(dest)
+
+
+@backups_group.command("list")
+@click.argument("project_path")
+@click.option("--json", "as_json", is_flag=True, help="Output runs as JSON")
+def backups_list(project_path, as_json):
+    store = _backup_store(project_path)
+    runs = store.list_runs()
+    if as_json:
+        import json
+
+        click.echo(json.dumps(runs, indent=2))
+        return
+    if not runs:
+        click.echo("No backups.")
+        return
+    for r in runs:
+        files = r.get("files", {})
+        size = sum(int(f.get("size", 0)) for f in files.values())
+        click.echo(
+            f"{r['id']}  {r.get('created_at', '')}  {len(files)} files, {size} bytes"
+        )
+
+
+@backups_group.command("restore")
+@click.argument("project_path")
+@click.argument("run_id")
+@click.option(
+    "--link/--copy",
+    "as_link",
+    default=False,
+    help="Restore hardlinks to the backup blobs instead of independent copies (default: --copy). "
+    "Editing a linked file in place also changes the backup.",
+)
+@click.option("--yes", is_flag=True, help="Skip confirmation")
+def backups_restore(project_path, run_id, as_link, yes):
+    from .locks import LockManager
+
+    store = _backup_store(project_path)
+    if not yes:
+        confirm = click.confirm(
+            f"Restore backup run '{run_id}' into {store.dest}? Current files will be overwritten"
+        )
+        if not confirm:
+            click.echo("Aborted.")
+            raise SystemExit(1)
+    try:
+        with LockManager().destination(store.dest):
+            restored = store.restore(run_id, link=as_link)
+    except KeyError as ke:
+        click.echo(str(ke))
+        raise SystemExit(1)
+    for path in restored:
+        click.echo(f"  restored: {path}")
+    click.echo("Done.")
+
+
+@backups_group.command("prune")
+@click.argument("project_path")
+@click.option("--keep", type=int, default=None, help="Keep only the newest N runs")
+@click.option(
+    "--max-bytes",
+    type=int,
+    default=None,
+    help="Drop the oldest runs until the kept backups fit in this many bytes",
+)
+def backups_prune(project_path, keep, max_bytes):
+    from .locks import LockManager
+
+    store = _backup_store(project_path)
+    if keep is None and max_bytes is None:
+        keep, max_bytes = store.keep_runs, store.max_bytes
+    with LockManager().destination(store.dest):
+        res = store.prune(keep_runs=keep, max_bytes=max_bytes)
+    for run_id in res["removed_runs"]:
+        click.echo(f"  removed: {run_id}")
+    click.echo(f"Freed {res['freed_bytes']} bytes.")
+
+
 @cli.command("install-template")
-@click.argument("src_path")
+@click.argument("src_path", required=False)
 @click.option(
     "--name",
     default=None,
@@ -643,13 +1054,47 @@ def remove_template(project_path, template_name, templates_dir, yes, force, dry_
     help="Preserve the source top-level folder when installing (wrap contents in that folder)",
 )
 @click.option("--force", is_flag=True, help="Overwrite if the template exists")
-def install_template(src_path, name, wrap_root, force):
+@click.option(
+    "--link",
+    is_flag=True,
+    help="Hardlink files into the shared template store instead of copying them",
+)
+@click.option(
+    "--from-file",
+    "from_file",
+    default=None,
+    help="Install every '<source> [name]' line of this file (dirs, archives, URLs, git+) concurrently",
+)
+@click.option(
+    "--jobs",
+    type=int,
+    default=None,
+    help="Concurrent installs with --from-file (default: up to 8)",
+)
+@click.option(
+    "--no-verify",
+    "no_verify",
+    is_flag=True,
+    help="Skip manifest verification with --from-file",
+)
+def install_template(
+    src_path, name, wrap_root, force, link, from_file, jobs, no_verify
+):
     """Install a template into the user templates directory. If `--name` is omitted an interactive prompt will ask for a name.
 
     By default the contents of `src_path` are installed as the template (content-only). Use `--wrap` to preserve the top-level folder
     from `src_path` as the root inside the installed template (useful when installing a `.github` directory and wanting to keep it at apply time).
+
+    With `--from-file` many templates are installed in parallel and a summary is printed; one failure does not stop the
+    others, but the command exits with status 1 if any install failed.
     """
     engine = Engine()
+    if from_file:
+        _install_from_file(engine, from_file, force, link, jobs, not no_verify)
+        return
+    if not src_path:
+        click.echo("Provide SRC_PATH or --from-file")
+        raise SystemExit(1)
     src = Path(src_path)
     if not src.exists() or not src.is_dir():
         click.echo(f"Source template path '{src}' not found or is not a directory")
@@ -672,7 +1117,7 @@ def install_template(src_path, name, wrap_root, force):
             name = new_name
     try:
         dest = engine.install_user_template(
-            Path(src_path), name=name, force=True, wrap=wrap_root
+            Path(src_path), name=name, force=True, wrap=wrap_root, link=link
         )
         click.echo(f"Installed template to: {dest}")
     except Exception as e:
@@ -680,6 +1125,28 @@ def install_template(src_path, name, wrap_root, force):
         raise SystemExit(1)
 
 
+def _install_from_file(engine, from_file, force, link, jobs, verify):
+    from .install import read_source_list
+
+    try:
+        sources = read_source_list(Path(from_file))
+    except (OSError, ValueError) as e:
+        click.echo(str(e))
+        raise SystemExit(1)
+    results = engine.install_many(
+        sources, force=force, verify=verify, link=link, workers=jobs
+    )
+    for r in results:
+        if r["ok"]:
+            click.echo(f"  ok    {r['name']} <- {r['source']} ({r['seconds']:.2f}s)")
+        else:
+            click.echo(f"  FAIL  {r['source']}: {r['error']}")
+    failed = sum(1 for r in results if not r["ok"])
+    click.echo(f"Installed {len(results) - failed} of {len(results)} templates.")
+    if failed:
+        raise SystemExit(1)
+
+
 @cli.command("uninstall-template")
 @click.argument("name")
 @click.option("--yes", is_flag=True, help="Skip confirmation")
@@ -701,6 +1168,40 @@ def uninstall_template(name, yes):
         raise SystemExit(1)
 
 
+@cli.group("store")
+def store_group():
+    """Shared template store used by linked installs (info/gc)"""
+    pass
+
+
+@store_group.command("info")
+@click.option("--json", "as_json", is_flag=True, help="Output JSON")
+def store_info(as_json):
+    """Show how many linked installs, blobs and bytes the template store holds"""
+    engine = Engine()
+    stats = engine.template_store.stats()
+    if as_json:
+        import json
+
+        click.echo(json.dumps(stats))
+        return
+    click.echo(f"Store: {engine.template_store.root}")
+    click.echo(
+        f"{stats['installs']} linked installs, {stats['blobs']} blobs, {stats['bytes']} bytes"
+    )
+
+
+@store_group.command("gc")
+def store_gc():
+    """Drop records of removed installs and delete unreferenced blobs"""
+    engine = Engine()
+    with engine.template_store.lock():
+        res = engine.template_store.gc()
+    click.echo(
+        f"Removed {res['removed_refs']} stale installs and {res['removed_blobs']} blobs ({res['freed_bytes']} bytes)"
+    )
+
+
 @cli.group("plugin")
 def plugin_group():
     """Plugin management: install/list/remove plugins"""
@@ -805,17 +1306,32 @@ def manifest_group():
     help="Include HMAC-SHA256 signature using BLDRX_MANIFEST_KEY or provided --key",
 )
 @click.option("--key", default=None, help="Explicit HMAC key to use for signing")
-def manifest_create(template_name, templates_dir, output, do_sign, key):
+@click.option(
+    "--merkle",
+    is_flag=True,
+    help="Record per-directory hashes and sign only the root hash",
+)
+@click.option(
+    "--algorithm",
+    type=click.Choice(["sha256", "blake2b"]),
+    default="sha256",
+    help="Manifest digest algorithm: sha256 (default) or blake2b (faster for large assets)",
+)
+def manifest_create(
+    template_name, templates_dir, output, do_sign, key, merkle, algorithm
+):
     """Create a `bldrx-manifest.json` for the given template"""
     engine = Engine()
     try:
         manifest = engine.generate_manifest(
             template_name,
             templates_dir=templates_dir,
-            write=bool(output is None),
+            write=True,
             out_path=Path(output) if output else None,
             sign=do_sign,
             key=key,
+            merkle=merkle,
+            algorithm=algorithm,
         )
         click.echo("Manifest generated:")
         import json
@@ -826,9 +1342,71 @@ def manifest_create(template_name, templates_dir, output, do_sign, key):
         raise SystemExit(1)
 
 
+def _load_manifest_arg(value, algorithm=None):
+    """Load a manifest from a JSON file, or from a template directory (its manifest, else hashed on the fly)."""
+    import json
+
+    from .hashing import DEFAULT_ALGORITHM, hash_tree
+
+    p = Path(value)
+    if p.is_dir():
+        if (p / "bldrx-manifest.json").exists():
+            p = p / "bldrx-manifest.json"
+        else:
+            algorithm = algorithm or DEFAULT_ALGORITHM
+            return {
+                "algorithm": algorithm,
+                "files": hash_tree(p, algorithm=algorithm),
+                "computed": True,
+            }
+    if not p.exists():
+        raise FileNotFoundError(f"Manifest not found: {value}")
+    return json.loads(p.read_text(encoding="utf-8"))
+
+
+@manifest_group.command("diff")
+@click.argument("old")
+@click.argument("new")
+@click.option("--json", "as_json", is_flag=True, help="Output JSON")
+def manifest_diff(old, new, as_json):
+    """Show files added, removed or changed between two manifests (files or template directories).
+
+    Two Merkle manifests (`manifest generate --merkle`) are compared subtree by subtree, skipping unchanged
+    directories; anything else is compared file by file, which costs time proportional to the number of files.
+    """
+    from .merkle import diff
+
+    try:
+        from .hashing import manifest_algorithm
+
+        a = _load_manifest_arg(old)
+        b = _load_manifest_arg(new, algorithm=manifest_algorithm(a))
+        if a.get("computed") and not b.get("computed"):
+            # hash the directory with the algorithm of the manifest it is compared to
+            a = _load_manifest_arg(old, algorithm=manifest_algorithm(b))
+        if manifest_algorithm(a) != manifest_algorithm(b):
+            raise RuntimeError(
+                f"Cannot diff manifests with different algorithms ({manifest_algorithm(a)} vs {manifest_algorithm(b)})"
+            )
+        res = diff(a.get("files", {}), b.get("files", {}), a.get("tree"), b.get("tree"))
+    except Exception as e:
+        click.echo(str(e))
+        raise SystemExit(1)
+    if as_json:
+        import json
+
+        click.echo(json.dumps(res, indent=2))
+        return
+    for prefix, key in (("+", "added"), ("-", "removed"), ("M", "changed")):
+        for rel in res[key]:
+            click.echo(f"{prefix} {rel}")
+    if not any(res.values()):
+        click.echo("No differences")
+
+
 @cli.group("catalog")
 def catalog_group():
-    """Template catalog (publish/search/info/remove)"""
+    """Template catalog (publish/search/info/remove/reindex/migrate)"""
     pass
 
 
@@ -846,10 +1424,18 @@ def catalog_group():
 )
 @click.option("--key", default=None, help="Explicit HMAC key to use for signing")
 @click.option("--force", is_flag=True, help="Overwrite existing catalog entry")
-def catalog_publish(src, name, version, description, tags, do_sign, key, force):
-    from .registry import Registry
+@click.option(
+    "--algorithm",
+    type=click.Choice(["sha256", "blake2b"]),
+    default="sha256",
+    help="Manifest digest algorithm: sha256 (default) or blake2b (faster for large assets)",
+)
+def catalog_publish(
+    src, name, version, description, tags, do_sign, key, force, algorithm
+):
+    from .registry import open_registry
 
-    r = Registry()
+    r = open_registry()
     try:
         meta = r.publish(
             Path(src),
@@ -860,6 +1446,7 @@ def catalog_publish(src, name, version, description, tags, do_sign, key, force):
             force=force,
             sign=do_sign,
             key=key,
+            algorithm=algorithm,
         )
         import json
 
@@ -873,31 +1460,145 @@ def catalog_publish(src, name, version, description, tags, do_sign, key, force):
         raise SystemExit(1)
 
 
+@catalog_group.command("publish-all")
+@click.argument("root", type=click.Path(exists=True, file_okay=False))
+@click.option(
+    "--version",
+    default="0.0.0",
+    show_default=True,
+    help="Version for templates whose bldrx-manifest.json does not set one",
+)
+@click.option(
+    "--tags", default="", help="Comma-separated tags for templates that set none"
+)
+@click.option(
+    "--sign",
+    "do_sign",
+    is_flag=True,
+    help="Sign manifests with HMAC using BLDRX_MANIFEST_KEY or --key",
+)
+@click.option("--key", default=None, help="Explicit HMAC key to use for signing")
+@click.option("--force", is_flag=True, help="Overwrite existing catalog entries")
+@click.option(
+    "--algorithm",
+    type=click.Choice(["sha256", "blake2b"]),
+    default="sha256",
+    help="Manifest digest algorithm: sha256 (default) or blake2b (faster for large assets)",
+)
+@click.option(
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Templates hashed in parallel (default: up to 8)",
+)
+@click.option(
+    "--json",
+    "as_json",
+    is_flag=True,
+    help="Output machine-readable JSON for automation",
+)
+def catalog_publish_all(
+    root, version, tags, do_sign, key, force, algorithm, jobs, as_json
+):
+    """Publish every template directory under ROOT, skipping unchanged ones, in one registry update"""
+    from .registry import open_registry
+
+    sources = sorted(
+        p for p in Path(root).iterdir() if p.is_dir() and not p.name.startswith(".")
+    )
+    try:
+        results = open_registry().publish_many(
+            sources,
+            version=version,
+            tags=[t for t in tags.split(",") if t],
+            force=force,
+            sign=do_sign,
+            key=key,
+            algorithm=algorithm,
+            workers=jobs,
+        )
+    except (FileExistsError, FileNotFoundError, RuntimeError, ValueError) as e:
+        click.echo(f"ERROR: {e}")
+        raise SystemExit(1)
+    if as_json:
+        import json
+
+        click.echo(json.dumps(results, indent=2))
+        return
+    for res in results:
+        click.echo(f"  {res['status']:<10} {res['name']} {res['version']}")
+    published = sum(1 for res in results if res["status"] == "published")
+    click.echo(
+        f"Published {published} of {len(results)} templates"
+        f" ({len(results) - published} unchanged)."
+    )
+
+
 @catalog_group.command("search")
 @click.argument("query", default="", required=False)
-def catalog_search(query):
-    from .registry import Registry
-
-    r = Registry()
-    res = r.search(query)
+@click.option(
+    "--limit", type=click.IntRange(min=0), default=None, help="Show at most N results"
+)
+@click.option(
+    "--offset",
+    type=click.IntRange(min=0),
+    default=0,
+    help="Skip the first N results (for paging with --limit)",
+)
+@click.option(
+    "--fields",
+    default="name,version,description",
+    show_default=True,
+    help="Comma-separated entry fields to show (e.g. name,version,tags,path; `manifest` loads each shown entry)",
+)
+@click.option(
+    "--jsonl",
+    "as_jsonl",
+    is_flag=True,
+    help="Print one JSON object per line as results are found (for scripts and shell completion)",
+)
+def catalog_search(query, limit, offset, fields, as_jsonl):
+    """Search the catalog by name, description or tags"""
     import json
 
-    click.echo(json.dumps(res, indent=2))
+    from .registry import open_registry
+
+    r = open_registry()
+    results = r.iter_search(
+        query,
+        limit=limit,
+        offset=offset,
+        fields=[f.strip() for f in fields.split(",") if f.strip()] or None,
+    )
+    if as_jsonl:
+        for rec in results:
+            click.echo(json.dumps(rec))
+        return
+    click.echo(json.dumps(list(results), indent=2))
 
 
 @catalog_group.command("info")
 @click.argument("name")
-@click.option("--version", default=None)
+@click.option(
+    "--version",
+    default=None,
+    help="Exact version or range (^1.2, ~=2.0, >=1,<2, latest); NAME@SPEC works too",
+)
 def catalog_info(name, version):
-    from .registry import Registry
-
-    r = Registry()
+    """Show the catalog entry NAME (or NAME@SPEC) at the highest matching version"""
+    from .registry import open_registry
+    from .semver import split_spec
+
+    name, spec = split_spec(name)
+    if spec and version:
+        raise click.UsageError("Give the version either as NAME@SPEC or --version")
+    r = open_registry()
     try:
-        e = r.get(name, version=version)
+        e = r.get(name, version=spec or version)
         import json
 
         click.echo(json.dumps(e, indent=2))
-    except KeyError as ke:
+    except (KeyError, ValueError) as ke:
         click.echo(str(ke))
         raise SystemExit(1)
 
@@ -914,9 +1615,9 @@ def catalog_remove(name, version, yes):
         if not confirm:
             click.echo("Aborted.")
             raise SystemExit(1)
-    from .registry import Registry
+    from .registry import open_registry
 
-    r = Registry()
+    r = open_registry()
     try:
         removed = r.remove(name, version=version)
         import json
@@ -927,6 +1628,32 @@ def catalog_remove(name, version, yes):
         raise SystemExit(1)
 
 
+@catalog_group.command("reindex")
+def catalog_reindex():
+    """Rebuild the catalog index from the entry files (after manual edits or copies)"""
+    from .registry import open_registry
+
+    count = open_registry().rebuild_index()
+    click.echo(f"Indexed {count} catalog entries.")
+
+
+@catalog_group.command("migrate")
+@click.option(
+    "--force",
+    is_flag=True,
+    help="Overwrite entries that already exist in the SQLite database",
+)
+def catalog_migrate(force):
+    """Copy the JSON catalog into an SQLite database (registry.db) and use it from then on"""
+    from .registry import migrate_to_sqlite
+
+    res = migrate_to_sqlite(force=force)
+    click.echo(
+        f"Migrated {res['migrated']} of {res['found']} catalog entries to {res['database']}"
+        + (f" ({res['skipped']} already present)" if res["skipped"] else "")
+    )
+
+
 @cli.command("preview-template")
 @click.argument("template_name")
 @click.option(
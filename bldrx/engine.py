@@ -4,10 +4,96 @@ import os
 import shutil
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Generator, List, Optional, Tuple
+from typing import Any, Dict, Generator, Iterator, List, Optional, Set, Tuple
 
 from .renderer import Renderer
 
+# chunk size used when streaming rendered output or existing file contents to disk
+_STREAM_CHUNK_SIZE = 64 * 1024
+
+# how apply_templates resolves an output path produced by more than one template
+CONFLICT_POLICIES = ("error", "first", "last", "merge")
+
+DURABILITY_LEVELS = ("none", "batch", "strict")
+# number of written files fsynced together in `batch` durability mode
+_FSYNC_BATCH_SIZE = 64
+
+
+def _fsync_path(path: Path, is_dir: bool = False) -> None:
+    """fsync a file or directory by path (directories are skipped on Windows, which cannot open them)."""
+    if is_dir and os.name == "nt":
+        return
+    # Windows requires a writable handle for fsync; POSIX accepts read-only descriptors
+    fd = os.open(str(path), os.O_RDWR if os.name == "nt" else os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class _Syncer:
+    """Apply a durability level to the files written by one apply.
+
+    - none: never fsync (fastest; a power loss can leave empty or missing files)
+    - batch: fsync written files in groups of `_FSYNC_BATCH_SIZE` (issued concurrently so the filesystem can
+      coalesce journal commits) and fsync every touched directory once in `finish()`
+    - strict: fsync each file before it is renamed into place and its directory right after
+    """
+
+    def __init__(self, level: str, root: Path):
+        if level not in DURABILITY_LEVELS:
+            raise ValueError(
+                f"Unknown durability level '{level}'; expected one of {', '.join(DURABILITY_LEVELS)}"
+            )
+        self.level = level
+        self.root = Path(root)
+        self._pending: List[Path] = []
+        self._dirs: set = set()
+
+    def _dirs_for(self, path: Path) -> List[Path]:
+        # the file's directory plus any parents created for it, up to (and including) the apply root
+        out = [path.parent]
+        while out[-1] != self.root and self.root in out[-1].parents:
+            out.append(out[-1].parent)
+        return out
+
+    def staged(self, path: Path) -> None:
+        """`path` holds complete data and is about to be renamed into place."""
+        if self.level == "strict":
+            _fsync_path(path)
+
+    def written(self, path: Path, staged: bool = False) -> None:
+        """`path` is in its final place; `staged` tells whether its data was already passed to `staged()`."""
+        if self.level == "strict":
+            if not staged:
+                _fsync_path(path)
+            for d in self._dirs_for(path):
+                _fsync_path(d, is_dir=True)
+        elif self.level == "batch":
+            self._pending.append(path)
+            self._dirs.update(self._dirs_for(path))
+            if len(self._pending) >= _FSYNC_BATCH_SIZE:
+                self._flush_files()
+
+    def _flush_files(self) -> None:
+        if not self._pending:
+            return
+        from concurrent.futures import ThreadPoolExecutor
+
+        group, self._pending = self._pending, []
+        with ThreadPoolExecutor(max_workers=min(8, len(group))) as pool:
+            list(pool.map(_fsync_path, group))
+
+    def finish(self) -> None:
+        """Flush outstanding batched fsyncs (files first, then each touched directory once)."""
+        if self.level != "batch":
+            return
+        self._flush_files()
+        # deepest directories first so new subdirectories are durable before their parents' entries
+        for d in sorted(self._dirs, key=lambda p: len(p.parts), reverse=True):
+            _fsync_path(d, is_dir=True)
+        self._dirs = set()
+
 
 def _default_user_templates_dir() -> Path:
     # Platform-aware default user templates location
@@ -18,12 +104,191 @@ def _default_user_templates_dir() -> Path:
         return Path.home() / ".bldrx" / "templates"
 
 
+def _archive_stem(path: Path) -> str:
+    """Return an archive's name without its archive suffixes (`cool.tar.gz` -> `cool`)."""
+    name = Path(path).name
+    for suffix in (
+        ".tar.gz",
+        ".tar.bz2",
+        ".tar.xz",
+        ".tgz",
+        ".tbz2",
+        ".txz",
+        ".tar",
+        ".zip",
+        ".gz",
+    ):
+        if name.endswith(suffix):
+            return name[: -len(suffix)]
+    return name
+
+
+def _utf8_chunks(path: Path) -> Iterator[str]:
+    """Yield the contents of `path` decoded as UTF-8, reading `_STREAM_CHUNK_SIZE` bytes at a time.
+
+    Raises UnicodeDecodeError on invalid or truncated UTF-8.
+    """
+    import codecs
+
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    with Path(path).open("rb") as fh:
+        while True:
+            chunk = fh.read(_STREAM_CHUNK_SIZE)
+            if not chunk:
+                break
+            text = decoder.decode(chunk)
+            if text:
+                yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def _check_install_name(name: str) -> str:
+    """Return `name` if it can name a directory directly under the user templates root, else raise ValueError."""
+    seps = [s for s in (os.sep, os.altsep, "/", "\\") if s]
+    if not name or name in (".", "..") or any(s in name for s in seps):
+        raise ValueError(
+            f"Invalid template name '{name}'; pass name= to choose the install name"
+        )
+    return name
+
+
+class PreflightError(RuntimeError):
+    """Raised when the pre-flight check rejects an apply; `report` is the `Engine.preflight` result."""
+
+    def __init__(self, report: Dict[str, Any]):
+        self.report = report
+        lines = [f"{p['path']}: {p['message']}" for p in report.get("problems", [])]
+        super().__init__("Pre-flight check failed:\n  " + "\n  ".join(lines))
+
+
+# merge strategies apply_template understands (anything else overwrites)
+MERGE_STRATEGIES = ("append", "prepend", "marker", "patch")
+
+
+def _required_variables(parsed: Any) -> Set[str]:
+    """Return the undeclared variables of a parsed template that must be supplied by the caller.
+
+    A read is guarded when it is the operand of a `default` filter or a `defined`/`undefined` test, or sits in
+    the branch of an `if`, conditional expression or `and`/`or` that such a test selects. Names only ever read
+    under a guard are optional; one unguarded read makes a name required. `year` is always provided by the engine.
+    """
+    from jinja2 import meta, nodes
+
+    undeclared = set(meta.find_undeclared_variables(parsed))
+    unguarded: Set[str] = set()
+
+    def _tested(test: Any, name: str) -> Set[str]:
+        # names a `defined`/`undefined` test proves defined in the branch it selects
+        if (
+            isinstance(test, nodes.Test)
+            and test.name == name
+            and isinstance(test.node, nodes.Name)
+        ):
+            return {test.node.name}
+        if isinstance(test, nodes.Not):
+            return _tested(test.node, "undefined" if name == "defined" else "defined")
+        return set()
+
+    def _walk(node: Any, guarded: Set[str]) -> None:
+        if isinstance(node, nodes.Name):
+            if node.ctx == "load" and node.name not in guarded:
+                unguarded.add(node.name)
+            return
+        if isinstance(node, nodes.Filter) and node.name in ("default", "d"):
+            if not isinstance(node.node, nodes.Name):
+                _walk(node.node, guarded)
+            for child in [*node.args, *node.kwargs]:
+                _walk(child, guarded)
+            return
+        if isinstance(node, nodes.Test) and node.name in ("defined", "undefined"):
+            if not isinstance(node.node, nodes.Name):
+                _walk(node.node, guarded)
+            return
+        if isinstance(node, (nodes.If, nodes.CondExpr)):
+            _walk(node.test, guarded)
+            yes = guarded | _tested(node.test, "defined")
+            no = guarded | _tested(node.test, "undefined")
+            if isinstance(node, nodes.If):
+                for child in node.body:
+                    _walk(child, yes)
+                for child in [*node.elif_, *node.else_]:
+                    _walk(child, no)
+            else:
+                _walk(node.expr1, yes)
+                if node.expr2 is not None:
+                    _walk(node.expr2, no)
+            return
+        if isinstance(node, (nodes.And, nodes.Or)):
+            _walk(node.left, guarded)
+            proven = "defined" if isinstance(node, nodes.And) else "undefined"
+            _walk(node.right, guarded | _tested(node.left, proven))
+            return
+        for child in node.iter_child_nodes():
+            _walk(child, guarded)
+
+    _walk(parsed, set())
+    return (undeclared & unguarded) - {"year"}
+
+
+def _unconditional_names(parsed: Any) -> Set[str]:
+    """Return the names a parsed template reads on every render.
+
+    Names read only inside an `if`/`elif`/`else` branch, a conditional expression branch, the right operand of
+    `and`/`or`, a `for` body or a macro/call block may never be evaluated, so they are left out.
+    """
+    from jinja2 import nodes
+
+    found: Set[str] = set()
+
+    def _walk(node: Any, conditional: bool) -> None:
+        if isinstance(node, nodes.Name):
+            if node.ctx == "load" and not conditional:
+                found.add(node.name)
+            return
+        if isinstance(node, nodes.If):
+            _walk(node.test, conditional)
+            for child in [*node.body, *node.elif_, *node.else_]:
+                _walk(child, True)
+            return
+        if isinstance(node, nodes.CondExpr):
+            _walk(node.test, conditional)
+            _walk(node.expr1, True)
+            if node.expr2 is not None:
+                _walk(node.expr2, True)
+            return
+        if isinstance(node, (nodes.And, nodes.Or)):
+            _walk(node.left, conditional)
+            _walk(node.right, True)
+            return
+        if isinstance(node, nodes.For):
+            _walk(node.iter, conditional)
+            for child in [*node.body, *node.else_]:
+                _walk(child, True)
+            if node.test is not None:
+                _walk(node.test, True)
+            return
+        if isinstance(node, (nodes.Macro, nodes.CallBlock)):
+            if isinstance(node, nodes.CallBlock):
+                _walk(node.call, conditional)
+            for child in node.body:
+                _walk(child, True)
+            return
+        for child in node.iter_child_nodes():
+            _walk(child, conditional)
+
+    _walk(parsed, False)
+    return found
+
+
 class Engine:
     def __init__(
         self,
         templates_root: Optional[Path] = None,
         user_templates_root: Optional[Path] = None,
         user_plugins_root: Optional[Path] = None,
+        locks_root: Optional[Path] = None,
     ):
         # packaged templates root (inside the package)
         self.package_templates_root = templates_root or (
@@ -50,6 +315,22 @@ class Engine:
 
             self.user_plugins_root = _default_user_plugins_dir()
 
+        # lock manager (destination applies, user template installs)
+        from .locks import LockManager
+
+        self.locks = LockManager(locks_root)
+
+        # content-addressed store for linked template installs (next to the user templates root by default,
+        # so hardlinks stay on one filesystem)
+        from .store import TemplateStore
+
+        env_store = os.getenv("BLDRX_STORE_DIR")
+        self.template_store = TemplateStore(
+            Path(env_store).expanduser()
+            if env_store
+            else self.user_templates_root.parent / "store"
+        )
+
         # Ensure user templates dir exists (but do NOT create it by default). It will be created on install-template.
         self.renderer = Renderer(
             [str(self.user_templates_root), str(self.package_templates_root)]
@@ -101,7 +382,8 @@ class Engine:
         names = set()
         if self.user_templates_root.exists():
             for p in self.user_templates_root.iterdir():
-                if p.is_dir():
+                # dot-directories are in-progress installs (see bldrx.install)
+                if p.is_dir() and not p.name.startswith("."):
                     names.add(p.name)
         if self.package_templates_root.exists():
             for p in self.package_templates_root.iterdir():
@@ -118,7 +400,7 @@ class Engine:
         info = []
         if self.user_templates_root.exists():
             for p in self.user_templates_root.iterdir():
-                if p.is_dir():
+                if p.is_dir() and not p.name.startswith("."):
                     info.append((p.name, "user"))
         if self.package_templates_root.exists():
             for p in self.package_templates_root.iterdir():
@@ -400,6 +682,8 @@ class Engine:
         out_path: Optional[Path] = None,
         sign: bool = False,
         key: Optional[str] = None,
+        merkle: bool = False,
+        algorithm: str = "sha256",
     ) -> Dict[str, Any]:
         """Generate a `bldrx-manifest.json` for a template.
 
@@ -410,6 +694,10 @@ class Engine:
         - out_path: explicit file path to write the manifest to
         - sign: if True, include an HMAC-SHA256 signature under the 'hmac' key
         - key: explicit HMAC key to use (falls back to `BLDRX_MANIFEST_KEY` env var if not provided)
+        - merkle: if True, also record a hash per directory under 'tree' and the root hash under 'root'; the
+          signature then covers only the root hash (see `bldrx.merkle`)
+        - algorithm: file/directory digest algorithm, recorded under 'algorithm' (see `bldrx.hashing.HASH_ALGORITHMS`;
+          blake2b is considerably faster than the default sha256 on large assets)
 
         Returns:
             Manifest dictionary describing file checksums and optional HMAC signature.
@@ -419,16 +707,17 @@ class Engine:
         import json
         import os
 
+        from .hashing import check_algorithm, hash_tree
+        from .merkle import tree_hashes
+
+        check_algorithm(algorithm)
         src = self._find_template_src(template_name, templates_dir)
-        files: Dict[str, str] = {}
-        for p in src.rglob("*"):
-            if p.is_dir():
-                continue
-            rel = str(p.relative_to(src)).replace("\\", "/")
-            h = hashlib.sha256()
-            h.update(p.read_bytes())
-            files[rel] = h.hexdigest()
-        manifest: Dict[str, Any] = {"files": files}
+        files: Dict[str, str] = hash_tree(src, algorithm=algorithm)
+        manifest: Dict[str, Any] = {"algorithm": algorithm, "files": files}
+        if merkle:
+            tree = tree_hashes(files, algorithm)
+            manifest["tree"] = tree
+            manifest["root"] = tree[""]
         if sign:
             use_key = key or os.getenv("BLDRX_MANIFEST_KEY")
             if not use_key:
@@ -436,7 +725,9 @@ class Engine:
                     "Signing requested but no key provided via `key` param or BLDRX_MANIFEST_KEY env var"
                 )
             canonical = json.dumps(
-                {"files": files}, sort_keys=True, separators=(",", ":")
+                {"root": manifest["root"]} if merkle else {"files": files},
+                sort_keys=True,
+                separators=(",", ":"),
             ).encode("utf-8")
             manifest["hmac"] = hmac.new(
                 use_key.encode("utf-8"), canonical, hashlib.sha256
@@ -448,12 +739,26 @@ class Engine:
         return manifest
 
     def verify_template(
-        self, template_name: str, templates_dir: Optional[Path] = None
+        self,
+        template_name: str,
+        templates_dir: Optional[Path] = None,
+        paranoid: bool = False,
+        only: Optional[List[str]] = None,
     ) -> Dict[str, Any]:
         """Verify template integrity based on a manifest file `bldrx-manifest.json`.
 
-        Manifest format: {"files": {"rel/path": "sha256hex", ...},
-                          "hmac": "hexhmac" (optional - HMAC-SHA256 over canonical files object)
+        File digests are cached by stat signature (`bldrx.hashing.HashCache`), so only files that changed since
+        the last verification are re-hashed; `paranoid=True` re-hashes every file.
+
+        `only` restricts content checks to the given files / directory subtrees (matched like `--only`). For
+        Merkle manifests the directory hashes are still recomputed from the full file list and checked against
+        the signed root, so a partial check is as trustworthy as a full one for the files it covers.
+
+        Manifest format: {"algorithm": "sha256"|"blake2b" (optional - defaults to sha256),
+                          "files": {"rel/path": "hexdigest", ...},
+                          "tree": {"dir": "sha256hex", ...} (optional - Merkle directory hashes, '' is the root),
+                          "root": "sha256hex" (optional - equals tree['']),
+                          "hmac": "hexhmac" (optional - HMAC-SHA256 over canonical root, or files object)
                          }
         Returns: {
             'ok': bool,
@@ -461,7 +766,8 @@ class Engine:
             'missing': [relpaths],
             'manifest_missing': bool,
             'signature_present': bool,
-            'signature_valid': True|False|None
+            'signature_valid': True|False|None,
+            'tree_valid': True|False|None (None for flat manifests)
         }
         """
         import hashlib
@@ -469,6 +775,9 @@ class Engine:
         import json
         import os
 
+        from .hashing import HashCache, manifest_algorithm, verify_files
+        from .merkle import select, tree_hashes
+
         src = self._find_template_src(template_name, templates_dir)
         manifest_path = src / "bldrx-manifest.json"
         if not manifest_path.exists():
@@ -479,21 +788,31 @@ class Engine:
                 "manifest_missing": True,
                 "signature_present": False,
                 "signature_valid": None,
+                "tree_valid": None,
             }
         manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
         files: Dict[str, str] = manifest.get("files", {})
-        mismatches: List[str] = []
-        missing: List[str] = []
-        for rel, expected in files.items():
-            fpath = src / rel
-            if not fpath.exists():
-                missing.append(rel)
-                continue
-            h = hashlib.sha256()
-            h.update(fpath.read_bytes())
-            actual = h.hexdigest()
-            if actual != expected:
-                mismatches.append(rel)
+        algorithm = manifest_algorithm(manifest)
+        tree_valid = None
+        if "root" in manifest:
+            tree = tree_hashes(files, algorithm)
+            tree_valid = tree[""] == manifest["root"] and all(
+                tree.get(d) == h for d, h in manifest.get("tree", {}).items()
+            )
+        selected = (
+            {rel: files[rel] for rel in select(files, only)}
+            if only is not None
+            else files
+        )
+        checked = verify_files(
+            src,
+            selected,
+            algorithm=algorithm,
+            cache=HashCache(src),
+            paranoid=paranoid,
+        )
+        mismatches: List[str] = checked["mismatches"]
+        missing: List[str] = checked["missing"]
         # Optional HMAC signature verification (HMAC-SHA256)
         signature = manifest.get("hmac") or manifest.get("signature")
         signature_present = bool(signature)
@@ -504,7 +823,13 @@ class Engine:
                 signature_valid = False
             else:
                 canonical = json.dumps(
-                    {"files": files}, sort_keys=True, separators=(",", ":")
+                    (
+                        {"root": manifest["root"]}
+                        if "root" in manifest
+                        else {"files": files}
+                    ),
+                    sort_keys=True,
+                    separators=(",", ":"),
                 ).encode("utf-8")
                 expected_sig = hmac.new(
                     key.encode("utf-8"), canonical, hashlib.sha256
@@ -514,6 +839,7 @@ class Engine:
             (not mismatches)
             and (not missing)
             and (signature_valid is not False if signature_present else True)
+            and tree_valid is not False
         )
         return {
             "ok": ok,
@@ -522,7 +848,172 @@ class Engine:
             "manifest_missing": False,
             "signature_present": signature_present,
             "signature_valid": signature_valid,
+            "tree_valid": tree_valid,
+        }
+
+    def _template_origin(self, src: Path, templates_dir: Optional[Path]) -> str:
+        """Return which source `src` was resolved from ('templates-dir', 'user', 'package' or 'path')."""
+        roots = [
+            ("templates-dir", templates_dir),
+            ("user", self.user_templates_root),
+            ("package", self.package_templates_root),
+        ]
+        for origin, root in roots:
+            if root and Path(root).resolve() in src.parents:
+                return origin
+        return "path"
+
+    def _origin_root(
+        self, origin: str, templates_dir: Optional[Path]
+    ) -> Optional[Path]:
+        """Return the local root directory of template source kind `origin` (None for 'path' or no templates dir)."""
+        roots = {
+            "templates-dir": templates_dir,
+            "user": self.user_templates_root,
+            "package": self.package_templates_root,
         }
+        root = roots.get(origin)
+        return Path(root).resolve() if root else None
+
+    def lock_templates(
+        self,
+        dest: Path,
+        template_names: Optional[List[str]] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        templates_dir: Optional[Path] = None,
+        algorithm: str = "sha256",
+    ) -> Dict[str, Any]:
+        """Resolve `template_names` and pin them in `dest/bldrx.lock` (see `bldrx.lockfile`).
+
+        Parameters:
+        - dest: project directory holding the lockfile
+        - template_names: templates to (re-)lock; entries already in the lockfile for other templates are kept.
+          If omitted, every template already in the lockfile is re-locked.
+        - metadata: metadata the project is rendered with; its hash is recorded so a locked apply with different
+          metadata is rejected
+        - templates_dir: optional override for template sources
+        - algorithm: digest algorithm of the recorded root hashes
+
+        Each entry records {'source': 'templates-dir'|'user'|'package'|'path', 'path', 'version', 'algorithm',
+        'root', 'metadata_hash'}, where 'path' is the template directory relative to its source root (so the
+        lockfile can be committed and checked on other machines), 'version' is the `version` field of the template's
+        manifest (the bldrx version for package templates without one) and 'root' is the Merkle root hash of its
+        files. Only templates outside every source root ('path') are recorded by absolute path.
+
+        Returns:
+            The lockfile contents that were written.
+        """
+        import json
+
+        from . import __version__
+        from .hashing import check_algorithm
+        from .lockfile import (
+            LOCKFILE_VERSION,
+            metadata_hash,
+            read_lockfile,
+            template_root_hash,
+            write_lockfile,
+        )
+
+        check_algorithm(algorithm)
+        dest = Path(dest)
+        try:
+            data = read_lockfile(dest)
+        except FileNotFoundError:
+            data = {"version": LOCKFILE_VERSION, "templates": {}}
+        names = (
+            list(template_names)
+            if template_names is not None
+            else sorted(data["templates"])
+        )
+        if not names:
+            raise ValueError("No templates to lock")
+        meta_hash = metadata_hash(metadata)
+        for name in names:
+            src = self._find_template_src(name, templates_dir).resolve()
+            origin = self._template_origin(src, templates_dir)
+            version = None
+            manifest_path = src / "bldrx-manifest.json"
+            if manifest_path.exists():
+                version = json.loads(manifest_path.read_text(encoding="utf-8")).get(
+                    "version"
+                )
+            if version is None and origin == "package":
+                version = __version__
+            root = self._origin_root(origin, templates_dir)
+            data["templates"][name] = {
+                "source": origin,
+                "path": (
+                    src.relative_to(root).as_posix() if root is not None else str(src)
+                ),
+                "version": version,
+                "algorithm": algorithm,
+                "root": template_root_hash(src, algorithm),
+                "metadata_hash": meta_hash,
+            }
+        write_lockfile(dest, data)
+        return data
+
+    def check_lock(
+        self,
+        dest: Path,
+        template_names: Optional[List[str]] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        paranoid: bool = False,
+        templates_dir: Optional[Path] = None,
+    ) -> Dict[str, Path]:
+        """Check templates against `dest/bldrx.lock` and return {template name: locked directory}.
+
+        No template search happens: each entry's path is joined to the local root of its recorded source kind
+        (`templates_dir` for 'templates-dir' entries, this engine's user or package templates root otherwise), the
+        template there is hashed (with cached digests unless `paranoid`) and compared with the locked root hash,
+        which is what guarantees the content is the locked one. If `metadata` is given its hash must match too.
+        `template_names` defaults to every locked template.
+
+        Raises:
+            FileNotFoundError: if there is no lockfile.
+            RuntimeError: listing every template that is not locked, missing, or whose files or metadata changed.
+        """
+        from .lockfile import metadata_hash, read_lockfile, template_root_hash
+
+        locked = read_lockfile(Path(dest))["templates"]
+        names = list(template_names) if template_names is not None else sorted(locked)
+        problems: List[str] = []
+        paths: Dict[str, Path] = {}
+        meta_hash = metadata_hash(metadata) if metadata is not None else None
+        for name in names:
+            entry = locked.get(name)
+            if entry is None:
+                problems.append(f"{name}: not in bldrx.lock")
+                continue
+            src = Path(entry["path"])
+            if not src.is_absolute():
+                root = self._origin_root(entry.get("source", ""), templates_dir)
+                if root is None:
+                    problems.append(
+                        f"{name}: locked from a {entry.get('source')} source; pass its templates dir"
+                    )
+                    continue
+                src = root / src
+            if not src.is_dir():
+                problems.append(f"{name}: locked path {src} is missing")
+                continue
+            if (
+                template_root_hash(src, entry.get("algorithm", "sha256"), paranoid)
+                != entry["root"]
+            ):
+                problems.append(f"{name}: files changed since it was locked")
+                continue
+            if meta_hash is not None and entry.get("metadata_hash") != meta_hash:
+                problems.append(f"{name}: metadata differs from the locked metadata")
+                continue
+            paths[name] = src
+        if problems:
+            raise RuntimeError(
+                "Lockfile check failed (re-run `bldrx lock` to accept the changes): "
+                + "; ".join(problems)
+            )
+        return paths
 
     def apply_template(
         self,
@@ -535,48 +1026,419 @@ class Engine:
         backup: bool = False,
         git_commit: bool = False,
         git_message: Optional[str] = None,
+        git_mode: str = "index",
+        git_branch: Optional[str] = None,
         atomic: bool = False,
         merge: Optional[str] = None,
         verify: bool = False,
+        paranoid: bool = False,
         only_files: Optional[List[str]] = None,
         except_files: Optional[List[str]] = None,
+        stream: bool = False,
+        journal: bool = False,
+        staged: bool = False,
+        durability: str = "none",
+        preflight: bool = False,
+        lock_timeout: Optional[float] = None,
     ) -> Generator[Tuple[str, str], None, None]:
         """Apply the named template into `dest`.
 
         New options:
-        - backup: if True, save overwritten files into `dest/.bldrx/backups/<timestamp>/...` before writing.
-        - git_commit: if True and `dest` is a git repo, stage & commit changes after apply with `git_message`.
+        - backup: if True, save overwritten files as deduplicated blobs under `dest/.bldrx/backups/` and index them
+          as one backup run (see `bldrx.backups.BackupStore`; list/restore/prune with `bldrx backups`).
+        - git_commit: if True and `dest` is a git repo, commit the files written by this apply with `git_message`.
+          Only those paths are staged (`--pathspec-from-file`); other changes in the working tree are left alone.
+        - git_mode: `index` (default) commits on the checked-out branch as above; `plumbing` builds the commit with
+          `hash-object`/`update-index`/`write-tree`/`commit-tree` in a private index and moves `git_branch`
+          (default `bldrx/<template_name>`) to it, leaving the repo's index, HEAD and working tree untouched.
         - atomic: if True, perform per-file atomic replace with rollback on failure.
         - merge: optional strategy to handle existing files (append|prepend|marker|patch). If None, default behavior applies (skip or overwrite with force).
         - verify: if True, verify checksums using `bldrx-manifest.json` before applying; raise on mismatch.
+          Unchanged files are not re-hashed (see `verify_template`) unless `paranoid` is True.
+        - stream: if True, render `.j2` files chunk-by-chunk (`Template.generate()`) straight into a temp file next
+          to the target and perform append/prepend merges by streaming copy, so peak memory does not grow with the
+          output size. The `marker` merge strategy still needs the whole existing file and is applied in memory.
+        - journal: if True (implies `atomic`), record every write in a write-ahead journal under
+          `dest/.bldrx/journal/` and move overwritten files aside by rename. Any failure rolls the whole apply back;
+          a crashed apply can be rolled back later with `bldrx recover` and the last apply undone with `bldrx undo`.
+        - staged: if True, render/merge/copy every output into a staging tree under `dest/.bldrx/staging/` and check
+          target writability first; only when all of that succeeded does a tight commit loop rename the staged
+          files into place. A failed render leaves `dest` untouched. Write statuses are reported after the commit.
+        - durability: `none` (default, no fsync), `batch` (fsync written files in groups and each touched directory
+          once at the end) or `strict` (fsync every file before it is renamed into place and its directory after).
+        - preflight: if True, run `preflight()` checks (required variables, target writability, merge applicability)
+          before anything is rendered or written, and raise PreflightError listing every problem found. Variables
+          read only under a condition are warnings, not problems: if the branch runs without them the render fails
+          as it would without preflight.
+        - lock_timeout: seconds to wait for the exclusive per-destination apply lock (None waits indefinitely).
+          Concurrent applies into the same `dest` are serialized; dry runs do not take the lock.
         """
-        import subprocess
+        kwargs: Dict[str, Any] = dict(
+            template_names=[template_name],
+            dest=dest,
+            metadata=metadata,
+            force=force,
+            dry_run=dry_run,
+            templates_dir=templates_dir,
+            backup=backup,
+            git_commit=git_commit,
+            git_message=git_message,
+            git_mode=git_mode,
+            git_branch=git_branch,
+            atomic=atomic,
+            merge=merge,
+            verify=verify,
+            paranoid=paranoid,
+            only_files=only_files,
+            except_files=except_files,
+            stream=stream,
+            journal=journal,
+            staged=staged,
+            durability=durability,
+            preflight=preflight,
+        )
+        if dry_run:
+            yield from self._apply_templates(**kwargs)
+            return
+        with self.locks.destination(dest, timeout=lock_timeout):
+            yield from self._apply_templates(**kwargs)
 
-        src = self._find_template_src(template_name, templates_dir)
+    def apply_templates(
+        self,
+        template_names: List[str],
+        dest: Path,
+        metadata: Optional[Dict[str, Any]] = None,
+        on_conflict: str = "error",
+        lock_timeout: Optional[float] = None,
+        **options: Any,
+    ) -> Generator[Tuple[str, str], None, None]:
+        """Apply several templates into `dest` as one transaction.
+
+        The templates are walked as one merged plan under a single destination lock: one journal/staging tree, one
+        backup run, one atomic rollback scope and (with `git_commit`) one commit. Before anything is rendered the
+        planned output paths are compared across templates:
+        - on_conflict: `error` (default) raises RuntimeError listing every path produced by more than one template;
+          `first`/`last` keep the output of the first/last template listing that path and report the others as
+          `skipped-conflict`; `merge` (requires the `merge` option) applies every template's output in order, each
+          merged into the result of the previous ones. Raw (non-`.j2`) files are not merged, so the last one wins.
+
+        Every other keyword option of `apply_template` is accepted and applies to all templates, plus:
+        - sources: {template name: directory} used instead of resolving those names with `_find_template_src`
+          (e.g. the paths returned by `check_lock`).
+        """
+        if on_conflict not in CONFLICT_POLICIES:
+            raise ValueError(
+                f"Unknown on_conflict '{on_conflict}'; expected one of {', '.join(CONFLICT_POLICIES)}"
+            )
+        if on_conflict == "merge" and not options.get("merge"):
+            raise ValueError("on_conflict 'merge' requires a merge strategy")
+        kwargs: Dict[str, Any] = dict(
+            options,
+            template_names=list(template_names),
+            dest=dest,
+            metadata=metadata,
+            on_conflict=on_conflict,
+        )
+        if options.get("dry_run"):
+            yield from self._apply_templates(**kwargs)
+            return
+        with self.locks.destination(dest, timeout=lock_timeout):
+            yield from self._apply_templates(**kwargs)
+
+    def _resolve_sources(
+        self,
+        template_names: List[str],
+        templates_dir: Optional[Path],
+        sources: Optional[Dict[str, Path]],
+    ) -> List[Tuple[str, Path]]:
+        return [
+            (
+                name,
+                (
+                    Path(sources[name])
+                    if sources and name in sources
+                    else self._find_template_src(name, templates_dir)
+                ),
+            )
+            for name in template_names
+        ]
+
+    def _plan_conflicts(
+        self,
+        srcs: List[Tuple[str, Path]],
+        only_set: Optional[Set[str]],
+        except_set: Optional[Set[str]],
+    ) -> Dict[str, List[int]]:
+        """Return {target relpath: [template indexes]} for outputs produced by more than one of `srcs`."""
+        owners: Dict[str, List[int]] = {}
+        for idx, (_name, src) in enumerate(srcs):
+            for p in src.rglob("*"):
+                if p.is_dir():
+                    continue
+                rel = str(p.relative_to(src)).replace("\\", "/")
+                if p.suffix == ".j2":
+                    rel = rel[:-3]
+                if only_set is not None and rel not in only_set:
+                    continue
+                if except_set is not None and rel in except_set:
+                    continue
+                idxs = owners.setdefault(rel, [])
+                if idx not in idxs:
+                    idxs.append(idx)
+        return {rel: idxs for rel, idxs in owners.items() if len(idxs) > 1}
+
+    def preflight(
+        self,
+        template_names: List[str],
+        dest: Path,
+        metadata: Optional[Dict[str, Any]] = None,
+        force: bool = False,
+        merge: Optional[str] = None,
+        only_files: Optional[List[str]] = None,
+        except_files: Optional[List[str]] = None,
+        templates_dir: Optional[Path] = None,
+        on_conflict: str = "error",
+        sources: Optional[Dict[str, Path]] = None,
+    ) -> Dict[str, Any]:
+        """Check in one pass, without rendering anything, whether applying `template_names` into `dest` can succeed.
+
+        For every file that would be written it checks that the template parses and that its required variables
+        (as computed statically, like `validate_template`) are present in the merged metadata, that the target can
+        be created or replaced, and that a requested merge can be applied to the existing file. Paths written by
+        several templates are reported when `on_conflict` is `error` (with `merge` they are all checked).
+
+        Variables read only under a condition (an `if` branch, a loop body, ...) may legitimately be undefined, so
+        missing ones are reported under 'warnings' rather than 'problems' and do not make the check fail.
+
+        Returns {'ok': bool, 'checked': int, 'problems': [{'template', 'path', 'check', 'message'}], 'warnings': [...]}
+        where `check` is one of 'syntax', 'variables', 'writable', 'merge' or 'conflict'.
+        """
+        srcs = self._resolve_sources(template_names, templates_dir, sources)
+        only_set = set(p.replace("\\", "/") for p in only_files) if only_files else None
+        except_set = (
+            set(p.replace("\\", "/") for p in except_files) if except_files else None
+        )
+        problems: List[Dict[str, Any]] = []
+        losers: Set[Tuple[int, str]] = set()
+        if len(srcs) > 1:
+            for rel, idxs in sorted(
+                self._plan_conflicts(srcs, only_set, except_set).items()
+            ):
+                if on_conflict == "error":
+                    problems.append(
+                        {
+                            "template": ", ".join(srcs[i][0] for i in idxs),
+                            "path": str(Path(dest) / rel),
+                            "check": "conflict",
+                            "message": "written by more than one template",
+                        }
+                    )
+                elif on_conflict != "merge":
+                    keep = idxs[0] if on_conflict == "first" else idxs[-1]
+                    losers.update((i, rel) for i in idxs if i != keep)
+        found, warnings, checked = self._preflight(
+            srcs, Path(dest), metadata, force, merge, only_set, except_set, losers
+        )
+        problems.extend(found)
+        return {
+            "ok": not problems,
+            "checked": checked,
+            "problems": problems,
+            "warnings": warnings,
+        }
+
+    def _preflight(
+        self,
+        srcs: List[Tuple[str, Path]],
+        dest: Path,
+        metadata: Optional[Dict[str, Any]],
+        force: bool,
+        merge: Optional[str],
+        only_set: Optional[Set[str]],
+        except_set: Optional[Set[str]],
+        losers: Set[Tuple[int, str]],
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], int]:
+        """One walk over `srcs` applying the pre-flight checks; returns (problems, warnings, number of files checked)."""
+        import json
+
+        from jinja2 import Environment, exceptions
+
+        problems: List[Dict[str, Any]] = []
+        warnings: List[Dict[str, Any]] = []
+        checked = 0
+        # writability is a property of the target directory, so check each one once
+        dir_errors: Dict[Path, Optional[str]] = {}
+        env = Environment()
+        for idx, (name, src) in enumerate(srcs):
+            defaults: Dict[str, Any] = {}
+            md_path = src / "ci_metadata.json"
+            if md_path.exists():
+                try:
+                    defaults = json.loads(md_path.read_text(encoding="utf-8"))
+                except Exception:
+                    defaults = {}
+            provided = set(defaults) | set(metadata or {})
+
+            def _problem(
+                path: Path, check: str, message: str, warning: bool = False
+            ) -> None:
+                (warnings if warning else problems).append(
+                    {
+                        "template": name,
+                        "path": str(path),
+                        "check": check,
+                        "message": message,
+                    }
+                )
+
+            for p in src.rglob("*"):
+                if p.is_dir():
+                    continue
+                is_template = p.suffix == ".j2"
+                rel = str(p.relative_to(src)).replace("\\", "/")
+                rel_out = rel[:-3] if is_template else rel
+                if only_set is not None and rel_out not in only_set:
+                    continue
+                if except_set is not None and rel_out in except_set:
+                    continue
+                if (idx, rel_out) in losers:
+                    continue
+                target = dest / rel_out
+                exists = target.exists()
+                if exists and not force and not merge:
+                    # skipped by apply; nothing will be written
+                    continue
+                checked += 1
+                if is_template:
+                    try:
+                        text = "".join(_utf8_chunks(p))
+                    except UnicodeDecodeError:
+                        # binary templates are skipped by apply
+                        continue
+                    try:
+                        parsed = env.parse(text)
+                    except exceptions.TemplateSyntaxError as e:
+                        _problem(target, "syntax", f"{rel}: {e}")
+                        continue
+                    missing = _required_variables(parsed) - provided
+                    always = missing & _unconditional_names(parsed)
+                    if always:
+                        _problem(
+                            target,
+                            "variables",
+                            f"{rel} needs undefined variable(s): {', '.join(sorted(always))}",
+                        )
+                    if missing - always:
+                        _problem(
+                            target,
+                            "variables",
+                            f"{rel} may need undefined variable(s) (used under a condition): "
+                            f"{', '.join(sorted(missing - always))}",
+                            warning=True,
+                        )
+                    if merge and exists:
+                        if merge not in MERGE_STRATEGIES:
+                            _problem(
+                                target, "merge", f"unknown merge strategy '{merge}'"
+                            )
+                        elif not target.is_file():
+                            _problem(target, "merge", "cannot merge into a non-file")
+                        else:
+                            try:
+                                # validated chunk by chunk so a large target is never held in memory
+                                for _ in _utf8_chunks(target):
+                                    pass
+                            except UnicodeDecodeError:
+                                _problem(
+                                    target,
+                                    "merge",
+                                    f"cannot {merge}-merge into a non UTF-8 file",
+                                )
+                            except OSError as e:
+                                _problem(target, "merge", f"cannot read: {e}")
+                if target.parent not in dir_errors:
+                    try:
+                        self._check_writable(target.parent / ".bldrx-preflight")
+                        dir_errors[target.parent] = None
+                    except PermissionError as e:
+                        dir_errors[target.parent] = str(e).split(": ", 1)[-1]
+                err = dir_errors[target.parent]
+                if err is None and target.is_dir():
+                    err = "a directory is in the way"
+                if err is not None:
+                    _problem(target, "writable", err)
+        return problems, warnings, checked
+
+    def _apply_templates(
+        self,
+        template_names: List[str],
+        dest: Path,
+        metadata: Optional[Dict[str, Any]] = None,
+        force: bool = False,
+        dry_run: bool = False,
+        templates_dir: Optional[Path] = None,
+        backup: bool = False,
+        git_commit: bool = False,
+        git_message: Optional[str] = None,
+        git_mode: str = "index",
+        git_branch: Optional[str] = None,
+        atomic: bool = False,
+        merge: Optional[str] = None,
+        verify: bool = False,
+        paranoid: bool = False,
+        only_files: Optional[List[str]] = None,
+        except_files: Optional[List[str]] = None,
+        stream: bool = False,
+        journal: bool = False,
+        staged: bool = False,
+        durability: str = "none",
+        preflight: bool = False,
+        on_conflict: str = "error",
+        sources: Optional[Dict[str, Path]] = None,
+    ) -> Generator[Tuple[str, str], None, None]:
+        """Unlocked implementation of `apply_template`/`apply_templates`; callers must hold the destination lock."""
+        from .gitops import GIT_MODES
+
+        if git_mode not in GIT_MODES:
+            raise ValueError(
+                f"Unknown git_mode '{git_mode}'; expected one of {', '.join(GIT_MODES)}"
+            )
+        srcs = self._resolve_sources(template_names, templates_dir, sources)
+        # journal/backup label and default git branch for the whole transaction
+        template_name = "+".join(template_names)
+        sync = _Syncer(durability, dest)
         dest.mkdir(parents=True, exist_ok=True)
 
-        # prepare backups root if requested
-        backups_root = None
-        if backup:
-            ts = datetime.now().strftime("%Y%m%d%H%M%S")
-            backups_root = dest / ".bldrx" / "backups" / f"{template_name}-{ts}"
-            backups_root.mkdir(parents=True, exist_ok=True)
+        # start a deduplicated backup run if requested (indexed when the apply finishes)
+        backup_run = None
+        if backup and not dry_run:
+            from .backups import BackupStore
+
+            backup_run = BackupStore(dest).begin(template_name)
 
         made_changes = False
+        # final paths written by this apply (what a git commit stages)
+        written: List[Path] = []
 
         # Keep global state for atomic replacements so we can rollback across multiple files
-        global_replaced: List[Tuple[Path, Optional[Path]]] = (
+        global_replaced: List[Tuple[Path, Optional[str]]] = (
             []
-        )  # list of (final_path, backup_path or None)
+        )  # list of (final_path, backup blob digest or None)
         global_new_created: List[Path] = []
 
         # Verify manifest if requested
         if verify:
-            vres = self.verify_template(template_name, templates_dir=templates_dir)
-            if not vres.get("ok"):
-                raise RuntimeError(
-                    f"Template verification failed: mismatches={vres.get('mismatches')}, missing={vres.get('missing')}, signature_present={vres.get('signature_present')}, signature_valid={vres.get('signature_valid')}"
+            for name, _src in srcs:
+                vres = self.verify_template(
+                    name,
+                    templates_dir=templates_dir,
+                    paranoid=paranoid,
+                    only=list(only_files) if only_files else None,
                 )
+                if not vres.get("ok"):
+                    raise RuntimeError(
+                        f"Template verification failed: mismatches={vres.get('mismatches')}, missing={vres.get('missing')}, signature_present={vres.get('signature_present')}, signature_valid={vres.get('signature_valid')}, tree_valid={vres.get('tree_valid')}"
+                    )
 
         # Prepare inclusion/exclusion sets
         def _norm_target_path(rel_path, is_template):
@@ -593,291 +1455,598 @@ class Engine:
             set([p.replace("\\", "/") for p in except_files]) if except_files else None
         )
 
+        # paths several templates would write: fail or pick one owner before anything is rendered
+        losers: Set[Tuple[int, str]] = set()
+        if len(srcs) > 1 and on_conflict != "merge":
+            conflicts = self._plan_conflicts(srcs, only_set, except_set)
+            if conflicts and on_conflict == "error":
+                listing = "; ".join(
+                    f"{rel} ({', '.join(srcs[i][0] for i in idxs)})"
+                    for rel, idxs in sorted(conflicts.items())
+                )
+                raise RuntimeError(f"Templates write the same paths: {listing}")
+            for conflict_rel, idxs in conflicts.items():
+                keep = idxs[0] if on_conflict == "first" else idxs[-1]
+                losers.update((i, conflict_rel) for i in idxs if i != keep)
+        if preflight:
+            problems, warnings, checked = self._preflight(
+                srcs, dest, metadata, force, merge, only_set, except_set, losers
+            )
+            if problems:
+                raise PreflightError(
+                    {
+                        "ok": False,
+                        "checked": checked,
+                        "problems": problems,
+                        "warnings": warnings,
+                    }
+                )
+
         # Walk files
         BINARY_SIZE_THRESHOLD = 1_000_000  # bytes; files larger than this are considered large and skipped unless forced
-        for p in src.rglob("*"):
-            rel = p.relative_to(src)
-            target = dest / rel
-
-            # evaluate include/exclude filters
-            rel_for_match = _norm_target_path(rel, is_template=(p.suffix == ".j2"))
-            if only_set is not None and rel_for_match not in only_set:
-                # skip this file entirely
-                continue
-            if except_set is not None and rel_for_match in except_set:
-                continue
-
-            if p.is_dir():
-                target.mkdir(parents=True, exist_ok=True)
-                continue
-            # if it's a template file
-            if p.suffix == ".j2":
-                out_path = target.with_suffix("")
-                # detect binary/non-utf8 template file
-                raw = p.read_bytes()
-                try:
-                    raw.decode("utf-8")
-                except Exception:
-                    if dry_run:
-                        yield (str(out_path), "would-skip-binary")
-                    else:
-                        yield (str(out_path), "skipped-binary")
+        txn = None
+        if journal:
+            atomic = True
+            if not dry_run:
+                from .journal import Journal
+
+                txn = Journal.begin(dest, template_name)
+        staging_root: Optional[Path] = None
+        # (staged file, final target, status) for the commit phase of a staged apply
+        staged_ops: List[Tuple[Path, Path, str]] = []
+        # directories of the template, created in dest only by the commit phase
+        staged_dirs: List[Path] = []
+        if staged and not dry_run:
+            ts = datetime.now().strftime("%Y%m%d%H%M%S%f")
+            staging_root = dest / ".bldrx" / "staging" / f"{ts}-{os.getpid()}"
+            staging_root.mkdir(parents=True)
+            if txn is not None:
+                txn.stage(staging_root)
+        # one merged walk over every template's files, in template order
+        walk = (
+            (idx, src, p)
+            for idx, (_name, src) in enumerate(srcs)
+            for p in src.rglob("*")
+        )
+        try:
+            for idx, src, p in walk:
+                rel = p.relative_to(src)
+                target = dest / rel
+
+                # evaluate include/exclude filters
+                rel_for_match = _norm_target_path(rel, is_template=(p.suffix == ".j2"))
+                if only_set is not None and rel_for_match not in only_set:
+                    # skip this file entirely
                     continue
-                if out_path.exists() and not force and not merge:
-                    yield (str(out_path), "skipped")
+                if except_set is not None and rel_for_match in except_set:
+                    continue
+                if (idx, rel_for_match) in losers:
+                    yield (str(dest / rel_for_match), "skipped-conflict")
                     continue
-                # Render using the selected template src as the loader root so that
-                # template resolution uses the chosen source (user or package) rather than the global loader order
-                from jinja2 import Environment, FileSystemLoader, StrictUndefined
 
-                rel_template_path = str(rel).replace("\\", "/")
-                # load per-template defaults if present
-                defaults = {}
-                md_path = src / "ci_metadata.json"
-                if md_path.exists():
+                if p.is_dir():
+                    if staging_root is not None:
+                        (staging_root / "files" / rel).mkdir(
+                            parents=True, exist_ok=True
+                        )
+                        staged_dirs.append(target)
+                    else:
+                        target.mkdir(parents=True, exist_ok=True)
+                    continue
+                # if it's a template file
+                if p.suffix == ".j2":
+                    out_path = target.with_suffix("")
+                    # detect binary/non-utf8 template file
+                    raw = p.read_bytes()
                     try:
-                        import json
-
-                        defaults = json.loads(md_path.read_text(encoding="utf-8"))
+                        raw.decode("utf-8")
                     except Exception:
-                        defaults = {}
-                merged_meta = {**defaults, **(metadata or {})}
-                env = Environment(
-                    loader=FileSystemLoader(str(src)), undefined=StrictUndefined
-                )
-                tmpl = env.get_template(rel_template_path)
-                text = tmpl.render(**{**merged_meta, "year": datetime.now().year})
-                if dry_run:
-                    yield (str(out_path), "would-render")
-                    continue
-
-                # Merge handling: if merge strategy provided and target exists, compute merged text
-                if merge and out_path.exists():
-                    existing_text = out_path.read_text(encoding="utf-8")
-                    if merge == "append":
-                        merged_text = existing_text.rstrip("\r\n") + "\n" + text
-                    elif merge == "prepend":
-                        merged_text = text + "\n" + existing_text
-                    elif merge == "marker":
-                        # use target filename (without .j2) as marker identifier
-                        marker_name = out_path.name
-                        start = f"<!-- bldrx:start:{marker_name} -->"
-                        end = f"<!-- bldrx:end:{marker_name} -->"
-                        if start in existing_text and end in existing_text:
-                            pre, rest = existing_text.split(start, 1)
-                            _, post = rest.split(end, 1)
-                            merged_text = pre + start + "\n" + text + "\n" + end + post
+                        if dry_run:
+                            yield (str(out_path), "would-skip-binary")
                         else:
-                            # fallback to append if no markers found
+                            yield (str(out_path), "skipped-binary")
+                        continue
+                    if out_path.exists() and not force and not merge:
+                        yield (str(out_path), "skipped")
+                        continue
+                    # Render using the selected template src as the loader root so that
+                    # template resolution uses the chosen source (user or package) rather than the global loader order
+                    from jinja2 import Environment, FileSystemLoader, StrictUndefined
+
+                    rel_template_path = str(rel).replace("\\", "/")
+                    # load per-template defaults if present
+                    defaults = {}
+                    md_path = src / "ci_metadata.json"
+                    if md_path.exists():
+                        try:
+                            import json
+
+                            defaults = json.loads(md_path.read_text(encoding="utf-8"))
+                        except Exception:
+                            defaults = {}
+                    merged_meta = {**defaults, **(metadata or {})}
+                    env = Environment(
+                        loader=FileSystemLoader(str(src)), undefined=StrictUndefined
+                    )
+                    tmpl = env.get_template(rel_template_path)
+                    render_ctx = {**merged_meta, "year": datetime.now().year}
+                    # what a merge builds on: an earlier template's staged output for this path, else the dest file
+                    staged_path = (
+                        staging_root / "files" / out_path.relative_to(dest)
+                        if staging_root is not None
+                        else None
+                    )
+                    already_staged = staged_path is not None and staged_path.exists()
+                    existing: Path = (
+                        staged_path
+                        if staged_path is not None and already_staged
+                        else out_path
+                    )
+                    # marker merges need the full existing text, so they are never streamed
+                    use_stream = stream and not (
+                        merge == "marker" and existing.exists()
+                    )
+                    if use_stream:
+                        if dry_run:
+                            # still render (and discard) so missing variables surface in dry-run
+                            for _chunk in tmpl.generate(**render_ctx):
+                                pass
+                            yield (str(out_path), "would-render")
+                            continue
+                        text = ""
+                    else:
+                        text = tmpl.render(**render_ctx)
+                        if dry_run:
+                            yield (str(out_path), "would-render")
+                            continue
+                    stream_merge = merge if (merge and existing.exists()) else None
+
+                    # Merge handling: if merge strategy provided and target exists, compute merged text
+                    if use_stream:
+                        merged_text = ""
+                    elif merge and existing.exists():
+                        existing_text = existing.read_text(encoding="utf-8")
+                        if merge == "append":
                             merged_text = existing_text.rstrip("\r\n") + "\n" + text
+                        elif merge == "prepend":
+                            merged_text = text + "\n" + existing_text
+                        elif merge == "marker":
+                            # use target filename (without .j2) as marker identifier
+                            marker_name = out_path.name
+                            start = f"<!-- bldrx:start:{marker_name} -->"
+                            end = f"<!-- bldrx:end:{marker_name} -->"
+                            if start in existing_text and end in existing_text:
+                                pre, rest = existing_text.split(start, 1)
+                                _, post = rest.split(end, 1)
+                                merged_text = (
+                                    pre + start + "\n" + text + "\n" + end + post
+                                )
+                            else:
+                                # fallback to append if no markers found
+                                merged_text = existing_text.rstrip("\r\n") + "\n" + text
+                        else:
+                            # unknown merge strategy: fall back to overwrite
+                            merged_text = text
                     else:
-                        # unknown merge strategy: fall back to overwrite
                         merged_text = text
-                else:
-                    merged_text = text
-
-                # perform atomic write/replace if requested
-                if atomic:
-                    ts = datetime.now().strftime("%Y%m%d%H%M%S")
-                    tmp_name = out_path.name + f".bldrx.tmp.{ts}"
-                    tmp_path = out_path.parent / tmp_name
-                    # write to temp file in same dir (ensures os.replace is atomic)
-                    out_path.parent.mkdir(parents=True, exist_ok=True)
-                    # write merged text if merge applied
-                    tmp_path.write_text(merged_text, encoding="utf-8")
-                    replaced: List[Tuple[Path, Optional[Path]]] = (
-                        []
-                    )  # list of tuples (final_path, backup_path or None)
-                    new_created: List[Path] = []
-                    try:
-                        # backup existing if needed
-                        if out_path.exists() and backup:
-                            assert backups_root is not None
-                            bpath_render: Path = backups_root / out_path.relative_to(
-                                dest
+
+                    if staged_path is not None:
+                        staged_path.parent.mkdir(parents=True, exist_ok=True)
+                        if use_stream:
+                            # a streamed merge reads `existing` while writing, so it never writes into it
+                            stream_to = staged_path.with_name(
+                                staged_path.name + ".next"
+                            )
+                            self._stream_render_to(
+                                stream_to,
+                                tmpl,
+                                render_ctx,
+                                merge=stream_merge,
+                                existing=existing,
+                            )
+                            os.replace(str(stream_to), str(staged_path))
+                        else:
+                            staged_path.write_text(merged_text, encoding="utf-8")
+                        self._check_writable(out_path)
+                        if not already_staged:
+                            staged_ops.append((staged_path, out_path, "rendered"))
+                        continue
+
+                    # perform atomic write/replace if requested
+                    if atomic:
+                        ts = datetime.now().strftime("%Y%m%d%H%M%S")
+                        tmp_name = out_path.name + f".bldrx.tmp.{ts}"
+                        tmp_path = out_path.parent / tmp_name
+                        # write to temp file in same dir (ensures os.replace is atomic)
+                        out_path.parent.mkdir(parents=True, exist_ok=True)
+                        jrec = (
+                            txn.record(out_path, tmp_path) if txn is not None else None
+                        )
+                        # write merged text if merge applied
+                        if use_stream:
+                            self._stream_render_to(
+                                tmp_path,
+                                tmpl,
+                                render_ctx,
+                                merge=stream_merge,
+                                existing=out_path,
                             )
-                            bpath_render.parent.mkdir(parents=True, exist_ok=True)
-                            shutil.copy2(out_path, bpath_render)
-                            replaced.append((out_path, bpath_render))
-                            global_replaced.append((out_path, bpath_render))
                         else:
-                            if out_path.exists():
-                                replaced.append((out_path, None))
-                                global_replaced.append((out_path, None))
+                            tmp_path.write_text(merged_text, encoding="utf-8")
+                        replaced: List[Tuple[Path, Optional[str]]] = (
+                            []
+                        )  # list of tuples (final_path, backup blob digest or None)
+                        new_created: List[Path] = []
+                        try:
+                            # backup existing if needed; it is replaced by rename, so the blob can be a hardlink
+                            if out_path.exists() and backup_run is not None:
+                                digest = backup_run.add(out_path, link=True)
+                                replaced.append((out_path, digest))
+                                global_replaced.append((out_path, digest))
                             else:
-                                new_created.append(out_path)
-                                global_new_created.append(out_path)
-                        # atomic replace
-                        os.replace(str(tmp_path), str(out_path))
-                        made_changes = True
-                        yield (str(out_path), "rendered")
-                    except Exception as e:
-                        # rollback across all files replaced so far
-                        for fpath, bpath in global_replaced:
+                                if out_path.exists():
+                                    replaced.append((out_path, None))
+                                    global_replaced.append((out_path, None))
+                                else:
+                                    new_created.append(out_path)
+                                    global_new_created.append(out_path)
+                            if txn is not None and jrec is not None:
+                                txn.move_aside(jrec)
+                            sync.staged(tmp_path)
+                            # atomic replace
+                            os.replace(str(tmp_path), str(out_path))
+                            sync.written(out_path, staged=True)
+                            made_changes = True
+                            written.append(out_path)
+                            yield (str(out_path), "rendered")
+                        except Exception as e:
+                            # rollback across all files replaced so far (the journal does it when enabled)
+                            if txn is None:
+                                for fpath, bdigest in reversed(global_replaced):
+                                    try:
+                                        if bdigest is not None and backup_run:
+                                            backup_run.restore(fpath, bdigest)
+                                    except Exception:
+                                        pass
+                                for fpath in global_new_created:
+                                    try:
+                                        if fpath.exists():
+                                            fpath.unlink()
+                                    except Exception:
+                                        pass
+                            # cleanup temp
                             try:
-                                if bpath is not None and bpath.exists():
-                                    os.replace(str(bpath), str(fpath))
+                                if tmp_path.exists():
+                                    tmp_path.unlink()
                             except Exception:
                                 pass
-                        for fpath in global_new_created:
+                            raise RuntimeError(
+                                f"Atomic replace failed for {out_path}: {e}"
+                            )
+                        finally:
+                            # cleanup any leftover tmp files
                             try:
-                                if fpath.exists():
-                                    fpath.unlink()
+                                if tmp_path.exists():
+                                    tmp_path.unlink()
                             except Exception:
                                 pass
-                        # cleanup temp
-                        try:
-                            if tmp_path.exists():
-                                tmp_path.unlink()
-                        except Exception:
-                            pass
-                        raise RuntimeError(f"Atomic replace failed for {out_path}: {e}")
-                    finally:
-                        # cleanup any leftover tmp files
+                    else:
+                        # non-atomic path: no rollback, but the file is still replaced by rename rather than
+                        # written through, since it may be a hardlink (e.g. to a linked backup restore)
+                        if out_path.exists() and backup_run is not None:
+                            backup_run.add(out_path, link=True)
+                        out_path.parent.mkdir(parents=True, exist_ok=True)
+                        ts = datetime.now().strftime("%Y%m%d%H%M%S")
+                        tmp_path = out_path.parent / (
+                            out_path.name + f".bldrx.tmp.{ts}"
+                        )
                         try:
+                            if use_stream:
+                                self._stream_render_to(
+                                    tmp_path,
+                                    tmpl,
+                                    render_ctx,
+                                    merge=stream_merge,
+                                    existing=out_path,
+                                )
+                            else:
+                                tmp_path.write_text(merged_text, encoding="utf-8")
+                            os.replace(str(tmp_path), str(out_path))
+                        finally:
                             if tmp_path.exists():
                                 tmp_path.unlink()
-                        except Exception:
-                            pass
+                        sync.written(out_path)
+                        made_changes = True
+                        written.append(out_path)
+                        yield (str(out_path), "rendered")
                 else:
-                    # non-atomic path
-                    # backup existing
-                    if out_path.exists() and backup:
-                        assert backups_root is not None
-                        bpath = backups_root / out_path.relative_to(dest)
-                        bpath.parent.mkdir(parents=True, exist_ok=True)
-                        shutil.copy2(out_path, bpath)
-                    out_path.parent.mkdir(parents=True, exist_ok=True)
-                    out_path.write_text(text, encoding="utf-8")
-                    made_changes = True
-                    yield (str(out_path), "rendered")
-            else:
-                # raw file
-                if target.exists() and not force and not merge:
-                    yield (str(target), "skipped")
-                    continue
-                # detect large or binary raw files
-                size = p.stat().st_size
-                is_binary = False
-                try:
-                    with p.open("rb") as fh:
-                        head = fh.read(1024)
-                        if b"\x00" in head:
-                            is_binary = True
-                except Exception:
-                    is_binary = True
-                if (is_binary or size > BINARY_SIZE_THRESHOLD) and not force:
-                    if dry_run:
-                        yield (
-                            str(target),
-                            (
-                                "would-skip-large"
-                                if size > BINARY_SIZE_THRESHOLD
-                                else "would-skip-binary"
-                            ),
-                        )
-                    else:
-                        yield (
-                            str(target),
-                            (
-                                "skipped-large"
-                                if size > BINARY_SIZE_THRESHOLD
-                                else "skipped-binary"
-                            ),
-                        )
-                    continue
-                if dry_run:
-                    yield (str(target), "would-copy")
-                    continue
-                if atomic:
-                    ts = datetime.now().strftime("%Y%m%d%H%M%S")
-                    tmp_name = target.name + f".bldrx.tmp.{ts}"
-                    tmp_path = target.parent / tmp_name
-                    target.parent.mkdir(parents=True, exist_ok=True)
-                    shutil.copy2(p, tmp_path)
-                    replaced_raw: List[Tuple[Path, Optional[Path]]] = []
-                    new_created_raw: List[Path] = []
+                    # raw file
+                    if target.exists() and not force and not merge:
+                        yield (str(target), "skipped")
+                        continue
+                    # detect large or binary raw files
+                    size = p.stat().st_size
+                    is_binary = False
                     try:
-                        if target.exists() and backup:
-                            assert backups_root is not None
-                            bpath_copied: Path = backups_root / target.relative_to(dest)
-                            bpath_copied.parent.mkdir(parents=True, exist_ok=True)
-                            shutil.copy2(target, bpath_copied)
-                            replaced_raw.append((target, bpath_copied))
+                        with p.open("rb") as fh:
+                            head = fh.read(1024)
+                            if b"\x00" in head:
+                                is_binary = True
+                    except Exception:
+                        is_binary = True
+                    if (is_binary or size > BINARY_SIZE_THRESHOLD) and not force:
+                        if dry_run:
+                            yield (
+                                str(target),
+                                (
+                                    "would-skip-large"
+                                    if size > BINARY_SIZE_THRESHOLD
+                                    else "would-skip-binary"
+                                ),
+                            )
                         else:
-                            if target.exists():
-                                replaced_raw.append((target, None))
+                            yield (
+                                str(target),
+                                (
+                                    "skipped-large"
+                                    if size > BINARY_SIZE_THRESHOLD
+                                    else "skipped-binary"
+                                ),
+                            )
+                        continue
+                    if dry_run:
+                        yield (str(target), "would-copy")
+                        continue
+                    if staging_root is not None:
+                        staged_path = staging_root / "files" / target.relative_to(dest)
+                        staged_path.parent.mkdir(parents=True, exist_ok=True)
+                        already_staged = staged_path.exists()
+                        shutil.copy2(p, staged_path)
+                        self._check_writable(target)
+                        if not already_staged:
+                            staged_ops.append((staged_path, target, "copied"))
+                        continue
+                    if atomic:
+                        ts = datetime.now().strftime("%Y%m%d%H%M%S")
+                        tmp_name = target.name + f".bldrx.tmp.{ts}"
+                        tmp_path = target.parent / tmp_name
+                        target.parent.mkdir(parents=True, exist_ok=True)
+                        jrec = txn.record(target, tmp_path) if txn is not None else None
+                        shutil.copy2(p, tmp_path)
+                        replaced_raw: List[Tuple[Path, Optional[str]]] = []
+                        new_created_raw: List[Path] = []
+                        try:
+                            if target.exists() and backup_run is not None:
+                                digest = backup_run.add(target, link=True)
+                                replaced_raw.append((target, digest))
                             else:
-                                new_created_raw.append(target)
-                        os.replace(str(tmp_path), str(target))
-                        made_changes = True
-                        yield (str(target), "copied")
-                    except Exception as e:
-                        for fpath, bpath in replaced_raw:
+                                if target.exists():
+                                    replaced_raw.append((target, None))
+                                else:
+                                    new_created_raw.append(target)
+                            if txn is not None and jrec is not None:
+                                txn.move_aside(jrec)
+                            sync.staged(tmp_path)
+                            os.replace(str(tmp_path), str(target))
+                            sync.written(target, staged=True)
+                            made_changes = True
+                            written.append(target)
+                            yield (str(target), "copied")
+                        except Exception as e:
+                            if txn is None:
+                                for fpath, bdigest in replaced_raw:
+                                    try:
+                                        if bdigest is not None and backup_run:
+                                            backup_run.restore(fpath, bdigest)
+                                    except Exception:
+                                        pass
+                                for fpath in new_created_raw:
+                                    try:
+                                        if fpath.exists():
+                                            fpath.unlink()
+                                    except Exception:
+                                        pass
                             try:
-                                if bpath is not None and bpath.exists():
-                                    os.replace(str(bpath), str(fpath))
+                                if tmp_path.exists():
+                                    tmp_path.unlink()
                             except Exception:
                                 pass
-                        for fpath in new_created_raw:
+                            raise RuntimeError(
+                                f"Atomic replace failed for {target}: {e}"
+                            )
+                        finally:
                             try:
-                                if fpath.exists():
-                                    fpath.unlink()
+                                if tmp_path.exists():
+                                    tmp_path.unlink()
                             except Exception:
                                 pass
+                    else:
+                        # replaced by rename (never copied over in place), so the backup blob can be a hardlink
+                        if target.exists() and backup_run is not None:
+                            backup_run.add(target, link=True)
+                        target.parent.mkdir(parents=True, exist_ok=True)
+                        ts = datetime.now().strftime("%Y%m%d%H%M%S")
+                        tmp_path = target.parent / (target.name + f".bldrx.tmp.{ts}")
                         try:
+                            shutil.copy2(p, tmp_path)
+                            os.replace(str(tmp_path), str(target))
+                        finally:
                             if tmp_path.exists():
                                 tmp_path.unlink()
-                        except Exception:
-                            pass
-                        raise RuntimeError(f"Atomic replace failed for {target}: {e}")
-                    finally:
-                        try:
-                            if tmp_path.exists():
-                                tmp_path.unlink()
-                        except Exception:
-                            pass
-                else:
-                    # backup existing
-                    if target.exists() and backup:
-                        assert backups_root is not None
-                        bpath_backup: Path = backups_root / target.relative_to(dest)
-                        bpath_backup.parent.mkdir(parents=True, exist_ok=True)
-                        shutil.copy2(target, bpath_backup)
-                    target.parent.mkdir(parents=True, exist_ok=True)
-                    shutil.copy2(p, target)
-                    made_changes = True
-                    yield (str(target), "copied")
+                        sync.written(target)
+                        made_changes = True
+                        written.append(target)
+                        yield (str(target), "copied")
+            if staging_root is not None:
+                # commit phase: everything that can fail has already happened in the staging tree
+                made_changes = self._commit_staged(
+                    staged_ops, staging_root, dest, backup_run, txn, sync, staged_dirs
+                )
+                for _staged, final, status in staged_ops:
+                    written.append(final)
+                    yield (str(final), status)
+        except Exception:
+            # journaled applies are all-or-nothing: undo every write recorded so far
+            if txn is not None:
+                txn.rollback()
+            raise
+        finally:
+            if staging_root is not None and txn is None:
+                shutil.rmtree(staging_root, ignore_errors=True)
+            if backup_run is not None:
+                backup_run.save()
+        # make the applied files durable before the journal declares the apply committed
+        sync.finish()
+        if txn is not None:
+            txn.commit()
+            if staging_root is not None:
+                shutil.rmtree(staging_root, ignore_errors=True)
 
         # After all files applied, optionally commit to git
         if git_commit and made_changes:
             # Only attempt to commit if this appears to be a git repo
             git_dir = Path(dest) / ".git"
             if git_dir.exists():
-                try:
-                    subprocess.run(
-                        ["git", "add", "-A"],
-                        cwd=str(dest),
-                        check=True,
-                        capture_output=True,
-                    )
-                    msg = git_message or f"bldrx: apply template {template_name}"
-                    subprocess.run(
-                        ["git", "commit", "-m", msg],
-                        cwd=str(dest),
-                        check=True,
-                        capture_output=True,
-                    )
-                except subprocess.CalledProcessError as e:
-                    # surface a helpful error
-                    raise RuntimeError(
-                        f"git commit failed: {e.stderr.decode() if hasattr(e, 'stderr') else e}"
+                from .gitops import commit_paths, commit_to_branch
+
+                msg = git_message or (
+                    f"bldrx: apply template {template_names[0]}"
+                    if len(template_names) == 1
+                    else f"bldrx: apply templates {', '.join(template_names)}"
+                )
+                if git_mode == "plumbing":
+                    commit_to_branch(
+                        dest, written, msg, git_branch or f"bldrx/{template_name}"
                     )
+                else:
+                    commit_paths(dest, written, msg)
             else:
                 raise RuntimeError(
                     "git_commit requested but destination is not a git repository"
                 )
 
+    def _check_writable(self, target: Path) -> None:
+        """Raise PermissionError unless `target` can be created or replaced.
+
+        Replacing a file by rename needs write access to its directory, so the nearest existing ancestor directory
+        is checked (missing parents will be created inside it).
+        """
+        parent = target.parent
+        while not parent.exists() and parent != parent.parent:
+            parent = parent.parent
+        if not parent.is_dir():
+            raise PermissionError(f"Cannot write {target}: {parent} is not a directory")
+        if not os.access(str(parent), os.W_OK | os.X_OK):
+            raise PermissionError(f"Cannot write {target}: {parent} is not writable")
+        if target.is_dir():
+            raise PermissionError(f"Cannot write {target}: a directory is in the way")
+
+    def _commit_staged(
+        self,
+        staged_ops: List[Tuple[Path, Path, str]],
+        staging_root: Path,
+        dest: Path,
+        backup_run: Any = None,
+        txn: Any = None,
+        sync: Optional[_Syncer] = None,
+        dirs: Optional[List[Path]] = None,
+    ) -> bool:
+        """Rename every staged file into place and return True if anything was written.
+
+        Originals are moved aside by rename (into the journal when `txn` is given, otherwise into the staging tree)
+        so a failure part-way through the loop can be undone with renames only. Template directories (`dirs`) are
+        created in dest here too, so even empty ones only appear once the commit phase runs.
+        """
+        for d in dirs or []:
+            d.mkdir(parents=True, exist_ok=True)
+        if not staged_ops:
+            return False
+        recs: List[Dict[str, Any]] = []
+        if txn is not None:
+            recs = [
+                txn.record(final, staged, sync=False) for staged, final, _ in staged_ops
+            ]
+            txn.prepare()
+        # backups may fail (and strict fsyncs are slow), so do both before the first rename
+        for staged, final, _status in staged_ops:
+            if backup_run is not None and final.exists():
+                backup_run.add(final, link=True)
+            if sync is not None:
+                sync.staged(staged)
+        originals = staging_root / "originals"
+        originals.mkdir(parents=True, exist_ok=True)
+        # (final, moved-aside original or None) in commit order, for rollback without a journal
+        done: List[Tuple[Path, Optional[Path]]] = []
+        try:
+            for i, (staged, final, _status) in enumerate(staged_ops):
+                final.parent.mkdir(parents=True, exist_ok=True)
+                aside: Optional[Path] = None
+                if txn is not None:
+                    txn.move_aside(recs[i])
+                elif final.exists():
+                    aside = originals / str(i)
+                    os.replace(str(final), str(aside))
+                done.append((final, aside))
+                os.replace(str(staged), str(final))
+                if sync is not None:
+                    sync.written(final, staged=True)
+        except Exception as e:
+            if txn is None:
+                for final, aside in reversed(done):
+                    try:
+                        if aside is not None:
+                            os.replace(str(aside), str(final))
+                        elif final.exists():
+                            final.unlink()
+                    except Exception:
+                        pass
+            raise RuntimeError(f"Staged commit failed: {e}")
+        return True
+
+    def _stream_render_to(
+        self,
+        tmp_path: Path,
+        tmpl: Any,
+        context: Dict[str, Any],
+        merge: Optional[str] = None,
+        existing: Optional[Path] = None,
+    ) -> None:
+        """Stream `tmpl` rendered with `context` into `tmp_path` chunk by chunk.
+
+        `append`/`prepend` merges copy `existing` around the rendered output in fixed-size chunks and match the
+        in-memory merge semantics. Any other merge value writes the rendered output only. The temp file is removed
+        if rendering fails part-way through.
+        """
+        try:
+            with tmp_path.open("w", encoding="utf-8") as out:
+                if merge == "append" and existing is not None:
+                    # equivalent of existing_text.rstrip("\r\n") + "\n" without loading the file:
+                    # hold back any trailing run of newlines until more content proves it is not trailing
+                    pending = ""
+                    with existing.open("r", encoding="utf-8") as fh:
+                        while True:
+                            chunk = fh.read(_STREAM_CHUNK_SIZE)
+                            if not chunk:
+                                break
+                            data = pending + chunk
+                            body = data.rstrip("\r\n")
+                            out.write(body)
+                            pending = data[len(body) :]
+                    out.write("\n")
+                for chunk in tmpl.generate(**context):
+                    out.write(chunk)
+                if merge == "prepend" and existing is not None:
+                    out.write("\n")
+                    with existing.open("r", encoding="utf-8") as fh:
+                        shutil.copyfileobj(fh, out, _STREAM_CHUNK_SIZE)
+        except BaseException:
+            try:
+                if tmp_path.exists():
+                    tmp_path.unlink()
+            except Exception:
+                pass
+            raise
+
     def remove_template(
         self,
         template_name: str,
@@ -921,35 +2090,6 @@ class Engine:
                 target.unlink()
                 yield (str(target), "removed")
 
-    def _acquire_lock(self, lock_path: Path, timeout: float = 5.0):
-        """Acquire a simple file lock by creating a lockfile using O_EXCL.
-
-        Raises RuntimeError on timeout.
-        """
-        import os
-        import time
-
-        deadline = time.time() + timeout if timeout is not None else None
-        while True:
-            try:
-                fd = os.open(str(lock_path), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
-                os.write(fd, str(os.getpid()).encode())
-                os.close(fd)
-                return
-            except FileExistsError:
-                if deadline is not None and time.time() > deadline:
-                    raise RuntimeError(
-                        f"Could not acquire lock {lock_path} within {timeout} seconds"
-                    )
-                time.sleep(0.05)
-
-    def _release_lock(self, lock_path: Path):
-        try:
-            if lock_path.exists():
-                lock_path.unlink()
-        except Exception:
-            pass
-
     def install_user_template(
         self,
         src_path: Path,
@@ -957,6 +2097,7 @@ class Engine:
         force: bool = False,
         wrap: bool = False,
         lock_timeout: float = 5.0,
+        link: bool = False,
     ) -> Path:
         """Copy a template folder into the user templates directory.
 
@@ -965,27 +2106,50 @@ class Engine:
 
         New option:
         - lock_timeout: seconds to wait to acquire a per-template install lock to avoid concurrent installs.
+        - link: hardlink files into the shared template store (`self.template_store`) instead of copying them,
+          so files shared with other templates or a previous install are not written again
         """
         src = Path(src_path)
         if not src.exists() or not src.is_dir():
             raise FileNotFoundError(
                 f"Source template path '{src}' not found or is not a directory"
             )
-        name = name or src.name
+        name = _check_install_name(name or src.name)
         base_dest = self.user_templates_root / name
         base_dest.parent.mkdir(parents=True, exist_ok=True)
 
-        lock_path = base_dest.parent / f".{name}.lock"
+        if link:
+            from .install import StagedInstall
+
+            staging = StagedInstall(self.user_templates_root, hash_files=False)
+            try:
+                # lock order everywhere: per-template install lock, then the store lock
+                with self.locks.user_template(
+                    self.user_templates_root, name, timeout=lock_timeout
+                ):
+                    self._check_not_installed(base_dest, force)
+                    with self.template_store.lock():
+                        files = self.template_store.link_tree(
+                            src, staging.path / src.name if wrap else staging.path
+                        )
+                        if wrap:
+                            files = {f"{src.name}/{rel}": k for rel, k in files.items()}
+                        self._commit_linked(
+                            staging, base_dest, files, force, root=staging.path
+                        )
+                return base_dest
+            finally:
+                staging.discard()
+
         # acquire per-template lock
-        self._acquire_lock(lock_path, timeout=lock_timeout)
-        try:
-            if base_dest.exists() and not force:
-                raise FileExistsError(
-                    f"Template '{name}' already exists in user templates; use force=True to overwrite"
-                )
+        with self.locks.user_template(
+            self.user_templates_root, name, timeout=lock_timeout
+        ):
+            self._check_not_installed(base_dest, force)
             # remove existing if force
             if base_dest.exists() and force:
                 shutil.rmtree(base_dest)
+                self._release_store_ref(base_dest)
             if wrap:
                 dest = base_dest / src.name
                 dest.parent.mkdir(parents=True, exist_ok=True)
@@ -1000,43 +2164,153 @@ class Engine:
                     else:
                         shutil.copy2(p, target)
             return base_dest
-        finally:
-            # release lock always
-            self._release_lock(lock_path)
 
-    def uninstall_user_template(self, name: str, force: bool = False) -> bool:
+    @staticmethod
+    def _check_not_installed(install_dir: Path, force: bool) -> None:
+        if install_dir.exists() and not force:
+            raise FileExistsError(
+                f"Template '{install_dir.name}' already exists in user templates; use force=True to overwrite"
+            )
+
+    def _commit_linked(
+        self,
+        staging: Any,
+        final: Path,
+        files: Dict[str, str],
+        force: bool,
+        root: Optional[Path] = None,
+    ) -> None:
+        # publish a linked install and record its blobs; on failure drop the blobs it added to the store
+        # (callers hold the per-template install lock and the store lock)
+        try:
+            staging.commit(final, force=force, root=root)
+        except BaseException:
+            self.template_store.discard(files.values())
+            raise
+        self.template_store.record(final, files)
+
+    def _release_store_ref(self, install_dir: Path) -> None:
+        # drop the template store's record of a linked install that is being removed or replaced by a copy
+        if self.template_store.refs_dir.exists():
+            with self.template_store.lock():
+                self.template_store.release(install_dir)
+
+    def uninstall_user_template(
+        self, name: str, force: bool = False, lock_timeout: float = 5.0
+    ) -> bool:
         dest = self.user_templates_root / name
         if not dest.exists():
             raise FileNotFoundError(f"User template '{name}' not found")
-        shutil.rmtree(dest)
+        with self.locks.user_template(
+            self.user_templates_root, name, timeout=lock_timeout
+        ):
+            # re-check under the lock: a concurrent uninstall may have won the race
+            if not dest.exists():
+                raise FileNotFoundError(f"User template '{name}' not found")
+            shutil.rmtree(dest)
+            self._release_store_ref(dest)
         return True
 
+    def install_many(
+        self,
+        sources: List[Any],
+        force: bool = False,
+        verify: bool = True,
+        link: bool = False,
+        workers: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Install many templates concurrently with `fetch_remote_template` (local dirs, archives, http(s), git).
+
+        Parameters:
+        - sources: source strings, or dicts with 'source' and optional 'name' / 'ref'
+        - force, verify, link: passed to every `fetch_remote_template` call
+        - workers: size of the thread pool (default: min(8, number of sources))
+
+        Downloads, extraction and verification run in parallel; each install still takes its per-template lock
+        (and the download/mirror caches their per-URL locks). A failing source does not stop the others.
+
+        Returns one result per source, in input order:
+            {'source', 'name', 'ok': bool, 'path': str|None, 'error': str|None, 'seconds': float}
+        """
+        import time
+        from concurrent.futures import ThreadPoolExecutor
+
+        entries = [s if isinstance(s, dict) else {"source": str(s)} for s in sources]
+
+        def _one(entry: Dict[str, Any]) -> Dict[str, Any]:
+            started = time.monotonic()
+            res: Dict[str, Any] = {
+                "source": entry["source"],
+                "name": entry.get("name"),
+                "ok": False,
+                "path": None,
+                "error": None,
+            }
+            try:
+                path = self.fetch_remote_template(
+                    entry["source"],
+                    name=entry.get("name"),
+                    force=force,
+                    verify=verify,
+                    link=link,
+                    ref=entry.get("ref"),
+                )
+                res.update(ok=True, path=str(path), name=path.name)
+            except Exception as e:
+                res["error"] = f"{type(e).__name__}: {e}"
+            res["seconds"] = round(time.monotonic() - started, 3)
+            return res
+
+        if not entries:
+            return []
+        with ThreadPoolExecutor(
+            max_workers=workers or min(8, len(entries)),
+            thread_name_prefix="bldrx-install",
+        ) as pool:
+            return list(pool.map(_one, entries))
+
     def fetch_remote_template(
         self,
         url: str,
         name: Optional[str] = None,
         force: bool = False,
         verify: bool = True,
+        link: bool = False,
+        ref: Optional[str] = None,
+        http_cache: bool = True,
     ) -> Path:
         """Fetch a remote template archive or directory and install it into user templates.
 
-        Supported sources for this MVP: local file paths and file:// URLs pointing to a directory, .tar.gz/.tgz or .zip archive.
-        The archive is extracted into a sandbox (tempdir) and checked for path traversal attempts before installation.
+        Supported sources for this MVP: local file paths and file:// URLs pointing to a directory or an archive.
+        Archive formats (zip, tar, tar.gz, tar.bz2, tar.xz) are detected from their magic bytes, not the file name.
+        http(s) URLs are downloaded through `bldrx.fetch.DownloadCache`, so unchanged archives are revalidated
+        rather than downloaded again and interrupted downloads resume. `git+` / `.git` sources are exported with
+        `git archive` from a bare mirror kept in `bldrx.gitops.GitMirrorCache` (no clone per fetch).
+        Archive members are streamed into a staging directory inside the user templates root (see
+        `bldrx.install.StagedInstall`), checked for path traversal one by one and hashed while they are written;
+        the install then completes with a single rename.
 
         Params:
         - url: location to fetch (file:// or local path)
         - name: name to install the template as (defaults to archive/dir basename)
-        - force: pass to `install_user_template` to overwrite existing
-        - verify: if True, run manifest verification inside the sandbox before installing
+        - force: overwrite an existing user template of the same name
+        - verify: if True, check the staged files against the template manifest before installing
+        - link: swap the staged files for hardlinks into the shared template store (see `install_user_template`)
+        - ref: branch, tag or commit to install from a git source (overrides a `url@ref` suffix; default HEAD)
+        - http_cache: if False, http(s) archives bypass the download cache and tar members are extracted
+          straight from the response stream, so no archive file is written to disk
 
         Returns: Path to installed template folder
         """
-        import tarfile
-        import tempfile
         import urllib.parse
-        import zipfile
+
+        from .install import StagedInstall
 
         src_path = None
+        git_source: Optional[Tuple[Any, str, str]] = None
+        response: Optional[Any] = None
+        # name a flat archive is installed under by default (the cached download's file name is a hash)
+        source_name: Optional[str] = None
         parsed = urllib.parse.urlparse(url)
         if parsed.scheme == "file":
             import urllib.request
@@ -1044,29 +2318,29 @@ class Engine:
             pathstr = urllib.request.url2pathname(parsed.path)
             src_path = Path(pathstr)
         elif parsed.scheme in ("http", "https"):
-            # download to a temporary file
-            import urllib.request
+            if http_cache:
+                # download through the URL-keyed cache (conditional revalidation, resumable)
+                from .fetch import DownloadCache
 
-            tmpf = Path(__import__("tempfile").NamedTemporaryFile(delete=False).name)
-            urllib.request.urlretrieve(url, str(tmpf))
-            src_path = tmpf
+                src_path = DownloadCache().fetch(url)
+            else:
+                import urllib.request
+
+                response = urllib.request.urlopen(url, timeout=30)
+                src_path = Path(parsed.path)
+            source_name = Path(parsed.path).name
         elif (
             parsed.scheme.startswith("git")
             or url.startswith("git+")
             or parsed.path.endswith(".git")
         ):
-            # perform a shallow git clone into the temp dir
-            git_url = url
-            if url.startswith("git+"):
-                git_url = url.split("git+", 1)[1]
-            import subprocess
-
-            clone_dir = Path(__import__("tempfile").mkdtemp()) / "repo"
-            clone_dir.parent.mkdir(parents=True, exist_ok=True)
-            subprocess.run(
-                ["git", "clone", "--depth", "1", git_url, str(clone_dir)], check=True
-            )
-            src_path = clone_dir
+            # export the requested ref from a persistent bare mirror (updated incrementally)
+            from .gitops import GitMirrorCache, repo_name, split_git_url
+
+            git_url, git_ref = split_git_url(url)
+            mirrors = GitMirrorCache()
+            git_source = (mirrors, git_url, mirrors.update(git_url, ref or git_ref))
+            src_path = Path(repo_name(git_url))
         else:
             # treat as local path fallback for now
             p = Path(url)
@@ -1075,77 +2349,59 @@ class Engine:
             else:
                 raise ValueError("Unsupported URL scheme or path not found: %s" % url)
 
-        with tempfile.TemporaryDirectory() as td:
-            tdpath = Path(td)
-            # if it's a directory, copy its contents to temp dir
-            if src_path.is_dir():
-                # copytree to td/extracted
-                dest_ex = tdpath / src_path.name
-                shutil.copytree(src_path, dest_ex)
-            else:
-                # file: decide based on suffix
-                if src_path.suffix in (".gz", ".tgz") or src_path.name.endswith(
-                    ".tar.gz"
-                ):
-                    # extract tar safely
-                    with tarfile.open(src_path, "r:gz") as tf:
-                        # safety check for path traversal
-                        for member in tf.getmembers():
-                            member_path = Path(member.name)
-                            if member_path.is_absolute() or ".." in member_path.parts:
-                                raise RuntimeError(
-                                    "Unsafe archive: path traversal detected"
-                                )
-                        tf.extractall(path=tdpath)
-                elif src_path.suffix == ".zip":
-                    with zipfile.ZipFile(src_path, "r") as zf:
-                        for fn in zf.namelist():
-                            fpath = Path(fn)
-                            if fpath.is_absolute() or ".." in fpath.parts:
-                                raise RuntimeError(
-                                    "Unsafe archive: path traversal detected"
-                                )
-                        zf.extractall(path=tdpath)
-                else:
-                    raise ValueError("Unsupported archive format for: %s" % src_path)
-
-            # Locate the extracted root dir (single child assumed or use tdpath itself)
-            children = [p for p in tdpath.iterdir() if p.exists()]
-            if len(children) == 1 and children[0].is_dir():
-                extracted = children[0]
+        # Stream the template straight into a staging dir inside the user templates root: every byte is written
+        # once, hashed on the way, and the install is published with a single rename.
+        staging = StagedInstall(
+            self.user_templates_root, hash_files=verify, unwrap=git_source is None
+        )
+        try:
+            if git_source is not None:
+                mirrors, git_url, sha = git_source
+                with mirrors.archive(git_url, sha) as tf:
+                    staging.add_tar(tf)
+            elif response is not None:
+                # uncached download: members are extracted straight from the response stream
+                # (src_path is only the URL path here, e.g. `/` for a bare host, never a local source)
+                with response:
+                    staging.add_archive(response)
+            elif src_path.is_dir():
+                staging.add_tree(src_path, prefix=src_path.name)
             else:
-                # either multiple entries or a flat archive, use tdpath as root
-                extracted = tdpath
+                # the format comes from the file's magic bytes, not its suffix
+                with src_path.open("rb") as fh:
+                    staging.add_archive(fh)
 
-            # Optionally verify manifest (perform local manifest checks inside the extracted sandbox)
+            # Optionally verify manifest (digests were computed while the files were written)
             if verify:
-                manifest_path = extracted / "bldrx-manifest.json"
-                if manifest_path.exists():
-                    import hashlib
-                    import json
-
-                    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
-                    files = manifest.get("files", {})
-                    mismatches = []
-                    missing = []
-                    for rel, expected in files.items():
-                        fpath = extracted / rel
-                        if not fpath.exists():
-                            missing.append(rel)
-                            continue
-                        h = hashlib.sha256()
-                        h.update(fpath.read_bytes())
-                        actual = h.hexdigest()
-                        if actual != expected:
-                            mismatches.append(rel)
-                    if mismatches or missing:
-                        raise RuntimeError(
-                            f"Remote template verification failed: mismatches={mismatches}, missing={missing}"
-                        )
+                staging.verify()
                 # if no manifest present we allow installation (but user may opt to require manifests later)
 
-            # Install into user templates
-            install_name = name or extracted.name
-            # Use install_user_template to perform the copy into user templates
-            dest = self.install_user_template(extracted, name=install_name, force=force)
-            return dest
+            root = staging.root()
+            install_name = _check_install_name(
+                name
+                or (
+                    root.name
+                    if root != staging.path
+                    else _archive_stem(Path(source_name or src_path.name))
+                )
+            )
+            final = self.user_templates_root / install_name
+            if link:
+                with self.locks.user_template(
+                    self.user_templates_root, install_name, timeout=5.0
+                ):
+                    self._check_not_installed(final, force)
+                    with self.template_store.lock():
+                        files = self.template_store.adopt_tree(
+                            root, staging.sha256_digests()
+                        )
+                        self._commit_linked(staging, final, files, force)
+                return final
+            with self.locks.user_template(
+                self.user_templates_root, install_name, timeout=5.0
+            ):
+                installed = staging.commit(final, force=force)
+                self._release_store_ref(installed)
+                return installed
+        finally:
+            staging.discard()
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .hashing import _CHUNK_SIZE, _default_cache_dir
+
+# partial downloads older than this are removed instead of resumed
+_STALE_PART_SECONDS = 24 * 60 * 60
+
+
+class DownloadCache:
+    """HTTP(S) download cache keyed by URL, under `<cache dir>/http/` (see `bldrx.hashing._default_cache_dir`).
+
+    For each URL the cache keeps:
+    - `<key><suffixes>`: the last complete body (the URL's suffixes are kept so archive formats can be detected)
+    - `<key>.json`: its validators ({'url', 'etag', 'last_modified', 'size'})
+    - `<key>.part` / `<key>.part.json`: an interrupted download and the validators it was started with
+
+    `fetch()` revalidates a cached body with `If-None-Match` / `If-Modified-Since` (a 304 reuses it), resumes an
+    interrupted download with `Range` + `If-Range` (a 200 instead of 206 means the resource changed, and the
+    download restarts), and only replaces the cached body once a download is complete. Partial downloads without
+    a validator cannot be resumed safely and are deleted; stale ones are cleaned up on the next fetch.
+    """
+
+    def __init__(self, root: Optional[Path] = None, timeout: float = 30.0):
+        self.root = Path(root) if root else _default_cache_dir() / "http"
+        self.timeout = timeout
+
+    def _paths(self, url: str) -> Dict[str, Path]:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
+        suffix = "".join(Path(urllib.parse.urlparse(url).path).suffixes)
+        return {
+            "body": self.root / f"{key}{suffix}",
+            "meta": self.root / f"{key}.json",
+            "part": self.root / f"{key}.part",
+            "part_meta": self.root / f"{key}.part.json",
+            "lock": self.root / f"{key}.lock",
+        }
+
+    @staticmethod
+    def _read_meta(path: Path) -> Dict[str, Any]:
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _write_meta(path: Path, data: Dict[str, Any]) -> None:
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(data), encoding="utf-8")
+        os.replace(str(tmp), str(path))
+
+    def clean(self, max_age: float = _STALE_PART_SECONDS) -> int:
+        """Remove partial downloads and leftover temp files older than `max_age` seconds; return how many."""
+        if not self.root.exists():
+            return 0
+        cutoff = time.time() - max_age
+        removed = 0
+        for p in self.root.iterdir():
+            if not (p.name.endswith((".part", ".part.json", ".tmp"))):
+                continue
+            try:
+                if p.stat().st_mtime < cutoff:
+                    p.unlink()
+                    removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
+
+    def fetch(self, url: str) -> Path:
+        """Return a local path holding the current body of `url`, downloading only what is missing or changed."""
+        from .locks import file_lock
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.clean()
+        paths = self._paths(url)
+        with file_lock(paths["lock"]):
+            try:
+                return self._fetch(url, paths)
+            except BaseException:
+                part_meta = self._read_meta(paths["part_meta"])
+                if not (part_meta.get("etag") or part_meta.get("last_modified")):
+                    # without a validator a later Range request could splice two versions together
+                    for key in ("part", "part_meta"):
+                        paths[key].unlink(missing_ok=True)
+                raise
+
+    def _fetch(self, url: str, paths: Dict[str, Path]) -> Path:
+        body, part = paths["body"], paths["part"]
+        meta = self._read_meta(paths["meta"]) if body.exists() else {}
+        part_meta = self._read_meta(paths["part_meta"]) if part.exists() else {}
+        headers: Dict[str, str] = {}
+        offset = 0
+        validator = part_meta.get("etag") or part_meta.get("last_modified")
+        if part.exists() and validator:
+            offset = part.stat().st_size
+            headers["Range"] = f"bytes={offset}-"
+            headers["If-Range"] = validator
+        elif meta:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+        req = urllib.request.Request(url, headers=headers)
+        try:
+            resp = urllib.request.urlopen(req, timeout=self.timeout)
+        except urllib.error.HTTPError as e:
+            if e.code == 304 and meta:
+                return body
+            if e.code == 416 and offset:
+                # the partial file no longer fits the resource: start over
+                part.unlink(missing_ok=True)
+                paths["part_meta"].unlink(missing_ok=True)
+                return self._fetch(url, paths)
+            raise
+        with resp:
+            if resp.status == 206 and offset:
+                mode = "ab"
+            else:
+                # full body (first fetch, changed resource, or a server ignoring Range)
+                mode, offset = "wb", 0
+                part_meta = {
+                    "etag": resp.headers.get("ETag"),
+                    "last_modified": resp.headers.get("Last-Modified"),
+                }
+                self._write_meta(paths["part_meta"], part_meta)
+            length = resp.headers.get("Content-Length")
+            expected = offset + int(length) if length is not None else None
+            with part.open(mode) as fh:
+                for chunk in iter(lambda: resp.read(_CHUNK_SIZE), b""):
+                    fh.write(chunk)
+        size = part.stat().st_size
+        if expected is not None and size != expected:
+            raise RuntimeError(
+                f"Incomplete download of {url}: got {size} of {expected} bytes"
+            )
+        os.replace(str(part), str(body))
+        self._write_meta(paths["meta"], dict(part_meta, url=url, size=size))
+        paths["part_meta"].unlink(missing_ok=True)
+        return body
@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess
+import sys
+import tarfile
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+GIT_MODES = ("index", "plumbing")
+
+
+def _git(
+    repo: Path,
+    *args: str,
+    input: Optional[str] = None,
+    env: Optional[Dict[str, str]] = None,
+    check: bool = True,
+) -> subprocess.CompletedProcess:
+    try:
+        return subprocess.run(
+            ["git", *args],
+            cwd=str(repo),
+            input=input,
+            env=env,
+            check=check,
+            capture_output=True,
+            text=True,
+        )
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"git {args[0]} failed: {(e.stderr or '').strip()}")
+
+
+def _rel_paths(repo: Path, paths: Iterable[Path]) -> List[str]:
+    repo = Path(repo).resolve()
+    rels = {str(Path(p).resolve().relative_to(repo)).replace("\\", "/") for p in paths}
+    return sorted(rels)
+
+
+def _rev(repo: Path, spec: str) -> Optional[str]:
+    res = _git(repo, "rev-parse", "-q", "--verify", spec, check=False)
+    return res.stdout.strip() or None
+
+
+def commit_paths(repo: Path, paths: Iterable[Path], message: str) -> Optional[str]:
+    """Stage exactly `paths` and commit only them; return the new commit id (None if nothing changed).
+
+    Paths are passed with `--pathspec-from-file` (NUL separated, literal), so git never rescans the rest of the
+    working tree, and anything else the user had staged stays staged but uncommitted. Paths ignored by
+    `.gitignore` are skipped, as `git add -A` would.
+    """
+    rels = _rel_paths(repo, paths)
+    if not rels:
+        return None
+    env = dict(os.environ, GIT_LITERAL_PATHSPECS="1")
+    ignored = _git(
+        repo, "check-ignore", "-z", "--stdin", input="\0".join(rels), check=False
+    )
+    if ignored.returncode not in (0, 1):
+        raise RuntimeError(f"git check-ignore failed: {ignored.stderr.strip()}")
+    skip = set(p for p in ignored.stdout.split("\0") if p)
+    rels = [p for p in rels if p not in skip]
+    if not rels:
+        return None
+    spec = "\0".join(rels)
+    _git(
+        repo,
+        "add",
+        "--pathspec-from-file=-",
+        "--pathspec-file-nul",
+        input=spec,
+        env=env,
+    )
+    if _rev(repo, "HEAD^{commit}") is not None:
+        # index vs HEAD only (no working-tree scan); keep the paths we just staged
+        changed = _git(repo, "diff-index", "--cached", "-z", "--name-only", "HEAD")
+        staged = set(p for p in changed.stdout.split("\0") if p)
+        rels = [p for p in rels if p in staged]
+        if not rels:
+            return None
+        spec = "\0".join(rels)
+    _git(
+        repo,
+        "commit",
+        "-m",
+        message,
+        "--pathspec-from-file=-",
+        "--pathspec-file-nul",
+        input=spec,
+        env=env,
+    )
+    return _rev(repo, "HEAD")
+
+
+def commit_to_branch(
+    repo: Path, paths: Iterable[Path], message: str, branch: str
+) -> Optional[str]:
+    """Commit the current contents of `paths` onto `branch` using plumbing only; return the commit id.
+
+    A throwaway index (`GIT_INDEX_FILE`) is seeded from the branch tip (or from HEAD when the branch does not
+    exist yet), updated with `hash-object`/`update-index`, and turned into a commit with `write-tree`/`commit-tree`.
+    The branch ref is moved with a compare-and-swap `update-ref`. The repository's own index, HEAD and working tree
+    are never touched, which is why committing onto the checked-out branch is refused. Returns None if the tree
+    would not change.
+    """
+    ref = f"refs/heads/{branch}"
+    head_ref = _git(repo, "symbolic-ref", "-q", "HEAD", check=False).stdout.strip()
+    if head_ref == ref:
+        raise RuntimeError(
+            f"Branch '{branch}' is checked out in {repo}; plumbing commits need a different branch"
+        )
+    rels = _rel_paths(repo, paths)
+    if not rels:
+        return None
+    old = _rev(repo, f"{ref}^{{commit}}")
+    base = old or _rev(repo, "HEAD^{commit}")
+    with tempfile.TemporaryDirectory(prefix="bldrx-git-") as tmp:
+        env = dict(os.environ, GIT_INDEX_FILE=str(Path(tmp) / "index"))
+        if base is not None:
+            _git(repo, "read-tree", base, env=env)
+        shas = _git(
+            repo, "hash-object", "-w", "--stdin-paths", input="\n".join(rels) + "\n"
+        ).stdout.split()
+        entries = []
+        for rel, sha in zip(rels, shas):
+            mode = "100755" if os.access(str(Path(repo) / rel), os.X_OK) else "100644"
+            entries.append(f"{mode} {sha}\t{rel}\0")
+        _git(
+            repo, "update-index", "-z", "--index-info", input="".join(entries), env=env
+        )
+        tree = _git(repo, "write-tree", env=env).stdout.strip()
+    if base is not None and tree == _rev(repo, f"{base}^{{tree}}"):
+        return None
+    parents = ["-p", base] if base is not None else []
+    commit = _git(repo, "commit-tree", tree, *parents, "-m", message).stdout.strip()
+    _git(repo, "update-ref", "-m", message, ref, commit, old or "")
+    return commit
+
+
+def split_git_url(url: str) -> Tuple[str, Optional[str]]:
+    """Split a `git+` template source into (clone url, ref).
+
+    A trailing `@<ref>` pins a branch, tag or commit (`git+https://host/org/repo.git@v1.2`); `@` signs that are
+    part of the host (`git@host:org/repo.git`, `ssh://git@host/...`) are left alone.
+    """
+    if url.startswith("git+"):
+        url = url[len("git+") :]
+    base, sep, ref = url.rpartition("@")
+    if sep and ref and "/" not in ref and ":" not in ref and "/" in base:
+        return base, ref
+    return url, None
+
+
+def repo_name(url: str) -> str:
+    """Return the repository name of a clone url (`https://host/org/tpl.git` -> `tpl`)."""
+    name = url.rstrip("/").replace(":", "/").rsplit("/", 1)[-1]
+    return name[: -len(".git")] if name.endswith(".git") else name
+
+
+class GitMirrorCache:
+    """Persistent bare mirrors of git template sources, one per URL, under `<cache dir>/git/`.
+
+    The first fetch of a URL runs `git clone --mirror`; later fetches update the mirror incrementally with
+    `git fetch --prune`, and a ref that is a full commit id already present in the mirror needs no network at
+    all. Trees are exported with `git archive` straight from the mirror, so no working copy is ever checked out.
+    Updates of one mirror are serialized with an exclusive lock and exports hold a shared one.
+    """
+
+    def __init__(self, root: Optional[Path] = None):
+        from .hashing import _default_cache_dir
+
+        self.root = Path(root) if root else _default_cache_dir() / "git"
+
+    def _key(self, url: str) -> str:
+        import hashlib
+
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
+
+    def mirror_path(self, url: str) -> Path:
+        return self.root / f"{self._key(url)}.git"
+
+    def _lock(self, url: str, shared: bool = False):
+        from .locks import file_lock
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        return file_lock(self.root / f"{self._key(url)}.lock", shared=shared)
+
+    def update(self, url: str, ref: Optional[str] = None) -> str:
+        """Bring the mirror of `url` up to date (as needed for `ref`) and return the commit id `ref` names.
+
+        `ref` defaults to the remote's HEAD; branches, tags and commit ids are accepted.
+        """
+        mirror = self.mirror_path(url)
+        spec = f"{ref or 'HEAD'}^{{commit}}"
+        with self._lock(url):
+            if not mirror.exists():
+                tmp = mirror.with_name(f"{mirror.name}.{os.getpid()}.tmp")
+                try:
+                    _git(self.root, "clone", "--mirror", "--quiet", url, str(tmp))
+                    os.replace(str(tmp), str(mirror))
+                finally:
+                    if tmp.exists():
+                        shutil.rmtree(tmp, ignore_errors=True)
+            elif not (
+                ref
+                and len(ref) == 40
+                and all(c in "0123456789abcdef" for c in ref)
+                and _rev(mirror, spec)
+            ):
+                # commit ids never move, so a pinned commit that is already mirrored needs no fetch
+                _git(mirror, "fetch", "--prune", "--quiet", "origin")
+            sha = _rev(mirror, spec)
+        if not sha:
+            raise RuntimeError(f"git ref '{ref or 'HEAD'}' not found in {url}")
+        return sha
+
+    @contextmanager
+    def archive(self, url: str, sha: str) -> Iterator[tarfile.TarFile]:
+        """Yield a streaming TarFile over `git archive <sha>` of the mirror (members have no top-level dir)."""
+        with self._lock(url, shared=True):
+            proc = subprocess.Popen(
+                ["git", "archive", "--format=tar", sha],
+                cwd=str(self.mirror_path(url)),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+            )
+            assert proc.stdout is not None and proc.stderr is not None
+            try:
+                with tarfile.open(fileobj=proc.stdout, mode="r|") as tf:
+                    yield tf
+            finally:
+                proc.stdout.close()
+                err = proc.stderr.read().decode("utf-8", "replace").strip()
+                proc.stderr.close()
+                if proc.wait() != 0 and sys.exc_info()[0] is None:
+                    raise RuntimeError(f"git archive failed: {err}")
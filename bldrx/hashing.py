@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+# files are hashed in chunks of this size...
+_CHUNK_SIZE = 1024 * 1024
+# ...unless they are at least this big, in which case they are mmapped and hashed in one call
+_MMAP_THRESHOLD = 16 * 1024 * 1024
+
+
+# digest algorithms accepted in manifests; manifests without an `algorithm` field were written with the default
+HASH_ALGORITHMS = ("sha256", "blake2b")
+DEFAULT_ALGORITHM = "sha256"
+
+# files modified this recently may still change within the same mtime tick, so their digests are not cached
+_RACY_WINDOW_NS = 2_000_000_000
+
+# at most this many per-root verify caches are kept; the least recently used ones are pruned on save
+VERIFY_CACHE_LIMIT = 256
+
+
+def _default_cache_dir() -> Path:
+    """Return the directory for bldrx caches (`BLDRX_CACHE_DIR` overrides it)."""
+    env = os.getenv("BLDRX_CACHE_DIR")
+    if env:
+        return Path(env).expanduser()
+    if os.name == "nt":
+        appdata = os.getenv("APPDATA") or Path.home()
+        return Path(appdata) / "bldrx" / "cache"
+    return Path.home() / ".bldrx" / "cache"
+
+
+def check_algorithm(algorithm: str) -> str:
+    """Return `algorithm` if it is one of `HASH_ALGORITHMS`, else raise ValueError."""
+    if algorithm not in HASH_ALGORITHMS:
+        raise ValueError(
+            f"Unsupported hash algorithm '{algorithm}'; expected one of {', '.join(HASH_ALGORITHMS)}"
+        )
+    return algorithm
+
+
+def manifest_algorithm(manifest: Dict[str, Any]) -> str:
+    """Return the digest algorithm a manifest was written with (sha256 for manifests that predate the field)."""
+    return check_algorithm(manifest.get("algorithm") or DEFAULT_ALGORITHM)
+
+
+def _default_workers() -> int:
+    return min(32, (os.cpu_count() or 1) + 4)
+
+
+def hash_file(path: Path, algorithm: str = "sha256") -> str:
+    """Return the hex digest of `path` without loading it into memory.
+
+    Small and medium files are read in `_CHUNK_SIZE` chunks; big files are mmapped so the kernel pages them in
+    while hashlib (which releases the GIL for large buffers) consumes them.
+    """
+    h = hashlib.new(algorithm)
+    with Path(path).open("rb") as fh:
+        size = os.fstat(fh.fileno()).st_size
+        if size >= _MMAP_THRESHOLD:
+            try:
+                with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    h.update(mm)
+                return h.hexdigest()
+            except (OSError, ValueError):
+                # mmap unsupported for this file (e.g. special filesystems): fall back to chunked reads
+                fh.seek(0)
+        for chunk in iter(lambda: fh.read(_CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def hash_files(
+    paths: Sequence[Path], algorithm: str = "sha256", workers: Optional[int] = None
+) -> List[str]:
+    """Hash `paths` concurrently and return their hex digests in the same order.
+
+    hashlib releases the GIL while digesting, so a thread pool spreads the work across cores and overlaps I/O.
+    """
+    paths = list(paths)
+    if len(paths) <= 1:
+        return [hash_file(p, algorithm) for p in paths]
+    workers = workers or _default_workers()
+    with ThreadPoolExecutor(
+        max_workers=min(workers, len(paths)), thread_name_prefix="bldrx-hash"
+    ) as pool:
+        return list(pool.map(lambda p: hash_file(p, algorithm), paths))
+
+
+def hash_tree(
+    root: Path,
+    algorithm: str = "sha256",
+    workers: Optional[int] = None,
+    cache: Optional[HashCache] = None,
+) -> Dict[str, str]:
+    """Return {relpath: hexdigest} for every file under `root` (relpaths use forward slashes).
+
+    With a `cache`, files whose stat signature is unchanged reuse their cached digest (see `verify_files`).
+    """
+    root = Path(root)
+    files = [p for p in root.rglob("*") if not p.is_dir()]
+    rels = [str(p.relative_to(root)).replace("\\", "/") for p in files]
+    if cache is None:
+        digests = hash_files(files, algorithm=algorithm, workers=workers)
+        return dict(zip(rels, digests))
+    out: Dict[str, str] = {}
+    stats: Dict[str, os.stat_result] = {}
+    for rel, p in zip(rels, files):
+        st = p.stat()
+        cached = cache.get(rel, st, algorithm)
+        if cached is not None:
+            out[rel] = cached
+        else:
+            stats[rel] = st
+    todo = list(stats)
+    for rel, d in zip(
+        todo,
+        hash_files([root / rel for rel in todo], algorithm=algorithm, workers=workers),
+    ):
+        out[rel] = d
+        cache.put(rel, stats[rel], algorithm, d)
+    # the whole tree was walked, so entries for deleted files can go
+    cache.retain(rels)
+    cache.save()
+    return {rel: out[rel] for rel in rels}
+
+
+class HashCache:
+    """On-disk cache of file digests for one directory, keyed by each file's stat signature.
+
+    An entry is reused only while (inode, size, mtime_ns, ctime_ns) are unchanged; ctime cannot be set from user
+    space, so rewriting a file and restoring its mtime still invalidates the entry. Files modified within the last
+    couple of seconds are never cached, since a further write in the same timestamp tick would go unnoticed.
+
+    Caches live under `<cache dir>/verify/<hash of root>.json` rather than inside `root`, so template trees (and
+    the manifests generated from them) stay untouched and read-only template roots still benefit. Using a cache
+    refreshes its file's mtime; saving one prunes the least recently used caches beyond `limit`.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        cache_dir: Optional[Path] = None,
+        limit: int = VERIFY_CACHE_LIMIT,
+    ):
+        self.root = Path(root).resolve()
+        key = hashlib.sha256(str(self.root).encode("utf-8")).hexdigest()[:32]
+        self.path = Path(cache_dir or _default_cache_dir()) / "verify" / f"{key}.json"
+        self.limit = limit
+        self._entries: Optional[Dict[str, List[Any]]] = None
+        self._dirty = False
+
+    @staticmethod
+    def _signature(st: os.stat_result) -> List[int]:
+        return [st.st_ino, st.st_size, st.st_mtime_ns, st.st_ctime_ns]
+
+    def _load(self) -> Dict[str, List[Any]]:
+        if self._entries is None:
+            try:
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+                self._entries = (
+                    data.get("entries", {})
+                    if str(data.get("root")) == str(self.root)
+                    else {}
+                )
+                # mark the cache as recently used for pruning
+                os.utime(str(self.path))
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def get(self, rel: str, st: os.stat_result, algorithm: str) -> Optional[str]:
+        """Return the cached digest for `rel` if its stat signature (and algorithm) still match."""
+        entry = self._load().get(rel)
+        if entry and entry[0] == algorithm and entry[1:5] == self._signature(st):
+            return entry[5]
+        return None
+
+    def put(self, rel: str, st: os.stat_result, algorithm: str, digest: str) -> None:
+        if time.time_ns() - st.st_mtime_ns < _RACY_WINDOW_NS:
+            self._load().pop(rel, None)
+        else:
+            self._load()[rel] = [algorithm, *self._signature(st), digest]
+        self._dirty = True
+
+    def retain(self, rels: Sequence[str]) -> None:
+        """Drop entries for files not in `rels` (files deleted from the root since they were cached)."""
+        keep = set(rels)
+        entries = self._load()
+        stale = [rel for rel in entries if rel not in keep]
+        for rel in stale:
+            del entries[rel]
+        self._dirty = self._dirty or bool(stale)
+
+    def _prune(self) -> None:
+        def _mtime(p: Path) -> float:
+            try:
+                return p.stat().st_mtime
+            except OSError:
+                return 0.0
+
+        caches = sorted(self.path.parent.glob("*.json"), key=_mtime, reverse=True)
+        for old in caches[self.limit :]:
+            if old != self.path:
+                old.unlink(missing_ok=True)
+
+    def save(self) -> None:
+        """Write the cache atomically and prune old caches; failures (e.g. read-only home) are ignored."""
+        if not self._dirty:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            tmp.write_text(
+                json.dumps({"root": str(self.root), "entries": self._load()}),
+                encoding="utf-8",
+            )
+            os.replace(str(tmp), str(self.path))
+            self._dirty = False
+            self._prune()
+        except OSError:
+            pass
+
+
+def verify_files(
+    root: Path,
+    expected: Dict[str, str],
+    algorithm: str = "sha256",
+    workers: Optional[int] = None,
+    cache: Optional[HashCache] = None,
+    paranoid: bool = False,
+) -> Dict[str, List[str]]:
+    """Compare files under `root` against `expected` {relpath: hexdigest}.
+
+    With a `cache`, files whose stat signature is unchanged since they were last hashed reuse the cached digest and
+    only the rest are re-hashed (the cache is updated and saved). `paranoid=True` ignores cached digests and
+    re-hashes everything, refreshing the cache.
+
+    Returns {'mismatches': [relpaths], 'missing': [relpaths]}, both in manifest order.
+    """
+    root = Path(root)
+    actual: Dict[str, str] = {}
+    stats: Dict[str, os.stat_result] = {}
+    missing: List[str] = []
+    for rel in expected:
+        try:
+            st = (root / rel).stat()
+        except FileNotFoundError:
+            missing.append(rel)
+            continue
+        cached = (
+            cache.get(rel, st, algorithm)
+            if cache is not None and not paranoid
+            else None
+        )
+        if cached is not None:
+            actual[rel] = cached
+        else:
+            stats[rel] = st
+    todo = list(stats)
+    for rel, d in zip(
+        todo,
+        hash_files([root / rel for rel in todo], algorithm=algorithm, workers=workers),
+    ):
+        actual[rel] = d
+        if cache is not None:
+            cache.put(rel, stats[rel], algorithm, d)
+    if cache is not None:
+        cache.save()
+    mismatches = [
+        rel for rel in expected if rel in actual and actual[rel] != expected[rel]
+    ]
+    return {"mismatches": mismatches, "missing": missing}
@@ -0,0 +1,306 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tarfile
+import uuid
+import zipfile
+from pathlib import Path
+from typing import IO, Dict, List, Optional, Tuple
+
+from . import hashing
+
+MANIFEST_NAME = "bldrx-manifest.json"
+
+# zip archives need random access; streamed ones are spooled in memory up to this size, then to a temp file
+_ZIP_SPOOL_BYTES = 64 * 1024 * 1024
+
+
+def sniff_archive(head: bytes) -> Optional[str]:
+    """Return the archive format ('zip', 'tar', 'tar.gz', 'tar.bz2', 'tar.xz') from its first 512 bytes, or None."""
+    if head.startswith((b"PK\x03\x04", b"PK\x05\x06")):
+        return "zip"
+    if head.startswith(b"\x1f\x8b"):
+        return "tar.gz"
+    if head.startswith(b"BZh"):
+        return "tar.bz2"
+    if head.startswith(b"\xfd7zXZ\x00"):
+        return "tar.xz"
+    if head[257:262] == b"ustar":
+        return "tar"
+    return None
+
+
+class _Replay:
+    """Read-only stream that returns `head` before continuing with `fh` (lets a sniffed stream be re-read)."""
+
+    def __init__(self, head: bytes, fh: IO[bytes]):
+        self._head = head
+        self._fh = fh
+
+    def read(self, n: int = -1) -> bytes:
+        if not self._head:
+            return self._fh.read(n)
+        if n is None or n < 0:
+            data, self._head = self._head + self._fh.read(), b""
+            return data
+        data, self._head = self._head[:n], self._head[n:]
+        if len(data) < n:
+            data += self._fh.read(n - len(data))
+        return data
+
+
+def _read_head(fh: IO[bytes], size: int = 512) -> bytes:
+    # a single read() on a socket may return fewer bytes than asked for
+    head = b""
+    while len(head) < size:
+        chunk = fh.read(size - len(head))
+        if not chunk:
+            break
+        head += chunk
+    return head
+
+
+class StagedInstall:
+    """Install a template by writing its files once, into a staging directory next to the final location.
+
+    Archive members (or the files of a source directory) are streamed straight into
+    `<parent>/.bldrx-install.<pid>.<id>/` and hashed while they are written. `verify()` checks the digests
+    against the template's `bldrx-manifest.json`, and `commit()` moves the template into place with a single
+    rename (the staging directory is on the same filesystem as the destination). `discard()` removes whatever
+    is left of the staging directory and is safe to call after a commit.
+
+    Digests are computed with the manifest's algorithm when the manifest has already been seen, and with the
+    default algorithm otherwise; files hashed with the wrong algorithm are re-read (not re-written) in `verify()`.
+    """
+
+    def __init__(self, parent: Path, hash_files: bool = True, unwrap: bool = True):
+        self.parent = Path(parent)
+        self.parent.mkdir(parents=True, exist_ok=True)
+        self.path = self.parent / f".bldrx-install.{os.getpid()}.{uuid.uuid4().hex}"
+        self.path.mkdir()
+        self.hash_files = hash_files
+        # treat a single top-level directory as the template root (archives usually wrap their contents)
+        self.unwrap = unwrap
+        self.algorithm = hashing.DEFAULT_ALGORITHM
+        # staged relpath -> (algorithm, hexdigest)
+        self.digests: Dict[str, Tuple[str, str]] = {}
+
+    def _target(self, name: str) -> Tuple[str, Path]:
+        rel = name.replace("\\", "/").strip("/")
+        parts = [p for p in rel.split("/") if p not in ("", ".")]
+        if not parts or Path(name).is_absolute() or ".." in parts:
+            raise RuntimeError("Unsafe archive: path traversal detected")
+        rel = "/".join(parts)
+        return rel, self.path.joinpath(*parts)
+
+    def add_dir(self, name: str) -> None:
+        _rel, target = self._target(name)
+        target.mkdir(parents=True, exist_ok=True)
+
+    def add_stream(self, name: str, fh: IO[bytes], mode: Optional[int] = None) -> str:
+        """Write `fh` to `name` (relative to the staging root), hashing the bytes as they pass through."""
+        rel, target = self._target(name)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        h = hashlib.new(self.algorithm) if self.hash_files else None
+        with target.open("wb") as out:
+            for chunk in iter(lambda: fh.read(hashing._CHUNK_SIZE), b""):
+                out.write(chunk)
+                if h is not None:
+                    h.update(chunk)
+        if mode is not None:
+            os.chmod(target, (mode & 0o777) | 0o600)
+        if h is not None:
+            self.digests[rel] = (self.algorithm, h.hexdigest())
+        if target.name == MANIFEST_NAME and rel.count("/") <= 1:
+            self._note_manifest(target)
+        return rel
+
+    def _note_manifest(self, path: Path) -> None:
+        # later members are hashed with the algorithm the manifest asks for
+        try:
+            self.algorithm = hashing.manifest_algorithm(
+                json.loads(path.read_text(encoding="utf-8"))
+            )
+        except (OSError, ValueError):
+            pass
+
+    def add_tar(self, tf: tarfile.TarFile) -> None:
+        """Stream the members of `tf` (opened in a streaming `r|` mode is fine) into staging."""
+        for member in tf:
+            if member.isdir():
+                self.add_dir(member.name)
+            elif member.isfile():
+                fh = tf.extractfile(member)
+                if fh is None:
+                    continue
+                with fh:
+                    self.add_stream(member.name, fh, mode=member.mode)
+            else:
+                # links and device nodes could point outside the template; checking the name is not enough
+                self._target(member.name)
+                raise RuntimeError(
+                    f"Unsafe archive: unsupported member type for '{member.name}'"
+                )
+
+    def add_zip(self, zf: zipfile.ZipFile) -> None:
+        for info in zf.infolist():
+            if info.is_dir():
+                self.add_dir(info.filename)
+                continue
+            mode = (info.external_attr >> 16) & 0o777 or None
+            with zf.open(info) as fh:
+                self.add_stream(info.filename, fh, mode=mode)
+
+    def add_archive(self, fh: IO[bytes]) -> str:
+        """Detect the archive format of `fh` by its magic bytes and stream it into staging; return the format.
+
+        Tar archives (plain, gzip, bzip2 or xz) are read in streaming mode (`r|*`), so `fh` may be a
+        non-seekable stream such as an HTTP response. Zip archives need random access and are spooled first
+        when `fh` cannot seek.
+        """
+        head = _read_head(fh)
+        fmt = sniff_archive(head)
+        if fmt is None:
+            raise ValueError("Unsupported archive format (unrecognized file signature)")
+        stream = _Replay(head, fh)
+        if fmt != "zip":
+            with tarfile.open(fileobj=stream, mode="r|*") as tf:  # type: ignore[call-overload]
+                self.add_tar(tf)
+            return fmt
+        seekable = getattr(fh, "seekable", None)
+        if seekable is not None and seekable():
+            fh.seek(0)
+            with zipfile.ZipFile(fh, "r") as zf:
+                self.add_zip(zf)
+            return fmt
+        import tempfile
+
+        with tempfile.SpooledTemporaryFile(max_size=_ZIP_SPOOL_BYTES) as spool:
+            for chunk in iter(lambda: stream.read(hashing._CHUNK_SIZE), b""):
+                spool.write(chunk)
+            spool.seek(0)
+            with zipfile.ZipFile(spool, "r") as zf:
+                self.add_zip(zf)
+        return fmt
+
+    def add_tree(self, src: Path, prefix: str = "") -> None:
+        """Copy a directory into staging (under `prefix`), one read and one write per file."""
+        src = Path(src)
+        for p in sorted(src.rglob("*")):
+            rel = str(p.relative_to(src)).replace("\\", "/")
+            name = f"{prefix}/{rel}" if prefix else rel
+            if p.is_dir():
+                self.add_dir(name)
+            else:
+                with p.open("rb") as fh:
+                    written = self.add_stream(name, fh)
+                shutil.copystat(p, self.path / written)
+
+    def root(self) -> Path:
+        """Return the template root: the single top-level directory of the archive, or the staging dir itself."""
+        children = list(self.path.iterdir()) if self.unwrap else []
+        if len(children) == 1 and children[0].is_dir():
+            return children[0]
+        return self.path
+
+    def sha256_digests(self) -> Dict[str, str]:
+        """Return {path relative to `root()`: sha256} for the files hashed with sha256 while staging."""
+        root = self.root()
+        prefix = "" if root == self.path else root.name + "/"
+        return {
+            rel[len(prefix) :]: digest
+            for rel, (alg, digest) in self.digests.items()
+            if alg == "sha256" and rel.startswith(prefix)
+        }
+
+    def verify(self) -> None:
+        """Check staged files against the template manifest (if any); raise RuntimeError on any problem."""
+        from .merkle import root_hash
+
+        root = self.root()
+        manifest_path = root / MANIFEST_NAME
+        if not manifest_path.exists():
+            return
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        algorithm = hashing.manifest_algorithm(manifest)
+        files: Dict[str, str] = manifest.get("files", {})
+        if "root" in manifest and manifest["root"] != root_hash(files, algorithm):
+            raise RuntimeError(
+                "Remote template verification failed: manifest root hash does not match its files"
+            )
+        prefix = "" if root == self.path else root.name + "/"
+        actual: Dict[str, str] = {}
+        rehash: List[str] = []
+        for rel in files:
+            staged = self.digests.get(prefix + rel)
+            if staged is not None and staged[0] == algorithm:
+                actual[rel] = staged[1]
+            elif (root / rel).is_file():
+                rehash.append(rel)
+        for rel, digest in zip(
+            rehash,
+            hashing.hash_files([root / rel for rel in rehash], algorithm=algorithm),
+        ):
+            actual[rel] = digest
+        missing = [rel for rel in files if rel not in actual]
+        mismatches = [
+            rel for rel in files if rel in actual and actual[rel] != files[rel]
+        ]
+        if mismatches or missing:
+            raise RuntimeError(
+                f"Remote template verification failed: mismatches={mismatches}, missing={missing}"
+            )
+
+    def commit(
+        self, dest: Path, force: bool = False, root: Optional[Path] = None
+    ) -> Path:
+        """Rename the staged template root (or `root`) to `dest` (callers hold the per-template install lock)."""
+        dest = Path(dest)
+        root = Path(root) if root is not None else self.root()
+        if dest.exists() and not force:
+            raise FileExistsError(
+                f"Template '{dest.name}' already exists in user templates; use force=True to overwrite"
+            )
+        old: Optional[Path] = None
+        if dest.exists():
+            old = dest.with_name(f".{dest.name}.bldrx-old.{uuid.uuid4().hex}")
+            os.rename(dest, old)
+        try:
+            os.rename(root, dest)
+        except OSError:
+            if old is not None:
+                os.rename(old, dest)
+            raise
+        if old is not None:
+            shutil.rmtree(old, ignore_errors=True)
+        return dest
+
+    def discard(self) -> None:
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+def read_source_list(path: Path) -> List[Dict[str, str]]:
+    """Parse a template list file: one `<source> [name]` per line.
+
+    Blank lines, lines starting with `#` and trailing ` # comments` are ignored (a `#` inside a URL is kept).
+    """
+    out: List[Dict[str, str]] = []
+    for lineno, line in enumerate(
+        Path(path).read_text(encoding="utf-8").splitlines(), 1
+    ):
+        line = line.split(" #", 1)[0].strip()
+        if not line or line.startswith("#"):
+            continue
+        parts = line.split()
+        if len(parts) > 2:
+            raise ValueError(
+                f"{path}:{lineno}: expected '<source> [name]', got {line!r}"
+            )
+        entry = {"source": parts[0]}
+        if len(parts) == 2:
+            entry["name"] = parts[1]
+        out.append(entry)
+    return out
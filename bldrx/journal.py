@@ -0,0 +1,279 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+def _journal_root(dest: Path) -> Path:
+    """Return the directory holding apply journals for `dest`."""
+    return Path(dest) / ".bldrx" / "journal"
+
+
+class Journal:
+    """Write-ahead journal for a single transactional apply into `dest`.
+
+    Layout: `dest/.bldrx/journal/<id>/journal.jsonl` (append-only JSON records) plus `originals/`, which receives
+    overwritten files by rename (never by copy). Each file operation is recorded and fsynced *before* the
+    corresponding rename happens, so an interrupted apply can always be rolled back from disk alone.
+
+    Records:
+    - {"op": "begin", "template": str, "started_at": str}
+    - {"op": "stage", "dir": rel} (staged applies: staging tree to discard on rollback/replay)
+    - {"op": "write", "path": rel, "tmp": rel, "aside": rel-in-journal or null}
+    - {"op": "prepared"} (staged applies: every `tmp` is complete, so recovery may roll forward)
+    - {"op": "commit"}
+    """
+
+    FILE_NAME = "journal.jsonl"
+
+    def __init__(self, root: Path, dest: Path):
+        self.root = Path(root)
+        self.dest = Path(dest)
+        self.entries: List[Dict[str, Any]] = []
+        self.template: Optional[str] = None
+        self.staging: Optional[str] = None
+        self.prepared = False
+        self.committed = False
+        self._fh: Optional[Any] = None
+
+    @property
+    def id(self) -> str:
+        return self.root.name
+
+    @classmethod
+    def begin(cls, dest: Path, template_name: str) -> "Journal":
+        """Start a new journal for an apply of `template_name` into `dest`.
+
+        Raises RuntimeError if an interrupted (uncommitted) journal is present; run `bldrx recover` first.
+        Older committed journals are discarded so only the latest apply is kept for `undo`.
+        """
+        dest = Path(dest)
+        for j in cls.list(dest):
+            if not j.committed:
+                raise RuntimeError(
+                    f"Interrupted apply found in {j.root}; run `bldrx recover {dest}` first"
+                )
+            j.discard()
+        jroot = _journal_root(dest)
+        jroot.mkdir(parents=True, exist_ok=True)
+        # keep journals (and the originals moved into them) out of git
+        ignore = jroot / ".gitignore"
+        if not ignore.exists():
+            ignore.write_text("*\n", encoding="utf-8")
+        ts = datetime.now().strftime("%Y%m%d%H%M%S%f")
+        root = jroot / f"{ts}-{os.getpid()}"
+        (root / "originals").mkdir(parents=True)
+        j = cls(root, dest)
+        j.template = template_name
+        j._append(
+            {
+                "op": "begin",
+                "template": template_name,
+                "started_at": datetime.now(timezone.utc).isoformat(),
+            }
+        )
+        return j
+
+    @classmethod
+    def load(cls, root: Path, dest: Path) -> "Journal":
+        """Load a journal from disk, ignoring a torn trailing record."""
+        j = cls(root, dest)
+        path = Path(root) / cls.FILE_NAME
+        if path.exists():
+            for line in path.read_text(encoding="utf-8").splitlines():
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    # partially written last record from a crash
+                    break
+                op = rec.get("op")
+                if op == "begin":
+                    j.template = rec.get("template")
+                elif op == "stage":
+                    j.staging = rec.get("dir")
+                elif op == "write":
+                    j.entries.append(rec)
+                elif op == "prepared":
+                    j.prepared = True
+                elif op == "commit":
+                    j.committed = True
+        return j
+
+    @classmethod
+    def list(cls, dest: Path) -> List["Journal"]:
+        """Return journals present under `dest`, oldest first."""
+        jroot = _journal_root(dest)
+        if not jroot.exists():
+            return []
+        return [cls.load(p, dest) for p in sorted(jroot.iterdir()) if p.is_dir()]
+
+    def _append(self, record: Dict[str, Any], sync: bool = True) -> None:
+        if self._fh is None:
+            self._fh = (self.root / self.FILE_NAME).open("a", encoding="utf-8")
+        self._fh.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self._fh.flush()
+        if sync:
+            os.fsync(self._fh.fileno())
+
+    def _close(self) -> None:
+        if self._fh is not None:
+            try:
+                self._fh.close()
+            finally:
+                self._fh = None
+
+    def _rel(self, path: Path) -> str:
+        return str(Path(path).relative_to(self.dest)).replace("\\", "/")
+
+    def stage(self, staging_dir: Path) -> None:
+        """Record the staging tree used by a staged apply so recovery can discard it."""
+        self.staging = self._rel(staging_dir)
+        self._append({"op": "stage", "dir": self.staging})
+
+    def record(
+        self, target: Path, tmp: Optional[Path] = None, sync: bool = True
+    ) -> Dict[str, Any]:
+        """Record the intent to write `target` (via `tmp`) before anything touches the filesystem.
+
+        Pass `sync=False` when recording a batch; the following `prepare()` fsyncs them all at once.
+        """
+        aside = None
+        if target.exists():
+            aside = f"originals/{len(self.entries)}"
+        rec = {
+            "op": "write",
+            "path": self._rel(target),
+            "tmp": self._rel(tmp) if tmp is not None else None,
+            "aside": aside,
+        }
+        self._append(rec, sync=sync)
+        self.entries.append(rec)
+        return rec
+
+    def move_aside(self, rec: Dict[str, Any]) -> None:
+        """Move the original file recorded in `rec` into the journal by rename."""
+        if rec.get("aside"):
+            os.replace(str(self.dest / rec["path"]), str(self.root / rec["aside"]))
+
+    def prepare(self) -> None:
+        """Mark every recorded `tmp` as complete (one fsync for the whole batch)."""
+        self._append({"op": "prepared"})
+        self.prepared = True
+
+    def commit(self) -> None:
+        """Mark the apply as complete; the originals are kept until the next apply for `undo`."""
+        self._append({"op": "commit"})
+        self.committed = True
+        self._close()
+
+    def rollback(self) -> List[str]:
+        """Undo every recorded write in reverse order and remove the journal.
+
+        Returns the list of restored/removed relative paths. Safe to call on a partially applied journal:
+        entries whose original was never moved aside are left untouched.
+        """
+        self._close()
+        touched: List[str] = []
+        for rec in reversed(self.entries):
+            target = self.dest / rec["path"]
+            tmp = rec.get("tmp")
+            if tmp:
+                try:
+                    (self.dest / tmp).unlink()
+                except FileNotFoundError:
+                    pass
+            aside = rec.get("aside")
+            if aside:
+                aside_path = self.root / aside
+                if aside_path.exists():
+                    os.replace(str(aside_path), str(target))
+                    touched.append(rec["path"])
+            elif target.exists():
+                target.unlink()
+                touched.append(rec["path"])
+        self.discard()
+        return touched
+
+    def replay(self) -> List[str]:
+        """Roll a prepared journal forward: finish every pending rename, then commit and discard the staging tree.
+
+        Returns the list of relative paths that were moved into place.
+        """
+        if not self.prepared:
+            raise RuntimeError(
+                f"Journal {self.id} is not prepared; roll it back instead"
+            )
+        touched: List[str] = []
+        for rec in self.entries:
+            tmp = self.dest / rec["tmp"] if rec.get("tmp") else None
+            if tmp is None or not tmp.exists():
+                # already renamed into place before the interruption
+                continue
+            target = self.dest / rec["path"]
+            aside = rec.get("aside")
+            if aside and target.exists() and not (self.root / aside).exists():
+                self.move_aside(rec)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(str(tmp), str(target))
+            touched.append(rec["path"])
+        self.commit()
+        self._discard_staging()
+        return touched
+
+    def _discard_staging(self) -> None:
+        if self.staging:
+            shutil.rmtree(self.dest / self.staging, ignore_errors=True)
+
+    def discard(self) -> None:
+        """Delete the journal directory (and any originals it holds)."""
+        self._close()
+        self._discard_staging()
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+def recover(dest: Path) -> List[Dict[str, Any]]:
+    """Resolve every interrupted (uncommitted) apply journal in `dest`.
+
+    Prepared journals (a staged apply that died during its commit loop) are replayed forward; all others are
+    rolled back. Returns a list of {'journal': id, 'template': name, 'action': 'replayed'|'rolled-back',
+    'restored': [relpaths]} dicts.
+    """
+    out: List[Dict[str, Any]] = []
+    for j in Journal.list(dest):
+        if j.committed:
+            continue
+        if j.prepared:
+            out.append(
+                {
+                    "journal": j.id,
+                    "template": j.template,
+                    "action": "replayed",
+                    "restored": j.replay(),
+                }
+            )
+        else:
+            out.append(
+                {
+                    "journal": j.id,
+                    "template": j.template,
+                    "action": "rolled-back",
+                    "restored": j.rollback(),
+                }
+            )
+    return out
+
+
+def undo(dest: Path) -> Dict[str, Any]:
+    """Roll back the most recent apply into `dest` (committed or interrupted).
+
+    Raises FileNotFoundError if there is no journal to undo.
+    """
+    journals = Journal.list(dest)
+    if not journals:
+        raise FileNotFoundError(f"No apply journal found in {dest}")
+    j = journals[-1]
+    return {"journal": j.id, "template": j.template, "restored": j.rollback()}
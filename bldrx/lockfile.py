@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+LOCKFILE_NAME = "bldrx.lock"
+LOCKFILE_VERSION = 1
+
+# metadata keys that change on every run and so are left out of the metadata hash
+_VOLATILE_METADATA_KEYS = ("dev_timestamp",)
+
+
+def metadata_hash(metadata: Optional[Dict[str, Any]]) -> str:
+    """Return the sha256 of the canonical JSON form of `metadata` (volatile keys excluded)."""
+    stable = {
+        k: v for k, v in (metadata or {}).items() if k not in _VOLATILE_METADATA_KEYS
+    }
+    canonical = json.dumps(
+        stable, sort_keys=True, separators=(",", ":"), default=str
+    ).encode("utf-8")
+    return hashlib.sha256(canonical).hexdigest()
+
+
+def template_root_hash(
+    src: Path, algorithm: str = "sha256", paranoid: bool = False
+) -> str:
+    """Return the Merkle root hash (see `bldrx.merkle`) of the files of the template at `src`.
+
+    The template's own `bldrx-manifest.json` is left out, so adding or re-signing a manifest does not change the
+    hash. Digests are cached by stat signature (`bldrx.hashing.HashCache`) unless `paranoid` is set, so checking an
+    unchanged template only stats its files.
+    """
+    from .hashing import HashCache, hash_tree
+    from .merkle import root_hash
+
+    files = hash_tree(
+        src, algorithm=algorithm, cache=None if paranoid else HashCache(src)
+    )
+    files.pop("bldrx-manifest.json", None)
+    return root_hash(files, algorithm)
+
+
+def lockfile_path(project: Path) -> Path:
+    return Path(project) / LOCKFILE_NAME
+
+
+def read_lockfile(project: Path) -> Dict[str, Any]:
+    """Return the parsed `bldrx.lock` of `project`.
+
+    Raises:
+        FileNotFoundError: if the project has no lockfile.
+        ValueError: if the lockfile is not valid JSON or was written by an unsupported lockfile version.
+    """
+    path = lockfile_path(project)
+    if not path.exists():
+        raise FileNotFoundError(
+            f"No {LOCKFILE_NAME} in {project}; run `bldrx lock` first"
+        )
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except ValueError as e:
+        raise ValueError(f"Invalid {LOCKFILE_NAME} at {path}: {e}")
+    if data.get("version") != LOCKFILE_VERSION:
+        raise ValueError(
+            f"Unsupported {LOCKFILE_NAME} version {data.get('version')!r} at {path}"
+        )
+    data.setdefault("templates", {})
+    return data
+
+
+def write_lockfile(project: Path, data: Dict[str, Any]) -> Path:
+    """Write `data` to `project/bldrx.lock` atomically (sorted keys, so lockfiles diff cleanly)."""
+    path = lockfile_path(project)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    os.replace(str(tmp), str(path))
+    return path
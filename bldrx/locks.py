@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+try:  # POSIX
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+try:  # Windows
+    import msvcrt
+except ImportError:
+    msvcrt = None  # type: ignore[assignment]
+
+
+def _default_locks_dir() -> Path:
+    """Return the platform-appropriate directory for bldrx lock files."""
+    if os.name == "nt":
+        appdata = os.getenv("APPDATA") or Path.home()
+        return Path(appdata) / "bldrx" / "locks"
+    return Path.home() / ".bldrx" / "locks"
+
+
+class LockTimeout(RuntimeError):
+    """Raised when a lock cannot be acquired within the requested timeout."""
+
+
+def _flock(fd: int, op: int, timeout: Optional[float]) -> bool:
+    """Acquire `op` (LOCK_SH/LOCK_EX) on `fd`, blocking in the kernel rather than polling.
+
+    Returns False on timeout. With a timeout the blocking call runs in a helper thread; if the caller gives up,
+    the helper releases the lock and closes `fd` as soon as it is granted, so ownership of `fd` passes to it.
+    """
+    assert fcntl is not None
+    try:
+        fcntl.flock(fd, op | fcntl.LOCK_NB)
+        return True
+    except BlockingIOError:
+        pass
+    if timeout is None:
+        fcntl.flock(fd, op)
+        return True
+    if timeout <= 0:
+        return False
+    granted = threading.Event()
+    guard = threading.Lock()
+    state: Dict[str, Any] = {"abandoned": False, "error": None}
+
+    def _wait():
+        try:
+            fcntl.flock(fd, op)
+        except OSError as e:
+            state["error"] = e
+            granted.set()
+            return
+        with guard:
+            if state["abandoned"]:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+                os.close(fd)
+                return
+            granted.set()
+
+    threading.Thread(target=_wait, name="bldrx-lock-wait", daemon=True).start()
+    granted.wait(timeout)
+    with guard:
+        if not granted.is_set():
+            state["abandoned"] = True
+            return False
+    if state["error"] is not None:
+        raise state["error"]
+    return True
+
+
+@contextmanager
+def file_lock(
+    path: Path, shared: bool = False, timeout: Optional[float] = None
+) -> Iterator[None]:
+    """Hold a shared or exclusive lock on `path` for the duration of the `with` block.
+
+    On POSIX this uses `fcntl.flock`: waiters block in the kernel (no polling). On Windows it locks the first
+    byte of the file with `msvcrt.locking` (always exclusive; `shared` is ignored), polling until it is free.
+    Either way the OS releases the lock if the holder dies, so crashed processes never leave stale locks. The
+    lock file itself is left in place (deleting it would let a waiter lock an orphaned inode).
+
+    Raises LockTimeout if the lock is not acquired within `timeout` seconds (None waits indefinitely).
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if fcntl is None:
+        with _msvcrt_lock(path, timeout):
+            yield
+        return
+    fd = os.open(str(path), os.O_RDWR | os.O_CREAT, 0o644)
+    op = fcntl.LOCK_SH if shared else fcntl.LOCK_EX
+    try:
+        acquired = _flock(fd, op, timeout)
+    except BaseException:
+        os.close(fd)
+        raise
+    if not acquired:
+        # fd now belongs to the abandoned waiter thread
+        raise LockTimeout(f"Could not acquire lock {path} within {timeout} seconds")
+    try:
+        yield
+    finally:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
+
+
+@contextmanager
+def _msvcrt_lock(path: Path, timeout: Optional[float]) -> Iterator[None]:
+    """Windows lock: hold a byte-range lock on the first byte of `path`, polling until it is granted."""
+    import time
+
+    assert msvcrt is not None
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    fd = os.open(str(path), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        while True:
+            try:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)  # type: ignore[attr-defined]
+                break
+            except OSError:
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise LockTimeout(
+                        f"Could not acquire lock {path} within {timeout} seconds"
+                    )
+                time.sleep(0.05)
+        try:
+            yield
+        finally:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)  # type: ignore[attr-defined]
+    finally:
+        os.close(fd)
+
+
+class LockManager:
+    """Named lock scopes used by the engine and registry.
+
+    Scopes:
+    - user_template(root, name): installs/uninstalls of one user template (`<root>/.<name>.lock`)
+    - destination(dest): applies into one project directory (lock file kept under the locks dir so project
+      trees stay clean)
+    - registry(root): writes to a local catalog registry (`<root>/.registry.lock`)
+
+    Every scope accepts `shared=True` for readers and a `timeout` in seconds (None waits indefinitely).
+    """
+
+    def __init__(self, root: Optional[Path] = None):
+        env = os.getenv("BLDRX_LOCKS_DIR")
+        if root:
+            self.root = Path(root)
+        elif env:
+            self.root = Path(env).expanduser()
+        else:
+            self.root = _default_locks_dir()
+
+    def user_template(
+        self,
+        templates_root: Path,
+        name: str,
+        shared: bool = False,
+        timeout: Optional[float] = None,
+    ):
+        return file_lock(
+            Path(templates_root) / f".{name}.lock", shared=shared, timeout=timeout
+        )
+
+    def destination(
+        self, dest: Path, shared: bool = False, timeout: Optional[float] = None
+    ):
+        key = hashlib.sha256(str(Path(dest).resolve()).encode("utf-8")).hexdigest()[:32]
+        return file_lock(
+            self.root / "dest" / f"{key}.lock", shared=shared, timeout=timeout
+        )
+
+    def registry(
+        self, registry_root: Path, shared: bool = False, timeout: Optional[float] = None
+    ):
+        return file_lock(
+            Path(registry_root) / ".registry.lock", shared=shared, timeout=timeout
+        )
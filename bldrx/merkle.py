@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import hashlib
+from typing import Dict, List, Optional, Set, Tuple
+
+
+def _parent(rel: str) -> str:
+    return rel.rsplit("/", 1)[0] if "/" in rel else ""
+
+
+def _name(rel: str) -> str:
+    return rel.rsplit("/", 1)[-1]
+
+
+def _join(d: str, name: str) -> str:
+    return f"{d}/{name}" if d else name
+
+
+class _Index:
+    """Children of every directory of a flat `files` map ('' is the root)."""
+
+    def __init__(self, files: Dict[str, str]):
+        self.files = files
+        self.child_files: Dict[str, Set[str]] = {"": set()}
+        self.child_dirs: Dict[str, Set[str]] = {"": set()}
+        for rel in files:
+            d = _parent(rel)
+            self.child_files.setdefault(d, set()).add(_name(rel))
+            # register every ancestor directory with its parent
+            while d:
+                self.child_dirs.setdefault(d, set())
+                self.child_files.setdefault(d, set())
+                kids = self.child_dirs.setdefault(_parent(d), set())
+                if _name(d) in kids:
+                    break
+                kids.add(_name(d))
+                d = _parent(d)
+
+    def dirs(self) -> List[str]:
+        return list(self.child_dirs)
+
+    def files_under(self, d: str) -> List[str]:
+        out = [_join(d, n) for n in self.child_files.get(d, ())]
+        for sub in self.child_dirs.get(d, ()):
+            out.extend(self.files_under(_join(d, sub)))
+        return out
+
+
+def tree_hashes(files: Dict[str, str], algorithm: str = "sha256") -> Dict[str, str]:
+    """Return {directory relpath: hash} for every directory implied by `files` ('' is the root).
+
+    A directory hash covers the sorted lines `f <name> <file hash>` / `d <name> <dir hash>` of its direct children
+    (like a git tree), so equal hashes mean identical subtrees.
+    """
+    idx = _Index(files)
+    out: Dict[str, str] = {}
+    # deepest directories first so children are hashed before their parents
+    for d in sorted((d for d in idx.dirs() if d), key=lambda x: -x.count("/")):
+        out[d] = _dir_hash(d, idx, out, algorithm)
+    out[""] = _dir_hash("", idx, out, algorithm)
+    return out
+
+
+def _dir_hash(d: str, idx: _Index, computed: Dict[str, str], algorithm: str) -> str:
+    entries: List[Tuple[str, str, str]] = []
+    for n in idx.child_files.get(d, ()):
+        entries.append((n, "f", idx.files[_join(d, n)]))
+    for n in idx.child_dirs.get(d, ()):
+        entries.append((n, "d", computed[_join(d, n)]))
+    h = hashlib.new(algorithm)
+    for name, kind, digest in sorted(entries):
+        h.update(f"{kind} {name} {digest}\n".encode("utf-8"))
+    return h.hexdigest()
+
+
+def root_hash(files: Dict[str, str], algorithm: str = "sha256") -> str:
+    return tree_hashes(files, algorithm)[""]
+
+
+def select(files: Dict[str, str], only: List[str]) -> List[str]:
+    """Return the manifest paths covered by `only` (file paths or directory prefixes; `.j2` suffixes optional)."""
+    wanted = [p.replace("\\", "/").strip("/") for p in only]
+    out = []
+    for rel in files:
+        target = rel[:-3] if rel.endswith(".j2") else rel
+        for w in wanted:
+            if w in (rel, target) or rel.startswith(w + "/"):
+                out.append(rel)
+                break
+    return out
+
+
+def diff(
+    a: Dict[str, str],
+    b: Dict[str, str],
+    tree_a: Optional[Dict[str, str]] = None,
+    tree_b: Optional[Dict[str, str]] = None,
+) -> Dict[str, List[str]]:
+    """Compare two `files` maps and return {'added': [...], 'removed': [...], 'changed': [...]} (sorted).
+
+    With the Merkle directory hashes of both sides (`tree_a`/`tree_b`, the manifests' `tree` sections), directories
+    are compared top-down and unchanged subtrees are skipped, so only O(changes x depth) entries are compared. Both
+    maps are still indexed by directory first, which is a linear pass without any hashing. Without both trees
+    (flat manifests, or directories hashed on the fly) the maps are compared entry by entry: O(files), and cheaper
+    than computing directory hashes just to compare them once.
+    """
+    if tree_a is None or tree_b is None:
+        return {
+            "added": sorted(rel for rel in b if rel not in a),
+            "removed": sorted(rel for rel in a if rel not in b),
+            "changed": sorted(rel for rel in a if rel in b and a[rel] != b[rel]),
+        }
+    ia, ib = _Index(a), _Index(b)
+    added: List[str] = []
+    removed: List[str] = []
+    changed: List[str] = []
+    stack = [""]
+    while stack:
+        d = stack.pop()
+        if tree_a.get(d) is not None and tree_a.get(d) == tree_b.get(d):
+            continue
+        fa, fb = ia.child_files.get(d, set()), ib.child_files.get(d, set())
+        da, db = ia.child_dirs.get(d, set()), ib.child_dirs.get(d, set())
+        for n in fa | fb:
+            rel = _join(d, n)
+            if n in fa and n in fb:
+                if a[rel] != b[rel]:
+                    changed.append(rel)
+            elif n in fa:
+                removed.append(rel)
+            else:
+                added.append(rel)
+        for n in da | db:
+            rel = _join(d, n)
+            if n in da and n in db:
+                stack.append(rel)
+            elif n in da:
+                removed.extend(ia.files_under(rel))
+            else:
+                added.extend(ib.files_under(rel))
+    return {
+        "added": sorted(added),
+        "removed": sorted(removed),
+        "changed": sorted(changed),
+    }
@@ -1,8 +1,24 @@
 import json
 import os
+import sqlite3
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+from .locks import LockManager
 
 
 def _default_registry_dir() -> Path:
@@ -14,23 +30,205 @@ def _default_registry_dir() -> Path:
         return Path.home() / ".bldrx" / "registry"
 
 
+def _registry_root(root: Optional[Path] = None) -> Path:
+    """Return `root`, else `BLDRX_REGISTRY_DIR`, else the default registry directory."""
+    env = os.getenv("BLDRX_REGISTRY_DIR")
+    if root:
+        return Path(root)
+    if env:
+        return Path(env)
+    return _default_registry_dir()
+
+
+# compact per-entry fields kept in the registry index (everything but the manifest)
+INDEX_FIELDS = ("name", "version", "description", "tags", "published_at")
+INDEX_NAME = ".index.json"
+_INDEX_VERSION = 2
+# intent record of a publish whose entry files are being renamed into place; see `Registry._store_entries`
+PENDING_NAME = ".publish-pending.json"
+
+# {name: {version: index record}}
+_NameIndex = Dict[str, Dict[str, Dict[str, Any]]]
+
+
+def _sort_key(version: str) -> Tuple[int, object]:
+    from .semver import sort_key
+
+    return sort_key(version)
+
+
+def _semver_collation(a: str, b: str) -> int:
+    """SQLite collation ordering versions like `bldrx.semver.sort_key` (so 0.9.0 sorts before 0.10.0)."""
+    ka, kb = _sort_key(a), _sort_key(b)
+    return (ka > kb) - (ka < kb)
+
+
+def _contains(rec: Dict[str, Any], ql: str) -> bool:
+    """Case-insensitive substring match of `ql` against a record's name, description or tags."""
+    return (
+        ql in (rec.get("name") or "").lower()
+        or ql in (rec.get("description") or "").lower()
+        or any(ql in t.lower() for t in rec.get("tags") or [])
+    )
+
+
+def _template_defaults(src: Path) -> Dict[str, Any]:
+    """`version`, `description` and `tags` declared in a template's own `bldrx-manifest.json`, if any."""
+    try:
+        manifest = json.loads((src / "bldrx-manifest.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return {k: manifest[k] for k in ("version", "description", "tags") if k in manifest}
+
+
+def _same_content(published: Dict[str, Any], meta: Dict[str, Any]) -> bool:
+    """Whether two entries describe the same template files (name, version and publish time aside)."""
+    old, new = published.get("manifest") or {}, meta["manifest"]
+    return (old.get("algorithm") or "sha256") == new["algorithm"] and old.get(
+        "files"
+    ) == new["files"]
+
+
+def _check_page(limit: Optional[int], offset: int) -> None:
+    if (limit is not None and limit < 0) or offset < 0:
+        raise ValueError("limit and offset must not be negative")
+
+
+def _project(
+    rec: Dict[str, Any],
+    fields: Optional[Sequence[str]],
+    load: Callable[[Dict[str, Any]], Dict[str, Any]],
+) -> Dict[str, Any]:
+    """Return `rec` restricted to `fields`, loading the full entry (once) only for keys the record lacks."""
+    if fields is None:
+        return rec
+    full: Optional[Dict[str, Any]] = None
+    out: Dict[str, Any] = {}
+    for f in fields:
+        if f in rec:
+            out[f] = rec[f]
+            continue
+        if full is None:
+            full = load(rec)
+        out[f] = full.get(f)
+    return out
+
+
 class Registry:
-    """Simple local JSON-backed template registry used by the `catalog` CLI group."""
+    """Simple local JSON-backed template registry used by the `catalog` CLI group.
+
+    Each entry is stored as `<name>-<version>.json` (metadata plus the full file manifest). A compact index of all
+    entries by name and version (`.index.json`: `INDEX_FIELDS` plus the entry file name) is kept up to date by
+    `publish` and `remove`, so `list_entries`, `search`, `get` and `remove` never parse entry files they do not
+    return. `rebuild_index()` (`bldrx catalog reindex`) re-creates the index from the entry files if they were
+    changed by hand. Versions are ordered and resolved as semantic versions (see `bldrx.semver`).
+    """
 
     def __init__(self, root: Optional[Path] = None):
-        env = os.getenv("BLDRX_REGISTRY_DIR")
-        if root:
-            self.root = Path(root)
-        elif env:
-            self.root = Path(env)
-        else:
-            self.root = _default_registry_dir()
+        self.root = _registry_root(root)
         self.root.mkdir(parents=True, exist_ok=True)
+        self.locks = LockManager()
 
     def _entry_path(self, name: str, version: str) -> Path:
         safe_name = name.replace(" ", "_")
         return self.root / f"{safe_name}-{version}.json"
 
+    @property
+    def index_path(self) -> Path:
+        return self.root / INDEX_NAME
+
+    def _entry_files(self) -> List[Path]:
+        return sorted(
+            p
+            for p in self.root.iterdir()
+            if p.suffix == ".json" and not p.name.startswith(".")
+        )
+
+    @staticmethod
+    def _index_record(meta: Dict[str, Any], fname: str) -> Dict[str, Any]:
+        return dict({k: meta.get(k) for k in INDEX_FIELDS}, file=fname)
+
+    def _public_record(self, rec: Dict[str, Any]) -> Dict[str, Any]:
+        out = {k: rec.get(k) for k in INDEX_FIELDS}
+        out["path"] = str(self.root / rec["file"])
+        return out
+
+    def _load_index(self) -> Optional[_NameIndex]:
+        try:
+            data = json.loads(self.index_path.read_text(encoding="utf-8"))
+            if data.get("version") == _INDEX_VERSION:
+                return data["names"]
+        except (OSError, ValueError, KeyError):
+            pass
+        return None
+
+    def _locked_index(self) -> _NameIndex:
+        # callers hold the registry lock
+        if self._roll_forward():
+            return self._rebuild_index()
+        names = self._load_index()
+        return names if names is not None else self._rebuild_index()
+
+    def _read_index(self) -> _NameIndex:
+        """Return {name: {version: index record}}, rebuilding the index if it is missing, unreadable or stale."""
+        names = self._load_index()
+        if names is not None and not (self.root / PENDING_NAME).exists():
+            return names
+        with self.locks.registry(self.root):
+            return self._locked_index()
+
+    def _roll_forward(self) -> bool:
+        """Finish a publish interrupted while renaming its entry files into place; True if one was pending.
+
+        The pending record lists (staged temp, entry file) names; every staged file still present is renamed into
+        place. The record is removed by the caller's index rebuild (`_write_index`).
+        """
+        # callers hold the registry lock
+        pending = self.root / PENDING_NAME
+        if not pending.exists():
+            return False
+        try:
+            moves = json.loads(pending.read_text(encoding="utf-8"))["moves"]
+        except (OSError, ValueError, KeyError):
+            moves = []
+        for tmp_name, entry_name in moves:
+            tmp = self.root / tmp_name
+            if tmp.exists():
+                os.replace(str(tmp), str(self.root / entry_name))
+        return True
+
+    def _write_index(self, names: _NameIndex) -> None:
+        tmp = self.index_path.with_name(f"{INDEX_NAME}.{os.getpid()}.tmp")
+        tmp.write_text(
+            json.dumps({"version": _INDEX_VERSION, "names": names}),
+            encoding="utf-8",
+        )
+        os.replace(str(tmp), str(self.index_path))
+        # the index now covers any pending publish
+        (self.root / PENDING_NAME).unlink(missing_ok=True)
+
+    def _rebuild_index(self) -> _NameIndex:
+        # callers hold the registry lock
+        names: _NameIndex = {}
+        for p in self._entry_files():
+            try:
+                meta = json.loads(p.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            if meta.get("name") is None or meta.get("version") is None:
+                continue
+            names.setdefault(meta["name"], {})[meta["version"]] = self._index_record(
+                meta, p.name
+            )
+        self._write_index(names)
+        return names
+
+    def rebuild_index(self) -> int:
+        """Re-create the index from the entry files on disk; returns the number of entries indexed."""
+        with self.locks.registry(self.root):
+            self._roll_forward()
+            return sum(len(v) for v in self._rebuild_index().values())
+
     def publish(
         self,
         src: Path,
@@ -41,24 +239,135 @@ class Registry:
         force: bool = False,
         sign: bool = False,
         key: Optional[str] = None,
+        algorithm: str = "sha256",
+    ) -> Dict[str, Any]:
+        """Publish a local template directory into the registry. Returns the metadata dict that was written to disk.
+
+        `algorithm` selects the manifest digest algorithm (see `bldrx.hashing.HASH_ALGORITHMS`).
+        """
+        meta = self._make_entry(
+            src, name, version, description, tags, sign, key, algorithm
+        )
+        self._store_entries([meta], force)
+        return meta
+
+    def publish_many(
+        self,
+        sources: Sequence[Union[str, Path, Dict[str, Any]]],
+        version: str = "0.0.0",
+        description: str = "",
+        tags: Optional[List[str]] = None,
+        force: bool = False,
+        sign: bool = False,
+        key: Optional[str] = None,
+        algorithm: str = "sha256",
+        workers: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Publish many template directories in one registry transaction.
+
+        Parameters:
+        - sources: template directories, or dicts {'src', 'name', 'version', 'description', 'tags'} (all but 'src'
+          optional). Missing values come from the template's `bldrx-manifest.json` (`version`, `description`,
+          `tags`) when it has them, else from the arguments below.
+        - version / description / tags: defaults for templates that do not set their own
+        - force: overwrite an existing entry whose version equals the new one
+        - sign / key / algorithm: as for `publish`
+        - workers: templates hashed concurrently (default: up to 8)
+
+        Templates are hashed concurrently. A template whose files and algorithm equal those of the latest published
+        version of its name is skipped. Everything else is written together: entry files are staged first and the
+        index is replaced once (JSON backend), or one SQLite transaction is used. A missing source, a duplicate
+        name/version in `sources`, or (without `force`) an existing version raises before any entry is written.
+
+        Returns one {'name', 'version', 'src', 'status': 'published'|'unchanged'} per source, in order; for unchanged
+        templates 'version' is the already-published version.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        from .semver import resolve
+
+        items = [dict(s) if isinstance(s, dict) else {"src": s} for s in sources]
+        if not items:
+            return []
+
+        def _build(item: Dict[str, Any]) -> Dict[str, Any]:
+            src = Path(item["src"])
+            own = _template_defaults(src)
+            return self._make_entry(
+                src,
+                item.get("name"),
+                item.get("version") or own.get("version") or version,
+                item.get("description") or own.get("description") or description,
+                item.get("tags") or own.get("tags") or tags,
+                sign,
+                key,
+                algorithm,
+            )
+
+        with ThreadPoolExecutor(max_workers=workers or min(8, len(items))) as pool:
+            metas = list(pool.map(_build, items))
+        seen: Set[Tuple[str, str]] = set()
+        for meta in metas:
+            ident = (meta["name"], meta["version"])
+            if ident in seen:
+                raise ValueError(
+                    f"Catalog entry {ident[0]} {ident[1]} is listed more than once"
+                )
+            seen.add(ident)
+
+        published = self._published_versions({m["name"] for m in metas})
+        results: List[Dict[str, Any]] = []
+        pending: List[Dict[str, Any]] = []
+        for meta in metas:
+            versions = published.get(meta["name"], [])
+            latest = resolve(versions) if versions else None
+            status = "published"
+            if latest is not None and _same_content(
+                self._load_version(meta["name"], latest), meta
+            ):
+                status = "unchanged"
+            elif meta["version"] in versions and not force:
+                raise FileExistsError(
+                    f"Catalog entry already exists: {meta['name']} {meta['version']}"
+                )
+            else:
+                pending.append(meta)
+            results.append(
+                {
+                    "name": meta["name"],
+                    "version": latest if status == "unchanged" else meta["version"],
+                    "src": meta["source"],
+                    "status": status,
+                }
+            )
+        if pending:
+            self._store_entries(pending, force)
+        return results
+
+    def _make_entry(
+        self,
+        src: Path,
+        name: Optional[str],
+        version: str,
+        description: str,
+        tags: Optional[List[str]],
+        sign: bool,
+        key: Optional[str],
+        algorithm: str,
     ) -> Dict[str, Any]:
-        """Publish a local template directory into the registry. Returns the metadata dict that was written to disk."""
+        """Hash `src` and return the entry metadata `publish` stores (backend independent)."""
         src = Path(src)
         if not src.exists():
             raise FileNotFoundError(f"Source '{src}' not found")
         # compute manifest
-        files: Dict[str, str] = {}
         import hashlib
         import hmac
 
-        for p in src.rglob("*"):
-            if p.is_dir():
-                continue
-            rel = str(p.relative_to(src)).replace("\\", "/")
-            h = hashlib.sha256()
-            h.update(p.read_bytes())
-            files[rel] = h.hexdigest()
-        manifest: Dict[str, Any] = {"files": files}
+        from .hashing import check_algorithm, hash_tree
+
+        check_algorithm(algorithm)
+        files: Dict[str, str] = hash_tree(src, algorithm=algorithm)
+        manifest: Dict[str, Any] = {"algorithm": algorithm, "files": files}
         if sign:
             use_key = key or os.getenv("BLDRX_MANIFEST_KEY")
             if not use_key:
@@ -81,61 +390,524 @@ class Registry:
             "source": str(src.resolve()),
             "published_at": datetime.utcnow().isoformat() + "Z",
         }
-        path = self._entry_path(entry_name, version)
-        if path.exists() and not force:
-            raise FileExistsError(f"Catalog entry already exists: {path}")
-        path.write_text(json.dumps(meta, indent=2), encoding="utf-8")
         return meta
 
+    def _store_entries(self, metas: List[Dict[str, Any]], force: bool) -> None:
+        """Write entries and their index records under the registry lock.
+
+        Every entry is first written to a hidden temp file; a failure while staging leaves the registry as it was.
+        Then a pending record listing the renames is written, the files are renamed into place and the index is
+        replaced (which drops the record). If the process dies between the record and the index, the next read or
+        write finds the record, completes the renames and rebuilds the index, so the batch is published whole.
+        """
+        paths = [self._entry_path(m["name"], m["version"]) for m in metas]
+        with self.locks.registry(self.root):
+            if not force:
+                for path in paths:
+                    if path.exists():
+                        raise FileExistsError(f"Catalog entry already exists: {path}")
+            names = self._locked_index()
+            staged: List[Path] = []
+            try:
+                for meta, path in zip(metas, paths):
+                    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+                    staged.append(tmp)
+                    tmp.write_text(json.dumps(meta, indent=2), encoding="utf-8")
+            except BaseException:
+                for tmp in staged:
+                    tmp.unlink(missing_ok=True)
+                raise
+            pending = self.root / PENDING_NAME
+            pending_tmp = pending.with_name(f"{PENDING_NAME}.{os.getpid()}.tmp")
+            pending_tmp.write_text(
+                json.dumps(
+                    {"moves": [[t.name, p.name] for t, p in zip(staged, paths)]}
+                ),
+                encoding="utf-8",
+            )
+            os.replace(str(pending_tmp), str(pending))
+            for meta, path, tmp in zip(metas, paths, staged):
+                os.replace(str(tmp), str(path))
+                names.setdefault(meta["name"], {})[meta["version"]] = (
+                    self._index_record(meta, path.name)
+                )
+            self._write_index(names)
+
+    def _published_versions(self, names: Iterable[str]) -> Dict[str, List[str]]:
+        index = self._read_index()
+        return {n: list(index.get(n, {})) for n in names}
+
+    def _load_version(self, name: str, version: str) -> Dict[str, Any]:
+        rec = self._read_index()[name][version]
+        return json.loads((self.root / rec["file"]).read_text(encoding="utf-8"))
+
     def list_entries(self) -> List[Dict[str, Any]]:
-        """Return list of registry entries (loaded from JSON files)."""
-        out: List[Dict[str, Any]] = []
-        for p in sorted(self.root.iterdir()):
-            if p.suffix == ".json":
-                out.append(json.loads(p.read_text(encoding="utf-8")))
-        return out
+        """Return the index record of every registry entry, by name and then semantic version.
 
-    def search(self, q: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Search entries by name, description or tags (case-insensitive)."""
-        q = q or ""
-        ql = q.lower()
-        res: List[Dict[str, Any]] = []
-        for e in self.list_entries():
-            if (
-                ql in e.get("name", "").lower()
-                or ql in e.get("description", "").lower()
-                or any(ql in t.lower() for t in e.get("tags", []))
-            ):
-                res.append(e)
-        return res
+        Records hold `INDEX_FIELDS` and `path` (the entry file); use `get` for the full metadata and manifest.
+        """
+        from .semver import sort_key
+
+        names = self._read_index()
+        return [
+            self._public_record(names[name][version])
+            for name in sorted(names)
+            for version in sorted(names[name], key=sort_key)
+        ]
+
+    def versions(self, name: str) -> List[str]:
+        """Return the published versions of `name`, lowest first (semantic version order)."""
+        from .semver import sort_key
+
+        return sorted(self._read_index().get(name, {}), key=sort_key)
+
+    def search(
+        self,
+        q: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        fields: Optional[Sequence[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Search entries by name, description or tags (case-insensitive); returns index records (see `list_entries`).
+
+        `limit`, `offset` and `fields` page and project the results as in `iter_search`.
+        """
+        return list(self.iter_search(q, limit=limit, offset=offset, fields=fields))
+
+    def iter_search(
+        self,
+        q: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Lazily yield the entries matching `q` (see `search`), skipping `offset` matches and stopping after `limit`.
+
+        `fields` projects each result to the given keys. Index fields (`INDEX_FIELDS`, `path`) cost nothing extra;
+        any other key (e.g. `manifest`, `source`) loads that entry's file, and only for the results yielded.
+        """
+        import itertools
+
+        _check_page(limit, offset)
+        ql = (q or "").lower()
+        names = self._read_index()
+        matches = (
+            self._public_record(names[name][version])
+            for name in sorted(names)
+            for version in sorted(names[name], key=_sort_key)
+            if _contains(names[name][version], ql)
+        )
+        stop = None if limit is None else offset + limit
+        for rec in itertools.islice(matches, offset, stop):
+            yield _project(rec, fields, self._load_record)
+
+    def _load_record(self, rec: Dict[str, Any]) -> Dict[str, Any]:
+        return json.loads(Path(rec["path"]).read_text(encoding="utf-8"))
 
     def get(self, name: str, version: Optional[str] = None) -> Dict[str, Any]:
-        """Return metadata for `name` (exact match). If `version` provided, return the specific version or raise KeyError."""
-        # if version provided, exact match; else first matching name
-        for e in self.list_entries():
-            if e.get("name") == name and (
-                version is None or e.get("version") == version
-            ):
-                return e
-        raise KeyError(f"Catalog entry '{name}' not found")
+        """Return metadata for `name` (exact match) at the highest version matching `version`.
+
+        `version` is an exact version or a range spec such as `^1.2`, `~=2.0`, `>=1,<2` or `latest` (the default;
+        see `bldrx.semver.matcher`). Only the index records of `name` are considered and only the chosen entry file
+        is read. Raises KeyError if the name is unknown or no version matches, ValueError for an invalid spec.
+        """
+        by_version = self._read_index().get(name, {})
+        chosen = self._resolve(name, list(by_version), version)
+        path = self.root / by_version[chosen]["file"]
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            raise KeyError(
+                f"Catalog entry '{name}' is indexed but {path} is missing; run `bldrx catalog reindex`"
+            )
+
+    @staticmethod
+    def _resolve(name: str, versions: List[str], spec: Optional[str]) -> str:
+        from .semver import resolve, sort_key
+
+        if not versions:
+            raise KeyError(f"Catalog entry '{name}' not found")
+        chosen = resolve(versions, spec)
+        if chosen is None:
+            raise KeyError(
+                f"No version of catalog entry '{name}' matches '{spec}' (available: {', '.join(sorted(versions, key=sort_key))})"
+            )
+        return chosen
 
     def remove(self, name: str, version: Optional[str] = None) -> List[Dict[str, Any]]:
         """Remove matching entries and return list of removed metadata objects."""
         removed: List[Dict[str, Any]] = []
-        for p in list(self.root.iterdir()):
-            if p.suffix != ".json":
-                continue
-            try:
-                e = json.loads(p.read_text(encoding="utf-8"))
-            except Exception:
-                continue
-            if e.get("name") == name and (
-                version is None or e.get("version") == version
-            ):
-                p.unlink()
-                removed.append(e)
+        from .semver import sort_key
+
+        with self.locks.registry(self.root):
+            names = self._locked_index()
+            by_version = names.get(name, {})
+            for v in sorted(by_version, key=sort_key):
+                if version is not None and v != version:
+                    continue
+                rec = by_version.pop(v)
+                p = self.root / rec["file"]
+                try:
+                    removed.append(json.loads(p.read_text(encoding="utf-8")))
+                    p.unlink()
+                except (OSError, ValueError):
+                    # drifted entry: drop it from the index regardless
+                    removed.append(self._public_record(rec))
+                    p.unlink(missing_ok=True)
+            if removed:
+                if not by_version:
+                    del names[name]
+                self._write_index(names)
         if not removed:
             raise KeyError(
                 f"Catalog entry '{name}'{' version '+version if version else ''} not found"
             )
         return removed
+
+
+REGISTRY_BACKENDS = ("json", "sqlite")
+SQLITE_NAME = "registry.db"
+_SQLITE_SCHEMA_VERSION = 1
+# seconds a writer waits for another writer's transaction before failing
+_SQLITE_BUSY_TIMEOUT = 30.0
+# bm25 column weights for ranked search: name, description, tags
+_FTS_WEIGHTS = (10.0, 1.0, 5.0)
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    version TEXT NOT NULL,
+    description TEXT NOT NULL DEFAULT '',
+    tags TEXT NOT NULL DEFAULT '[]',
+    published_at TEXT,
+    meta TEXT NOT NULL,
+    UNIQUE (name, version)
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
+    name, description, tags, content='entries', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS entries_ai AFTER INSERT ON entries BEGIN
+    INSERT INTO entries_fts(rowid, name, description, tags)
+    VALUES (new.id, new.name, new.description, new.tags);
+END;
+CREATE TRIGGER IF NOT EXISTS entries_ad AFTER DELETE ON entries BEGIN
+    INSERT INTO entries_fts(entries_fts, rowid, name, description, tags)
+    VALUES ('delete', old.id, old.name, old.description, old.tags);
+END;
+"""
+
+
+class SqliteRegistry(Registry):
+    """Registry stored in a single SQLite database (`<registry dir>/registry.db`).
+
+    The database runs in WAL mode, so readers never block the writer. `publish` and `remove` are single
+    `BEGIN IMMEDIATE` transactions, and concurrent writers wait up to `_SQLITE_BUSY_TIMEOUT` seconds for each other.
+    `get(name, version)` is an indexed lookup on (name, version). `search` matches word prefixes through an FTS5
+    index over name, description and tags and ranks the hits with bm25 (a name match ranks highest, then tags, then
+    description). An empty query lists every entry. Records returned by `list_entries`/`search` hold
+    `INDEX_FIELDS`; `get` returns the full metadata.
+    """
+
+    def __init__(self, root: Optional[Path] = None):
+        super().__init__(root)
+        self.db_path = self.root / SQLITE_NAME
+        conn = self._connect()
+        try:
+            if conn.execute("PRAGMA user_version").fetchone()[0] == 0:
+                conn.execute("PRAGMA journal_mode=WAL")
+                # executescript commits any open transaction, so the script carries its own
+                conn.executescript(
+                    f"BEGIN IMMEDIATE;{_SQLITE_SCHEMA}"
+                    f"PRAGMA user_version = {_SQLITE_SCHEMA_VERSION};COMMIT;"
+                )
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        # autocommit mode: transactions are opened explicitly with BEGIN IMMEDIATE
+        conn = sqlite3.connect(
+            str(self.db_path), timeout=_SQLITE_BUSY_TIMEOUT, isolation_level=None
+        )
+        conn.execute("PRAGMA synchronous=NORMAL")
+        # ORDER BY version COLLATE semver sorts like the JSON backend
+        conn.create_collation("semver", _semver_collation)
+        return conn
+
+    @staticmethod
+    @contextmanager
+    def _transaction(conn: sqlite3.Connection) -> Iterator[None]:
+        # take the write lock up front so two writers cannot both read, then fail to upgrade
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    @staticmethod
+    def _row_record(row: Tuple[Any, ...]) -> Dict[str, Any]:
+        name, version, description, tags, published_at = row
+        return {
+            "name": name,
+            "version": version,
+            "description": description,
+            "tags": json.loads(tags),
+            "published_at": published_at,
+        }
+
+    def _insert(self, conn: sqlite3.Connection, meta: Dict[str, Any]) -> None:
+        conn.execute(
+            "INSERT INTO entries (name, version, description, tags, published_at, meta)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                meta["name"],
+                meta["version"],
+                meta.get("description") or "",
+                json.dumps(meta.get("tags") or []),
+                meta.get("published_at"),
+                json.dumps(meta),
+            ),
+        )
+
+    def _store_entries(self, metas: List[Dict[str, Any]], force: bool) -> None:
+        conn = self._connect()
+        try:
+            with self._transaction(conn):
+                for meta in metas:
+                    row = conn.execute(
+                        "SELECT id FROM entries WHERE name = ? AND version = ?",
+                        (meta["name"], meta["version"]),
+                    ).fetchone()
+                    if row and not force:
+                        raise FileExistsError(
+                            f"Catalog entry already exists: {meta['name']} {meta['version']}"
+                        )
+                    if row:
+                        conn.execute("DELETE FROM entries WHERE id = ?", row)
+                    self._insert(conn, meta)
+        finally:
+            conn.close()
+
+    def _published_versions(self, names: Iterable[str]) -> Dict[str, List[str]]:
+        conn = self._connect()
+        try:
+            return {
+                n: [
+                    r[0]
+                    for r in conn.execute(
+                        "SELECT version FROM entries WHERE name = ?", (n,)
+                    )
+                ]
+                for n in names
+            }
+        finally:
+            conn.close()
+
+    def _load_version(self, name: str, version: str) -> Dict[str, Any]:
+        return self._load_record({"name": name, "version": version})
+
+    def import_entries(
+        self, entries: Iterable[Dict[str, Any]], force: bool = False
+    ) -> int:
+        """Insert already-built entry metadata in one transaction; returns how many were written.
+
+        Entries whose (name, version) already exists are skipped unless `force` is set.
+        """
+        written = 0
+        conn = self._connect()
+        try:
+            with self._transaction(conn):
+                for meta in entries:
+                    key = (meta["name"], meta["version"])
+                    exists = conn.execute(
+                        "SELECT 1 FROM entries WHERE name = ? AND version = ?", key
+                    ).fetchone()
+                    if exists and not force:
+                        continue
+                    if exists:
+                        conn.execute(
+                            "DELETE FROM entries WHERE name = ? AND version = ?", key
+                        )
+                    self._insert(conn, meta)
+                    written += 1
+        finally:
+            conn.close()
+        return written
+
+    def list_entries(self) -> List[Dict[str, Any]]:
+        """Return the record (`INDEX_FIELDS`) of every entry, by name and then semantic version."""
+        from .semver import sort_key
+
+        return sorted(
+            self.iter_search(None), key=lambda e: (e["name"], sort_key(e["version"]))
+        )
+
+    def versions(self, name: str) -> List[str]:
+        """Return the published versions of `name`, lowest first (semantic version order)."""
+        from .semver import sort_key
+
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT version FROM entries WHERE name = ?", (name,)
+            ).fetchall()
+        finally:
+            conn.close()
+        return sorted((r[0] for r in rows), key=sort_key)
+
+    def iter_search(
+        self,
+        q: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Lazily yield the records of entries whose name, description or tags contain words starting with each word
+        of `q`, best bm25 match first (all entries, by name and semantic version, for an empty query).
+
+        `limit`/`offset` are applied by SQLite, and rows are fetched as they are consumed. `fields` projects each
+        record as in `Registry.iter_search`; keys outside `INDEX_FIELDS` are read from the stored metadata.
+        """
+        import re
+
+        _check_page(limit, offset)
+        terms = re.findall(r"\w+", q or "")
+        page = (-1 if limit is None else limit, offset)
+        conn = self._connect()
+        try:
+            if not terms:
+                cursor = conn.execute(
+                    "SELECT name, version, description, tags, published_at FROM entries"
+                    " ORDER BY name, version COLLATE semver LIMIT ? OFFSET ?",
+                    page,
+                )
+            else:
+                match = " ".join(f'"{t}"*' for t in terms)
+                cursor = conn.execute(
+                    "SELECT e.name, e.version, e.description, e.tags, e.published_at"
+                    " FROM entries_fts JOIN entries e ON e.id = entries_fts.rowid"
+                    " WHERE entries_fts MATCH ?"
+                    " ORDER BY bm25(entries_fts, ?, ?, ?), e.name, e.version COLLATE semver"
+                    " LIMIT ? OFFSET ?",
+                    (match, *_FTS_WEIGHTS, *page),
+                )
+            for row in cursor:
+                yield _project(self._row_record(row), fields, self._load_record)
+        finally:
+            conn.close()
+
+    def _load_record(self, rec: Dict[str, Any]) -> Dict[str, Any]:
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT meta FROM entries WHERE name = ? AND version = ?",
+                (rec["name"], rec["version"]),
+            ).fetchone()
+        finally:
+            conn.close()
+        return json.loads(row[0]) if row else {}
+
+    def get(self, name: str, version: Optional[str] = None) -> Dict[str, Any]:
+        """Return metadata for `name` at the highest version matching `version` (see `Registry.get`).
+
+        The versions of `name` are read from the (name, version) index and only the chosen row's metadata is loaded.
+        """
+        conn = self._connect()
+        try:
+            versions = [
+                r[0]
+                for r in conn.execute(
+                    "SELECT version FROM entries WHERE name = ?", (name,)
+                )
+            ]
+            chosen = self._resolve(name, versions, version)
+            row = conn.execute(
+                "SELECT meta FROM entries WHERE name = ? AND version = ?",
+                (name, chosen),
+            ).fetchone()
+        finally:
+            conn.close()
+        return json.loads(row[0])
+
+    def remove(self, name: str, version: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Remove matching entries and return list of removed metadata objects."""
+        where, params = "name = ?", [name]
+        if version is not None:
+            where, params = "name = ? AND version = ?", [name, version]
+        conn = self._connect()
+        try:
+            with self._transaction(conn):
+                rows = conn.execute(
+                    f"SELECT meta FROM entries WHERE {where}", params
+                ).fetchall()
+                conn.execute(f"DELETE FROM entries WHERE {where}", params)
+        finally:
+            conn.close()
+        if not rows:
+            raise KeyError(
+                f"Catalog entry '{name}'{' version '+version if version else ''} not found"
+            )
+        from .semver import sort_key
+
+        removed = [json.loads(r[0]) for r in rows]
+        return sorted(removed, key=lambda e: sort_key(e["version"]))
+
+    def rebuild_index(self) -> int:
+        """Rebuild the full-text index from the entries table; returns the number of entries indexed."""
+        conn = self._connect()
+        try:
+            with self._transaction(conn):
+                conn.execute("INSERT INTO entries_fts(entries_fts) VALUES ('rebuild')")
+                return conn.execute("SELECT count(*) FROM entries").fetchone()[0]
+        finally:
+            conn.close()
+
+
+def open_registry(
+    root: Optional[Path] = None, backend: Optional[str] = None
+) -> Registry:
+    """Return the registry for `root` (see `Registry`) with the requested backend.
+
+    `backend` is `json` or `sqlite`; it defaults to `BLDRX_REGISTRY_BACKEND`, else `sqlite` if the registry
+    directory already holds a `registry.db` (e.g. after `migrate_to_sqlite`), else `json`.
+    """
+    path = _registry_root(root)
+    backend = (
+        backend
+        or os.getenv("BLDRX_REGISTRY_BACKEND")
+        or ("sqlite" if (path / SQLITE_NAME).exists() else "json")
+    )
+    if backend not in REGISTRY_BACKENDS:
+        raise ValueError(
+            f"Unknown registry backend '{backend}'; expected one of {', '.join(REGISTRY_BACKENDS)}"
+        )
+    return SqliteRegistry(path) if backend == "sqlite" else Registry(path)
+
+
+def migrate_to_sqlite(
+    root: Optional[Path] = None, force: bool = False
+) -> Dict[str, Any]:
+    """Copy every JSON entry file of the registry at `root` into its SQLite database in one transaction.
+
+    The JSON files are left in place. Entries already in the database are kept unless `force` is set; unreadable
+    entry files are skipped. Returns {'database', 'found', 'migrated', 'skipped'}.
+    """
+    source = Registry(root)
+    entries: List[Dict[str, Any]] = []
+    for p in source._entry_files():
+        try:
+            meta = json.loads(p.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        if meta.get("name") and meta.get("version"):
+            entries.append(meta)
+    target = SqliteRegistry(source.root)
+    migrated = target.import_entries(entries, force=force)
+    return {
+        "database": str(target.db_path),
+        "found": len(entries),
+        "migrated": migrated,
+        "skipped": len(entries) - migrated,
+    }
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import re
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# (major, minor, patch, is_release, prerelease identifiers); a release sorts after its prereleases
+VersionKey = Tuple[int, int, int, int, Tuple[Tuple[int, object], ...]]
+
+LATEST = "latest"
+
+_VERSION_RE = re.compile(
+    r"^v?(\d+)(?:\.(\d+))?(?:\.(\d+))?(?:-([0-9A-Za-z.-]+))?(?:\+[0-9A-Za-z.-]+)?$"
+)
+# partial versions and wildcards: 1, 1.x, 1.2, 1.2.*
+_PARTIAL_RE = re.compile(r"^v?(\d+)(?:\.(\d+|[x*]))?(?:\.[x*])?$")
+_COMPARATOR_RE = re.compile(r"^(>=|<=|==|!=|>|<|=)?(.+)$")
+
+
+def _parse(version: str) -> Optional[Tuple[List[Optional[int]], Optional[str]]]:
+    m = _VERSION_RE.match(version.strip())
+    if not m:
+        return None
+    return [int(p) if p is not None else None for p in m.group(1, 2, 3)], m.group(4)
+
+
+def parse_version(version: str) -> Optional[VersionKey]:
+    """Return a sort key for a semantic version (`1.2.3`, `v1.2`, `2.0.0-rc.1+build`), or None if it is not one.
+
+    Missing minor/patch numbers count as 0 and build metadata is ignored.
+    """
+    parsed = _parse(version)
+    if parsed is None:
+        return None
+    parts, pre = parsed
+    major, minor, patch = (p or 0 for p in parts)
+    if not pre:
+        return (major, minor, patch, 1, ())
+    # numeric identifiers sort numerically and before alphanumeric ones
+    ids = tuple((0, int(p)) if p.isdigit() else (1, p) for p in pre.split("."))
+    return (major, minor, patch, 0, ids)
+
+
+def _floor(nums: List[int]) -> VersionKey:
+    """Lowest version (including prereleases) starting with `nums`."""
+    major, minor, patch = (nums + [0, 0, 0])[:3]
+    return (major, minor, patch, 0, ())
+
+
+def _bump(nums: List[int]) -> VersionKey:
+    """Lowest version above every version starting with `nums`."""
+    return _floor(nums[:-1] + [nums[-1] + 1])
+
+
+def _range(low: VersionKey, high: VersionKey) -> Callable[[VersionKey], bool]:
+    return lambda v: low <= v < high
+
+
+def _clause(clause: str) -> Tuple[Callable[[VersionKey], bool], bool]:
+    """Return (predicate, names a prerelease) for one clause of a version spec."""
+    if clause in ("*", "x", LATEST):
+        return (lambda v: True), False
+    m = _PARTIAL_RE.match(clause)
+    if m:
+        nums = [int(p) for p in m.group(1, 2) if p and p.isdigit()]
+        return _range(_floor(nums), _bump(nums)), False
+    for op in ("~=", "^", "~"):
+        if not clause.startswith(op):
+            continue
+        parsed = _parse(clause[len(op) :])
+        low = parse_version(clause[len(op) :])
+        if parsed is None or low is None:
+            break
+        parts, pre = parsed
+        given = [p for p in parts if p is not None]
+        if op == "~=":
+            # PEP 440: the last given number may grow
+            if len(given) < 2:
+                break
+            keep = given[:-1]
+        elif op == "~":
+            # ~1.2.3 and ~1.2 allow patch updates, ~1 minor updates
+            keep = given[:2]
+        else:
+            # ^ allows changes right of the first non-zero number
+            first = next((i for i, p in enumerate(given) if p != 0), len(given) - 1)
+            keep = given[: first + 1]
+        return _range(low, _bump(keep)), bool(pre)
+    m = _COMPARATOR_RE.match(clause)
+    key = parse_version(m.group(2)) if m else None
+    if m is None or key is None:
+        raise ValueError(f"Invalid version spec '{clause}'")
+    op = m.group(1) or "=="
+    target: VersionKey = key
+    checks: Dict[str, Callable[[VersionKey], bool]] = {
+        ">=": lambda v: v >= target,
+        "<=": lambda v: v <= target,
+        ">": lambda v: v > target,
+        "<": lambda v: v < target,
+        "==": lambda v: v == target,
+        "=": lambda v: v == target,
+        "!=": lambda v: v != target,
+    }
+    return checks[op], target[3] == 0
+
+
+def matcher(spec: Optional[str]) -> Callable[[str], bool]:
+    """Return a predicate telling whether a version string satisfies `spec`.
+
+    Supported specs (clauses separated by commas or spaces must all hold):
+    - `latest`, `*` or None: any release
+    - exact versions (`1.2.3`, `==1.2.3`) and comparators (`>=1.2`, `<2`, `!=1.4.0`)
+    - `^1.2.3`: compatible changes (`>=1.2.3 <2.0.0`; `^0.2.1` is `>=0.2.1 <0.3.0`)
+    - `~1.2.3`: patch updates (`>=1.2.3 <1.3.0`); `~1` allows minor updates
+    - `~=2.0` (PEP 440): `>=2.0 <3.0`; `~=2.0.1` is `>=2.0.1 <2.1.0`
+    - partial versions and wildcards: `1`, `1.x`, `1.2`, `1.2.*`
+
+    Prereleases only satisfy a spec that names a prerelease itself. A version that is not a semantic version only
+    matches a spec equal to it.
+
+    Raises:
+        ValueError: if the spec cannot be parsed.
+    """
+    spec = (spec or LATEST).strip()
+    # allow spaces after operators (">= 1.2, < 2")
+    compact = re.sub(r"(>=|<=|==|!=|~=|[<>=^~])\s+", r"\1", spec)
+    try:
+        checks = [_clause(c) for c in re.split(r"[,\s]+", compact) if c]
+    except ValueError:
+        if re.fullmatch(r"[\w.+-]+", spec):
+            # a plain, non-semantic version label
+            return lambda version: version == spec
+        raise
+    allow_pre = any(pre for _check, pre in checks)
+
+    def _match(version: str) -> bool:
+        if version == spec:
+            return True
+        key = parse_version(version)
+        if key is None or (key[3] == 0 and not allow_pre):
+            return False
+        return all(check(key) for check, _pre in checks)
+
+    return _match
+
+
+def sort_key(version: str) -> Tuple[int, object]:
+    """Sort key putting semantic versions in semver order, after any non-semantic versions (in string order)."""
+    key = parse_version(version)
+    return (1, key) if key is not None else (0, version)
+
+
+def resolve(versions: Iterable[str], spec: Optional[str] = None) -> Optional[str]:
+    """Return the highest version in `versions` that satisfies `spec` (see `matcher`), or None.
+
+    With no spec (or `latest`) the highest release wins; if there are only prereleases or non-semantic versions,
+    the highest of those is returned instead.
+    """
+    versions = list(versions)
+    ok = matcher(spec)
+    matching = [v for v in versions if ok(v)]
+    if not matching and (spec or LATEST).strip() == LATEST:
+        matching = versions
+    return max(matching, key=sort_key) if matching else None
+
+
+def split_spec(value: str) -> Tuple[str, Optional[str]]:
+    """Split `name@spec` into (name, spec); a leading `@` (scoped names) is part of the name."""
+    name, sep, spec = value.rpartition("@")
+    if not sep or not name:
+        return value, None
+    return name, spec or None
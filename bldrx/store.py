@@ -0,0 +1,284 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from .hashing import hash_file
+
+
+class BlobStore:
+    """Content-addressed file store: each distinct file body is kept once under `<root>/<aa>/<sha256>`.
+
+    Blobs are added by hardlink when the caller knows the source will only ever be replaced by rename (so the
+    linked inode keeps the old content), and by copy otherwise or when linking is not possible (e.g. across
+    filesystems).
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def path_for(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest
+
+    def has(self, digest: str) -> bool:
+        return self.path_for(digest).exists()
+
+    def put_file(
+        self, path: Path, link: bool = False, digest: Optional[str] = None
+    ) -> str:
+        """Add `path` to the store and return its sha256 digest (no-op if the content is already stored)."""
+        digest = digest or hash_file(path)
+        blob = self.path_for(digest)
+        if blob.exists():
+            return digest
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        tmp = blob.with_name(f"{digest}.tmp.{os.getpid()}")
+        try:
+            if link:
+                try:
+                    os.link(str(path), str(tmp))
+                except OSError:
+                    shutil.copy2(path, tmp)
+            else:
+                shutil.copy2(path, tmp)
+            os.replace(str(tmp), str(blob))
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+        return digest
+
+    def materialize(self, digest: str, target: Path, link: bool = True) -> None:
+        """Place the blob `digest` at `target` (hardlink when `link` and possible, else copy), replacing atomically.
+
+        A linked file shares its inode with the blob: callers that later edit it in place also change the blob,
+        so prefer `link=False` for files users are expected to edit directly.
+        """
+        blob = self.path_for(digest)
+        if not blob.exists():
+            raise FileNotFoundError(f"Blob {digest} not found in {self.root}")
+        target = Path(target)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.parent / f".{target.name}.bldrx.tmp.{os.getpid()}"
+        try:
+            if link:
+                try:
+                    os.link(str(blob), str(tmp))
+                except OSError:
+                    shutil.copy2(blob, tmp)
+            else:
+                shutil.copy2(blob, tmp)
+            os.replace(str(tmp), str(target))
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+
+    def remove(self, digest: str) -> int:
+        """Delete a blob and return the number of bytes freed (0 if it was not stored)."""
+        blob = self.path_for(digest)
+        try:
+            size = blob.stat().st_size
+            blob.unlink()
+        except FileNotFoundError:
+            return 0
+        return size
+
+    def size_of(self, digest: str) -> int:
+        try:
+            return self.path_for(digest).stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def digests(self) -> Iterator[str]:
+        """Yield the digest of every stored blob."""
+        if not self.root.exists():
+            return
+        for sub in self.root.iterdir():
+            if not sub.is_dir() or len(sub.name) != 2:
+                continue
+            for blob in sub.iterdir():
+                if ".tmp." not in blob.name:
+                    yield blob.name
+
+
+class TemplateStore:
+    """Shared content-addressed store for installed user templates (`~/.bldrx/store/` by default).
+
+    Linked installs hardlink every template file to a blob under `<root>/blobs/`, so identical files (LICENSE,
+    CI workflows, lint configs) are stored once across all templates and a reinstall only writes the files whose
+    content changed. Blob keys are the sha256 digest, suffixed with `x` for executable files since linked files
+    share their permission bits.
+
+    Each linked install is recorded in `<root>/refs/<hash of install dir>.json` ({'path', 'files': {rel: key}})
+    and `<root>/refcounts.json` keeps how many installs reference each blob; a blob is deleted as soon as its
+    count drops to zero. `gc()` rebuilds the counts from the refs (dropping refs whose install dir is gone) and
+    removes any unreferenced blob. Every mutation runs under `<root>/.store.lock`.
+
+    Linked files share an inode with the blob: edit them by replacing the file (as most editors and bldrx itself
+    do), not in place, or reinstall the template without linking first.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.blobs = BlobStore(self.root / "blobs")
+        self.refs_dir = self.root / "refs"
+        self.counts_path = self.root / "refcounts.json"
+
+    def lock(self):
+        from .locks import file_lock
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        return file_lock(self.root / ".store.lock")
+
+    @staticmethod
+    def key_for(digest: str, mode: int) -> str:
+        return digest + ("x" if mode & 0o111 else "")
+
+    def _ref_path(self, install_dir: Path) -> Path:
+        import hashlib
+
+        key = hashlib.sha256(str(Path(install_dir).resolve()).encode("utf-8"))
+        return self.refs_dir / f"{key.hexdigest()[:32]}.json"
+
+    def _read_json(self, path: Path) -> Dict[str, Any]:
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def _write_json(self, path: Path, data: Dict[str, Any]) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(data, sort_keys=True), encoding="utf-8")
+        os.replace(str(tmp), str(path))
+
+    def link_tree(self, src: Path, target: Path) -> Dict[str, str]:
+        """Materialize the files of `src` under `target` as hardlinks into the store; return {rel: blob key}.
+
+        Only files whose content is not stored yet are copied (once, into the store). Call with `lock()` held
+        and `record()` the result once the tree is in its final place, or `discard()` it if the install fails.
+        """
+        from .hashing import hash_files
+
+        src, target = Path(src), Path(target)
+        target.mkdir(parents=True, exist_ok=True)
+        paths = sorted(src.rglob("*"))
+        files = [p for p in paths if p.is_file()]
+        for d in paths:
+            if d.is_dir():
+                (target / d.relative_to(src)).mkdir(parents=True, exist_ok=True)
+        out: Dict[str, str] = {}
+        for p, digest in zip(files, hash_files(files)):
+            rel = str(p.relative_to(src)).replace("\\", "/")
+            key = self.key_for(digest, p.stat().st_mode)
+            if not self.blobs.has(key):
+                self.blobs.put_file(p, digest=key)
+            self.blobs.materialize(key, target / rel, link=True)
+            out[rel] = key
+        return out
+
+    def adopt_tree(
+        self, root: Path, digests: Optional[Dict[str, str]] = None
+    ) -> Dict[str, str]:
+        """Swap files already written under `root` for links to stored blobs (new contents are linked into the
+        store rather than copied); return {rel: blob key}. `digests` may supply known sha256 digests by rel.
+        """
+        from .hashing import hash_files
+
+        root = Path(root)
+        digests = dict(digests or {})
+        files = [p for p in sorted(root.rglob("*")) if p.is_file()]
+        rels = [str(p.relative_to(root)).replace("\\", "/") for p in files]
+        todo = [i for i, rel in enumerate(rels) if rel not in digests]
+        for i, d in zip(todo, hash_files([files[i] for i in todo])):
+            digests[rels[i]] = d
+        out: Dict[str, str] = {}
+        for p, rel in zip(files, rels):
+            key = self.key_for(digests[rel], p.stat().st_mode)
+            if self.blobs.has(key):
+                self.blobs.materialize(key, p, link=True)
+            else:
+                self.blobs.put_file(p, link=True, digest=key)
+            out[rel] = key
+        return out
+
+    def _bump(self, counts: Dict[str, int], keys: Iterable[str], delta: int) -> None:
+        for key in keys:
+            n = counts.get(key, 0) + delta
+            if n > 0:
+                counts[key] = n
+            else:
+                counts.pop(key, None)
+                self.blobs.remove(key)
+
+    def record(self, install_dir: Path, files: Dict[str, str]) -> None:
+        """Register the linked install at `install_dir` (replacing any previous record for it)."""
+        ref = self._ref_path(install_dir)
+        counts = self._read_json(self.counts_path)
+        old = self._read_json(ref).get("files", {})
+        self._bump(counts, files.values(), +1)
+        self._bump(counts, old.values(), -1)
+        self._write_json(
+            ref, {"path": str(Path(install_dir).resolve()), "files": files}
+        )
+        self._write_json(self.counts_path, counts)
+
+    def release(self, install_dir: Path) -> bool:
+        """Forget the linked install at `install_dir` and delete blobs no longer referenced; False if unknown."""
+        ref = self._ref_path(install_dir)
+        if not ref.exists():
+            return False
+        counts = self._read_json(self.counts_path)
+        self._bump(counts, self._read_json(ref).get("files", {}).values(), -1)
+        ref.unlink()
+        self._write_json(self.counts_path, counts)
+        return True
+
+    def discard(self, keys: Iterable[str]) -> int:
+        """Delete the blobs among `keys` that no recorded install references (undoes a `link_tree`/`adopt_tree`
+        whose install failed before `record()`); return the number of bytes freed. Call with `lock()` held.
+        """
+        counts = self._read_json(self.counts_path)
+        return sum(self.blobs.remove(k) for k in set(keys) if k not in counts)
+
+    def gc(self) -> Dict[str, int]:
+        """Rebuild reference counts from the install records and delete unreferenced blobs.
+
+        Returns {'removed_refs': n, 'removed_blobs': n, 'freed_bytes': n}.
+        """
+        counts: Dict[str, int] = {}
+        removed_refs = 0
+        if self.refs_dir.exists():
+            for ref in self.refs_dir.glob("*.json"):
+                data = self._read_json(ref)
+                if not data or not Path(data.get("path", "")).exists():
+                    ref.unlink()
+                    removed_refs += 1
+                    continue
+                for key in data.get("files", {}).values():
+                    counts[key] = counts.get(key, 0) + 1
+        removed_blobs = freed = 0
+        for key in list(self.blobs.digests()):
+            if key not in counts:
+                freed += self.blobs.remove(key)
+                removed_blobs += 1
+        self._write_json(self.counts_path, counts)
+        return {
+            "removed_refs": removed_refs,
+            "removed_blobs": removed_blobs,
+            "freed_bytes": freed,
+        }
+
+    def stats(self) -> Dict[str, int]:
+        """Return {'installs', 'blobs', 'bytes'} for the store."""
+        keys = list(self.blobs.digests())
+        installs = (
+            len(list(self.refs_dir.glob("*.json"))) if self.refs_dir.exists() else 0
+        )
+        return {
+            "installs": installs,
+            "blobs": len(keys),
+            "bytes": sum(self.blobs.size_of(k) for k in keys),
+        }
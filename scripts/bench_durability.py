@@ -0,0 +1,111 @@
+"""Benchmark apply throughput for each durability level (none, batch, strict).
+
+Usage:
+    python scripts/bench_durability.py [--files N] [--repeat R] [DIR ...]
+
+Each DIR is used as the scratch location for one run of the benchmark, so pass one directory per filesystem you
+want to compare (e.g. `/dev/shm` for tmpfs and a directory on an ext4 disk). Without arguments `/dev/shm` (when
+present) and the system temp directory are used. Results are printed as a table of files/second per level.
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Ensure workspace root is importable when running this script directly
+root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root))
+from bldrx.engine import DURABILITY_LEVELS, Engine  # noqa: E402
+
+
+def _fs_type(path: Path) -> str:
+    """Best-effort filesystem type lookup from /proc/mounts (Linux only)."""
+    try:
+        mounts = Path("/proc/mounts").read_text().splitlines()
+    except OSError:
+        return "unknown"
+    best, fstype = "", "unknown"
+    resolved = str(path.resolve())
+    for line in mounts:
+        parts = line.split()
+        if len(parts) < 3:
+            continue
+        mnt = parts[1]
+        if resolved == mnt or resolved.startswith(mnt.rstrip("/") + "/"):
+            if len(mnt) > len(best):
+                best, fstype = mnt, parts[2]
+    return fstype
+
+
+def _make_template(base: Path, files: int) -> Path:
+    templates = base / "templates"
+    t = templates / "bench"
+    for i in range(files):
+        d = t / f"dir{i % 16}"
+        d.mkdir(parents=True, exist_ok=True)
+        (d / f"file{i}.txt.j2").write_text("{{ project_name }} file %d\n" % i)
+    return templates
+
+
+def run(scratch: Path, files: int, repeat: int) -> dict:
+    base = Path(tempfile.mkdtemp(prefix="bldrx-bench-", dir=str(scratch)))
+    try:
+        templates = _make_template(base, files)
+        engine = Engine(templates_root=templates, user_templates_root=base / "user")
+        out = {}
+        for level in DURABILITY_LEVELS:
+            best = None
+            for r in range(repeat):
+                dest = base / f"dest-{level}-{r}"
+                start = time.perf_counter()
+                for _ in engine.apply_template(
+                    "bench",
+                    dest,
+                    {"project_name": "bench"},
+                    atomic=True,
+                    durability=level,
+                ):
+                    pass
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+                shutil.rmtree(dest, ignore_errors=True)
+            out[level] = files / best if best else float("inf")
+        return out
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("dirs", nargs="*", help="scratch directories to benchmark")
+    parser.add_argument("--files", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    dirs = [Path(d) for d in args.dirs]
+    if not dirs:
+        if Path("/dev/shm").is_dir():
+            dirs.append(Path("/dev/shm"))
+        dirs.append(Path(tempfile.gettempdir()))
+    header = f"{'directory':<30} {'fs':<8}" + "".join(
+        f" {lvl + ' files/s':>16}" for lvl in DURABILITY_LEVELS
+    )
+    print(header)
+    for d in dirs:
+        if not d.is_dir():
+            print(f"{str(d):<30} (missing, skipped)")
+            continue
+        res = run(d, args.files, args.repeat)
+        row = f"{str(d):<30} {_fs_type(d):<8}" + "".join(
+            f" {res[lvl]:>16.0f}" for lvl in DURABILITY_LEVELS
+        )
+        print(row)
+    if os.name == "nt":
+        print("note: directory fsync is not available on Windows and is skipped")
+
+
+if __name__ == "__main__":
+    main()
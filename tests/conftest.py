@@ -1,7 +1,16 @@
 import sys
 from pathlib import Path
 
+import pytest
+
 # Ensure the repository root is first on sys.path so tests import the local package
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
+
+
+@pytest.fixture(autouse=True)
+def _isolated_bldrx_state(tmp_path, monkeypatch):
+    """Keep lock files and caches written by tests out of the developer's real home directory."""
+    monkeypatch.setenv("BLDRX_LOCKS_DIR", str(tmp_path / "bldrx-locks"))
+    monkeypatch.setenv("BLDRX_CACHE_DIR", str(tmp_path / "bldrx-cache"))
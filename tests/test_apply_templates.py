@@ -0,0 +1,194 @@
+import os
+import subprocess
+
+import pytest
+
+from bldrx.engine import Engine
+
+
+def _engine(tmp_path):
+    root = tmp_path / "templates"
+    a = root / "a"
+    b = root / "b"
+    (a / "src").mkdir(parents=True)
+    b.mkdir(parents=True)
+    (a / "README.md.j2").write_text("A {{ project_name }}")
+    (a / "src" / "main.py").write_text("print('a')\n")
+    (b / "README.md").write_text("B")
+    (b / "LICENSE.j2").write_text("L {{ project_name }}")
+    return Engine(templates_root=root, user_templates_root=tmp_path / "user")
+
+
+def test_collisions_are_detected_before_anything_is_written(tmp_path):
+    engine = _engine(tmp_path)
+    dest = tmp_path / "out"
+    with pytest.raises(RuntimeError, match=r"README.md \(a, b\)"):
+        list(engine.apply_templates(["a", "b"], dest, {"project_name": "X"}))
+    assert not (dest / "LICENSE").exists()
+    assert not (dest / "src" / "main.py").exists()
+
+
+@pytest.mark.parametrize("policy,expected", [("first", "A X"), ("last", "B")])
+def test_conflict_policy_picks_one_owner(tmp_path, policy, expected):
+    engine = _engine(tmp_path)
+    dest = tmp_path / "out"
+    res = list(
+        engine.apply_templates(
+            ["a", "b"], dest, {"project_name": "X"}, on_conflict=policy, staged=True
+        )
+    )
+    assert (dest / "README.md").read_text() == expected
+    assert (dest / "LICENSE").read_text() == "L X"
+    assert (str(dest / "README.md"), "skipped-conflict") in res
+
+
+def test_single_rollback_scope_across_templates(tmp_path, monkeypatch):
+    engine = _engine(tmp_path)
+    dest = tmp_path / "out"
+    dest.mkdir()
+    (dest / "README.md").write_text("OLD")
+    orig_replace = os.replace
+
+    def fake_replace(src, dst):
+        if str(dst).endswith("LICENSE"):
+            raise OSError("simulated failure")
+        return orig_replace(src, dst)
+
+    monkeypatch.setattr("os.replace", fake_replace)
+    with pytest.raises(RuntimeError):
+        list(
+            engine.apply_templates(
+                ["a", "b"],
+                dest,
+                {"project_name": "X"},
+                on_conflict="first",
+                force=True,
+                journal=True,
+            )
+        )
+    # template a's files were rolled back together with template b's failure
+    assert (dest / "README.md").read_text() == "OLD"
+    assert not (dest / "src" / "main.py").exists()
+
+
+def test_one_git_commit_for_all_templates(tmp_path):
+    engine = _engine(tmp_path)
+    dest = tmp_path / "out"
+    dest.mkdir()
+    for args in (
+        ["init", "-q"],
+        ["config", "user.email", "t@example.com"],
+        ["config", "user.name", "T"],
+        ["config", "commit.gpgsign", "false"],
+    ):
+        subprocess.run(["git", *args], cwd=dest, check=True)
+    list(
+        engine.apply_templates(
+            ["a", "b"],
+            dest,
+            {"project_name": "X"},
+            on_conflict="last",
+            git_commit=True,
+        )
+    )
+    log = subprocess.run(
+        ["git", "log", "--pretty=%s"],
+        cwd=dest,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.splitlines()
+    assert log == ["bldrx: apply templates a, b"]
+
+
+def test_cli_new_applies_templates_as_one_plan(tmp_path):
+    from click.testing import CliRunner
+
+    from bldrx.cli import cli
+
+    runner = CliRunner()
+    dest = tmp_path / "proj"
+    res = runner.invoke(
+        cli,
+        [
+            "new",
+            str(dest),
+            "--templates",
+            "python-cli,licenses/MIT",
+            "--meta",
+            "author_name=VoxDroid",
+            "--on-conflict",
+            "error",
+        ],
+    )
+    assert res.exit_code == 1
+    assert "LICENSE (python-cli, licenses/MIT)" in res.output
+    assert not dest.exists() or not any(dest.iterdir())
+
+
+def _mergeable(tmp_path):
+    root = tmp_path / "templates"
+    for name in ("a", "b"):
+        (root / name).mkdir(parents=True)
+        (root / name / "NOTES.md.j2").write_text(f"{name} {{{{ project_name }}}}\n")
+    return root
+
+
+@pytest.mark.parametrize(
+    "mode", [{"atomic": True}, {"staged": True}, {"staged": True, "stream": True}]
+)
+def test_merge_policy_merges_every_template(tmp_path, mode):
+    root = _mergeable(tmp_path)
+    engine = Engine(templates_root=root, user_templates_root=tmp_path / "user")
+    dest = tmp_path / "out"
+    dest.mkdir()
+    (dest / "NOTES.md").write_text("existing\n")
+    res = list(
+        engine.apply_templates(
+            ["a", "b"],
+            dest,
+            {"project_name": "X"},
+            on_conflict="merge",
+            merge="append",
+            backup=True,
+            **mode,
+        )
+    )
+    assert (dest / "NOTES.md").read_text() == "existing\na X\nb X"
+    assert "skipped-conflict" not in [status for _, status in res]
+    # the backup keeps the file as it was before the apply
+    from bldrx.backups import BackupStore
+
+    store = BackupStore(dest)
+    store.restore(store.list_runs()[0]["id"])
+    assert (dest / "NOTES.md").read_text() == "existing\n"
+    with pytest.raises(ValueError, match="merge strategy"):
+        list(engine.apply_templates(["a", "b"], dest, on_conflict="merge"))
+
+
+def test_cli_merge_strategy_merges_overlapping_paths(tmp_path):
+    from click.testing import CliRunner
+
+    from bldrx.cli import cli
+
+    root = _mergeable(tmp_path)
+    dest = tmp_path / "proj"
+    dest.mkdir()
+    (dest / "NOTES.md").write_text("existing\n")
+    res = CliRunner().invoke(
+        cli,
+        [
+            "add-templates",
+            str(dest),
+            "--templates",
+            "a,b",
+            "--templates-dir",
+            str(root),
+            "--merge",
+            "append",
+            "--meta",
+            "project_name=X",
+        ],
+    )
+    assert res.exit_code == 0, res.output
+    assert (dest / "NOTES.md").read_text() == "existing\na X\nb X"
@@ -0,0 +1,123 @@
+import contextlib
+import http.server
+import io
+import tarfile
+import threading
+import zipfile
+
+import pytest
+
+from bldrx.engine import Engine
+from bldrx.install import sniff_archive
+
+
+def _tar_bytes(mode, members=(("pkg/a.txt", b"A"), ("pkg/sub/b.txt", b"B"))):
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode=mode) as tf:
+        for name, data in members:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tf.addfile(info, io.BytesIO(data))
+    return buf.getvalue()
+
+
+def _zip_bytes():
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as zf:
+        zf.writestr("pkg/a.txt", "A")
+        zf.writestr("pkg/sub/b.txt", "B")
+    return buf.getvalue()
+
+
+def _engine(tmp_path):
+    return Engine(
+        templates_root=tmp_path / "templates", user_templates_root=tmp_path / "u"
+    )
+
+
+@pytest.mark.parametrize(
+    "fmt,data",
+    [
+        ("tar", lambda: _tar_bytes("w")),
+        ("tar.gz", lambda: _tar_bytes("w:gz")),
+        ("tar.bz2", lambda: _tar_bytes("w:bz2")),
+        ("tar.xz", lambda: _tar_bytes("w:xz")),
+        ("zip", _zip_bytes),
+    ],
+)
+def test_formats_are_detected_by_content_not_name(tmp_path, fmt, data):
+    body = data()
+    assert sniff_archive(body[:512]) == fmt
+    # deliberately misleading / missing suffix
+    path = tmp_path / "download.bin"
+    path.write_bytes(body)
+    installed = _engine(tmp_path).fetch_remote_template(str(path), name="t")
+    assert (installed / "sub" / "b.txt").read_bytes() == b"B"
+
+
+def test_unknown_format_is_rejected(tmp_path):
+    path = tmp_path / "notes.tar.gz"
+    path.write_text("not an archive")
+    with pytest.raises(ValueError, match="Unsupported archive format"):
+        _engine(tmp_path).fetch_remote_template(str(path))
+    assert not [p for p in (tmp_path / "u").iterdir() if p.is_dir()]
+
+
+def test_traversal_in_xz_stream_is_rejected(tmp_path):
+    path = tmp_path / "evil.tar.xz"
+    path.write_bytes(_tar_bytes("w:xz", [("pkg/ok.txt", b"1"), ("../evil", b"x")]))
+    with pytest.raises(RuntimeError, match="path traversal"):
+        _engine(tmp_path).fetch_remote_template(str(path))
+    assert not (tmp_path / "evil").exists()
+
+
+def _write_tar(tmp_path):
+    path = tmp_path / "kept.tar"
+    path.write_bytes(_tar_bytes("w"))
+    return path
+
+
+@contextlib.contextmanager
+def _serve(body):
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def log_message(self, *a):
+            pass
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True).start()
+    try:
+        yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+def test_uncached_http_streams_without_archive_file(tmp_path, monkeypatch):
+    monkeypatch.setenv("BLDRX_CACHE_DIR", str(tmp_path / "cache"))
+    with _serve(_tar_bytes("w:bz2")) as base:
+        installed = _engine(tmp_path).fetch_remote_template(
+            f"{base}/download", http_cache=False
+        )
+    assert installed.name == "pkg"
+    assert (installed / "a.txt").read_bytes() == b"A"
+    assert not (tmp_path / "cache").exists()
+
+
+def test_flat_archive_without_a_usable_name_is_rejected(tmp_path):
+    engine = _engine(tmp_path)
+    kept = engine.fetch_remote_template(str(_write_tar(tmp_path)), name="kept")
+    flat = _tar_bytes("w:gz", [("a.txt", b"A")])
+    with _serve(flat) as base:
+        for url in (f"{base}/", base):
+            with pytest.raises(ValueError, match="Invalid template name"):
+                engine.fetch_remote_template(url, http_cache=False)
+        with pytest.raises(ValueError, match="Invalid template name"):
+            engine.fetch_remote_template(f"{base}/t.tgz", name="..", http_cache=False)
+    # the user templates root (and what is installed in it) is untouched
+    assert (kept / "a.txt").read_bytes() == b"A"
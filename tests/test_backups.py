@@ -0,0 +1,129 @@
+import os
+
+import pytest
+from click.testing import CliRunner
+
+from bldrx.backups import BackupStore
+from bldrx.cli import cli
+from bldrx.engine import Engine
+from bldrx.hashing import hash_file
+
+
+def _setup(tmp_path, files=3):
+    templates = tmp_path / "templates"
+    t = templates / "bk"
+    t.mkdir(parents=True)
+    dest = tmp_path / "project"
+    dest.mkdir()
+    for i in range(files):
+        (t / f"f{i}.txt.j2").write_text("new {{ project_name }}")
+        (dest / f"f{i}.txt").write_text("same old content")
+    engine = Engine(templates_root=templates, user_templates_root=tmp_path / "user")
+    return engine, dest
+
+
+def _apply(engine, dest, name, **kw):
+    list(
+        engine.apply_template(
+            "bk", dest, {"project_name": name}, force=True, backup=True, **kw
+        )
+    )
+
+
+def test_identical_files_are_stored_once_and_hardlinked(tmp_path):
+    engine, dest = _setup(tmp_path)
+    _apply(engine, dest, "A", atomic=True)
+    store = BackupStore(dest)
+    runs = store.list_runs()
+    assert len(runs) == 1 and len(runs[0]["files"]) == 3
+    digests = list(store.blobs.digests())
+    assert len(digests) == 1
+    assert store.blobs.path_for(digests[0]).read_text() == "same old content"
+    if os.name != "nt":
+        # the blob holds the only remaining link to the replaced original
+        assert store.blobs.path_for(digests[0]).stat().st_nlink == 1
+        assert (dest / "f0.txt").read_text() == "new A"
+
+
+def test_restore_and_prune(tmp_path):
+    engine, dest = _setup(tmp_path, files=2)
+    _apply(engine, dest, "A", atomic=True)
+    _apply(engine, dest, "B", staged=True)
+    _apply(engine, dest, "C")
+    store = BackupStore(dest)
+    runs = store.list_runs()
+    assert len(runs) == 3
+    assert len(list(store.blobs.digests())) == 3
+
+    restored = store.restore(runs[1]["id"])
+    assert restored == ["f0.txt", "f1.txt"]
+    assert (dest / "f0.txt").read_text() == "new A"
+
+    res = store.prune(keep_runs=2)
+    assert res["removed_runs"] == [runs[0]["id"]]
+    assert res["freed_bytes"] == len("same old content")
+    assert len(list(store.blobs.digests())) == 2
+
+    res = store.prune(max_bytes=1)
+    # the newest run is always kept
+    assert [r["id"] for r in store.list_runs()] == [runs[2]["id"]]
+    assert len(list(store.blobs.digests())) == 1
+
+
+@pytest.mark.parametrize("link", [False, True])
+@pytest.mark.parametrize("mode", [{}, {"atomic": True}, {"staged": True}])
+def test_reapply_after_restore_keeps_blobs_intact(tmp_path, link, mode):
+    engine, dest = _setup(tmp_path, files=1)
+    (engine.templates_root / "bk" / "raw.txt").write_text("raw new")
+    (dest / "raw.txt").write_text("raw old")
+    _apply(engine, dest, "A")
+    store = BackupStore(dest)
+    run_id = store.list_runs()[0]["id"]
+
+    store.restore(run_id, link=link)
+    assert (dest / "f0.txt").read_text() == "same old content"
+    if os.name != "nt":
+        assert ((dest / "f0.txt").stat().st_nlink > 1) == link
+    _apply(engine, dest, "NEW", **mode)
+
+    assert (dest / "f0.txt").read_text() == "new NEW"
+    assert (dest / "raw.txt").read_text() == "raw new"
+    for info in store.get_run(run_id)["files"].values():
+        assert hash_file(store.blobs.path_for(info["hash"])) == info["hash"]
+
+
+def test_retention_env_applied_after_each_run(tmp_path, monkeypatch):
+    monkeypatch.setenv("BLDRX_BACKUP_KEEP_RUNS", "1")
+    engine, dest = _setup(tmp_path, files=1)
+    _apply(engine, dest, "A")
+    _apply(engine, dest, "B")
+    runs = BackupStore(dest).list_runs()
+    assert len(runs) == 1
+    assert runs[0]["files"]["f0.txt"]["size"] == len("new A")
+
+
+def test_cli_backups_list_restore_prune(tmp_path):
+    engine, dest = _setup(tmp_path, files=1)
+    _apply(engine, dest, "A")
+    _apply(engine, dest, "B")
+    run_id = BackupStore(dest).list_runs()[0]["id"]
+    runner = CliRunner()
+
+    res = runner.invoke(cli, ["backups", "list", str(dest)])
+    assert res.exit_code == 0 and run_id in res.output
+
+    res = runner.invoke(
+        cli, ["backups", "restore", str(dest), run_id, "--copy", "--yes"]
+    )
+    assert res.exit_code == 0, res.output
+    assert (dest / "f0.txt").read_text() == "same old content"
+    res = runner.invoke(cli, ["backups", "restore", str(dest), run_id, "--yes"])
+    assert res.exit_code == 0, res.output
+    if os.name != "nt":
+        assert (dest / "f0.txt").stat().st_nlink == 1
+
+    res = runner.invoke(cli, ["backups", "restore", str(dest), "nope", "--yes"])
+    assert res.exit_code == 1
+
+    res = runner.invoke(cli, ["backups", "prune", str(dest), "--keep", "1"])
+    assert res.exit_code == 0 and f"removed: {run_id}" in res.output
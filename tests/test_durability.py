@@ -0,0 +1,72 @@
+import pytest
+
+import bldrx.engine as engine_mod
+from bldrx.engine import Engine
+
+
+def _setup(tmp_path, count=5):
+    templates = tmp_path / "templates"
+    t = templates / "dur"
+    (t / "sub").mkdir(parents=True)
+    for i in range(count):
+        (t / "sub" / f"f{i}.txt.j2").write_text("{{ project_name }} %d" % i)
+    engine = Engine(
+        templates_root=templates, user_templates_root=tmp_path / "user_templates"
+    )
+    return engine
+
+
+def _count_fsyncs(monkeypatch):
+    calls = {"files": 0, "dirs": 0}
+    orig = engine_mod._fsync_path
+
+    def counting(path, is_dir=False):
+        calls["dirs" if is_dir else "files"] += 1
+        return orig(path, is_dir=is_dir)
+
+    monkeypatch.setattr(engine_mod, "_fsync_path", counting)
+    return calls
+
+
+@pytest.mark.parametrize(
+    "level,files,max_dirs",
+    [("none", 0, 0), ("batch", 5, 2), ("strict", 5, 10)],
+)
+def test_durability_levels(tmp_path, monkeypatch, level, files, max_dirs):
+    engine = _setup(tmp_path)
+    calls = _count_fsyncs(monkeypatch)
+    dest = tmp_path / "project"
+    list(
+        engine.apply_template(
+            "dur", dest, {"project_name": "X"}, atomic=True, durability=level
+        )
+    )
+    assert (dest / "sub" / "f4.txt").read_text() == "X 4"
+    assert calls["files"] == files
+    if level == "batch":
+        # `sub/` and the project root, each exactly once
+        assert calls["dirs"] == 2
+    else:
+        assert calls["dirs"] <= max_dirs
+
+
+def test_batch_durability_with_staged_apply(tmp_path, monkeypatch):
+    engine = _setup(tmp_path, count=3)
+    calls = _count_fsyncs(monkeypatch)
+    dest = tmp_path / "project"
+    list(
+        engine.apply_template(
+            "dur", dest, {"project_name": "X"}, staged=True, durability="batch"
+        )
+    )
+    assert calls == {"files": 3, "dirs": 2}
+
+
+def test_unknown_durability_level(tmp_path):
+    engine = _setup(tmp_path, count=1)
+    with pytest.raises(ValueError):
+        list(
+            engine.apply_template(
+                "dur", tmp_path / "project", {"project_name": "X"}, durability="max"
+            )
+        )
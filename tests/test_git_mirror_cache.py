@@ -0,0 +1,108 @@
+import shutil
+import subprocess
+import threading
+
+import pytest
+
+from bldrx.engine import Engine
+from bldrx.gitops import GitMirrorCache, split_git_url
+
+
+def _git(*args, cwd):
+    return subprocess.run(
+        ["git", *args], cwd=cwd, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+def _remote(tmp_path):
+    """A bare 'remote' repo with a tagged first commit; returns (bare path, work path)."""
+    work = tmp_path / "work"
+    work.mkdir()
+    _git("init", "-q", "-b", "main", cwd=work)
+    _git("config", "user.email", "test@example.com", cwd=work)
+    _git("config", "user.name", "Test User", cwd=work)
+    _git("config", "commit.gpgsign", "false", cwd=work)
+    (work / "README.md.j2").write_text("v1 {{ project_name }}")
+    (work / "ci").mkdir()
+    (work / "ci" / "lint.yml").write_text("lint")
+    _git("add", ".", cwd=work)
+    _git("commit", "-q", "-m", "v1", cwd=work)
+    _git("tag", "v1", cwd=work)
+    bare = tmp_path / "tpl.git"
+    _git("clone", "-q", "--bare", str(work), str(bare), cwd=tmp_path)
+    _git("remote", "add", "origin", str(bare), cwd=work)
+    return bare, work
+
+
+def _push_v2(work):
+    (work / "README.md.j2").write_text("v2 {{ project_name }}")
+    _git("commit", "-q", "-am", "v2", cwd=work)
+    _git("push", "-q", "origin", "main", cwd=work)
+    return _git("rev-parse", "HEAD", cwd=work)
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    monkeypatch.setenv("BLDRX_CACHE_DIR", str(tmp_path / "cache"))
+    return Engine(
+        templates_root=tmp_path / "templates", user_templates_root=tmp_path / "u"
+    )
+
+
+def test_split_git_url():
+    assert split_git_url("git+https://h/o/r.git@v1") == ("https://h/o/r.git", "v1")
+    assert split_git_url("git@h:o/r.git") == ("git@h:o/r.git", None)
+    assert split_git_url("git+ssh://git@h/o/r.git") == ("ssh://git@h/o/r.git", None)
+
+
+def test_mirror_is_reused_and_updated_incrementally(tmp_path, engine):
+    bare, work = _remote(tmp_path)
+    installed = engine.fetch_remote_template(f"git+{bare}")
+    assert installed.name == "tpl"
+    assert (installed / "README.md.j2").read_text().startswith("v1")
+    assert (installed / "ci" / "lint.yml").exists()
+    assert not (installed / ".git").exists()
+    mirrors = list((tmp_path / "cache" / "git").glob("*.git"))
+    assert len(mirrors) == 1
+    ino = mirrors[0].stat().st_ino
+
+    _push_v2(work)
+    engine.fetch_remote_template(f"git+{bare}", force=True)
+    assert (installed / "README.md.j2").read_text().startswith("v2")
+    assert mirrors[0].stat().st_ino == ino  # fetched into, not re-cloned
+
+
+def test_ref_pinning(tmp_path, engine):
+    bare, work = _remote(tmp_path)
+    v2 = _push_v2(work)
+    pinned = engine.fetch_remote_template(f"git+{bare}@v1", name="pinned")
+    assert (pinned / "README.md.j2").read_text().startswith("v1")
+    by_sha = engine.fetch_remote_template(f"git+{bare}", name="sha", ref=v2)
+    assert (by_sha / "README.md.j2").read_text().startswith("v2")
+
+    # a mirrored commit id is served without contacting the remote
+    shutil.rmtree(bare)
+    again = engine.fetch_remote_template(f"git+{bare}@{v2}", name="offline")
+    assert (again / "README.md.j2").read_text().startswith("v2")
+    with pytest.raises(RuntimeError):
+        engine.fetch_remote_template(f"git+{bare}@v1", name="needs-network")
+
+
+def test_concurrent_fetches_share_one_mirror(tmp_path):
+    bare, _work = _remote(tmp_path)
+    cache = GitMirrorCache(tmp_path / "cache" / "git")
+    results, errors = [], []
+
+    def run():
+        try:
+            results.append(cache.update(str(bare)))
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+
+    threads = [threading.Thread(target=run) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors and len(set(results)) == 1
+    assert len(list((tmp_path / "cache" / "git").glob("*.git*"))) == 1
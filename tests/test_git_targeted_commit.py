@@ -0,0 +1,114 @@
+import subprocess
+
+import pytest
+
+from bldrx.engine import Engine
+
+
+def _git(*args, cwd):
+    return subprocess.run(
+        ["git", *args], cwd=cwd, check=True, capture_output=True, text=True
+    ).stdout
+
+
+def _repo(tmp_path, commit=True):
+    dest = tmp_path / "project"
+    dest.mkdir()
+    _git("init", "-q", "-b", "main", cwd=dest)
+    _git("config", "user.email", "test@example.com", cwd=dest)
+    _git("config", "user.name", "Test User", cwd=dest)
+    _git("config", "commit.gpgsign", "false", cwd=dest)
+    if commit:
+        (dest / "existing.txt").write_text("OLD")
+        (dest / "unrelated.txt").write_text("v1")
+        _git("add", ".", cwd=dest)
+        _git("commit", "-q", "-m", "initial", cwd=dest)
+    return dest
+
+
+def _engine(tmp_path):
+    t = tmp_path / "templates" / "g"
+    (t / "sub").mkdir(parents=True)
+    (t / "existing.txt.j2").write_text("NEW {{ project_name }}")
+    (t / "sub" / "added.txt").write_text("added")
+    return Engine(
+        templates_root=tmp_path / "templates", user_templates_root=tmp_path / "user"
+    )
+
+
+def test_index_mode_commits_only_written_paths(tmp_path):
+    engine = _engine(tmp_path)
+    dest = _repo(tmp_path)
+    # unrelated edits, one staged and one not, must stay out of the commit
+    (dest / "unrelated.txt").write_text("v2")
+    _git("add", "unrelated.txt", cwd=dest)
+    (dest / "scratch.txt").write_text("untracked")
+
+    list(
+        engine.apply_template(
+            "g", dest, {"project_name": "X"}, force=True, git_commit=True
+        )
+    )
+
+    files = _git("show", "--name-only", "--pretty=", "HEAD", cwd=dest).split()
+    assert sorted(files) == ["existing.txt", "sub/added.txt"]
+    status = _git("status", "--porcelain", cwd=dest)
+    assert "M  unrelated.txt" in status
+    assert "?? scratch.txt" in status
+
+
+def test_index_mode_initial_commit(tmp_path):
+    engine = _engine(tmp_path)
+    dest = _repo(tmp_path, commit=False)
+    list(engine.apply_template("g", dest, {"project_name": "X"}, git_commit=True))
+    assert _git("log", "-1", "--pretty=%s", cwd=dest).strip() == (
+        "bldrx: apply template g"
+    )
+
+
+def test_plumbing_mode_leaves_checkout_untouched(tmp_path):
+    engine = _engine(tmp_path)
+    dest = _repo(tmp_path)
+    (dest / "unrelated.txt").write_text("v2")
+    _git("add", "unrelated.txt", cwd=dest)
+    head = _git("rev-parse", "HEAD", cwd=dest)
+
+    list(
+        engine.apply_template(
+            "g",
+            dest,
+            {"project_name": "X"},
+            force=True,
+            git_commit=True,
+            git_mode="plumbing",
+            git_branch="templates",
+        )
+    )
+
+    assert _git("rev-parse", "HEAD", cwd=dest) == head
+    assert _git("symbolic-ref", "HEAD", cwd=dest).strip() == "refs/heads/main"
+    # the staged unrelated edit is still only in the real index
+    assert _git("diff", "--cached", "--name-only", cwd=dest).split() == [
+        "unrelated.txt"
+    ]
+    assert _git("rev-parse", "templates^", cwd=dest) == head
+    assert _git("show", "templates:existing.txt", cwd=dest) == "NEW X"
+    assert _git("show", "templates:sub/added.txt", cwd=dest) == "added"
+    assert _git("show", "templates:unrelated.txt", cwd=dest) == "v1"
+
+
+def test_plumbing_mode_refuses_checked_out_branch(tmp_path):
+    engine = _engine(tmp_path)
+    dest = _repo(tmp_path)
+    with pytest.raises(RuntimeError, match="checked out"):
+        list(
+            engine.apply_template(
+                "g",
+                dest,
+                {"project_name": "X"},
+                force=True,
+                git_commit=True,
+                git_mode="plumbing",
+                git_branch="main",
+            )
+        )
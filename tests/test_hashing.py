@@ -0,0 +1,63 @@
+import hashlib
+
+import bldrx.hashing as hashing
+from bldrx.engine import Engine
+from bldrx.registry import Registry
+
+
+def _sha(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def test_hash_file_chunked_and_mmap_paths_agree(tmp_path, monkeypatch):
+    data = bytes(range(256)) * 9000  # spans several chunks
+    p = tmp_path / "big.bin"
+    p.write_bytes(data)
+    (tmp_path / "empty").write_bytes(b"")
+    monkeypatch.setattr(hashing, "_CHUNK_SIZE", 4096)
+    assert hashing.hash_file(p) == _sha(data)
+    monkeypatch.setattr(hashing, "_MMAP_THRESHOLD", 1024)
+    assert hashing.hash_file(p) == _sha(data)
+    assert hashing.hash_file(tmp_path / "empty") == _sha(b"")
+
+
+def test_hash_files_keeps_order(tmp_path):
+    paths = []
+    for i in range(20):
+        p = tmp_path / f"f{i}"
+        p.write_bytes(b"x" * i)
+        paths.append(p)
+    assert hashing.hash_files(paths, workers=4) == [_sha(b"x" * i) for i in range(20)]
+
+
+def test_verify_files_reports_mismatches_and_missing(tmp_path):
+    (tmp_path / "a").write_bytes(b"a")
+    (tmp_path / "b").write_bytes(b"changed")
+    res = hashing.verify_files(
+        tmp_path, {"a": _sha(b"a"), "b": _sha(b"b"), "c": _sha(b"c")}
+    )
+    assert res == {"mismatches": ["b"], "missing": ["c"]}
+
+
+def test_call_sites_use_shared_service(tmp_path, monkeypatch):
+    t = tmp_path / "templates" / "h"
+    (t / "sub").mkdir(parents=True)
+    (t / "a.txt").write_bytes(b"A")
+    (t / "sub" / "b.txt").write_bytes(b"B")
+    engine = Engine(
+        templates_root=tmp_path / "templates", user_templates_root=tmp_path / "u"
+    )
+    calls = []
+    real = hashing.hash_files
+
+    def spy(paths, *a, **kw):
+        calls.append(len(list(paths)))
+        return real(paths, *a, **kw)
+
+    monkeypatch.setattr(hashing, "hash_files", spy)
+    manifest = engine.generate_manifest("h", write=True)
+    assert manifest["files"] == {"a.txt": _sha(b"A"), "sub/b.txt": _sha(b"B")}
+    assert engine.verify_template("h")["ok"]
+    meta = Registry(root=tmp_path / "reg").publish(t, name="h")
+    assert meta["manifest"]["files"]["sub/b.txt"] == _sha(b"B")
+    assert len(calls) == 3
@@ -0,0 +1,134 @@
+import http.server
+import io
+import tarfile
+import threading
+
+import pytest
+
+from bldrx.engine import Engine
+from bldrx.fetch import DownloadCache
+
+
+class _Server:
+    """Tiny HTTP stand-in with ETag/If-None-Match, Range/If-Range and an optional dropped connection."""
+
+    def __init__(self, body):
+        self.body = body
+        self.etag = '"v1"'
+        self.drop_after = None  # send only this many bytes of the next full response
+        self.requests = []
+        outer = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def log_message(self, *a):
+                pass
+
+            def do_GET(self):
+                outer.requests.append(dict(self.headers))
+                if self.headers.get("If-None-Match") == outer.etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                rng = self.headers.get("Range")
+                if rng and self.headers.get("If-Range") == outer.etag:
+                    start = int(rng.split("=")[1].rstrip("-"))
+                    data = outer.body[start:]
+                    self.send_response(206)
+                    self.send_header(
+                        "Content-Range",
+                        f"bytes {start}-{len(outer.body) - 1}/{len(outer.body)}",
+                    )
+                else:
+                    data = outer.body
+                    self.send_response(200)
+                self.send_header("ETag", outer.etag)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                if outer.drop_after is not None:
+                    data, outer.drop_after = data[: outer.drop_after], None
+                    self.wfile.write(data)
+                    self.wfile.flush()
+                    self.close_connection = True
+                    return
+                self.wfile.write(data)
+
+        self.httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(
+            target=self.httpd.serve_forever, args=(0.05,), daemon=True
+        )
+        self.thread.start()
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}/{path}"
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def server():
+    s = _Server(bytes(range(256)) * 400)
+    yield s
+    s.close()
+
+
+def test_revalidates_with_etag(tmp_path, server):
+    cache = DownloadCache(tmp_path / "http")
+    first = cache.fetch(server.url("t.tar.gz"))
+    assert first.read_bytes() == server.body and first.name.endswith(".tar.gz")
+    again = cache.fetch(server.url("t.tar.gz"))
+    assert again == first
+    assert server.requests[-1]["If-None-Match"] == '"v1"'
+
+    server.body, server.etag = b"new body", '"v2"'
+    assert cache.fetch(server.url("t.tar.gz")).read_bytes() == b"new body"
+
+
+def test_resumes_interrupted_download(tmp_path, server):
+    cache = DownloadCache(tmp_path / "http")
+    server.drop_after = 10000
+    with pytest.raises(Exception):
+        cache.fetch(server.url("big.bin"))
+    parts = list((tmp_path / "http").glob("*.part"))
+    assert len(parts) == 1 and parts[0].stat().st_size == 10000
+
+    body = cache.fetch(server.url("big.bin"))
+    assert body.read_bytes() == server.body
+    assert server.requests[-1]["Range"] == "bytes=10000-"
+    assert not list((tmp_path / "http").glob("*.part*"))
+
+
+def test_changed_resource_restarts_instead_of_splicing(tmp_path, server):
+    cache = DownloadCache(tmp_path / "http")
+    server.drop_after = 5000
+    with pytest.raises(Exception):
+        cache.fetch(server.url("big.bin"))
+    server.body, server.etag = b"x" * 7000, '"v2"'
+    assert cache.fetch(server.url("big.bin")).read_bytes() == b"x" * 7000
+
+
+def test_stale_partials_are_cleaned(tmp_path):
+    cache = DownloadCache(tmp_path / "http")
+    (tmp_path / "http").mkdir()
+    (tmp_path / "http" / "old.part").write_bytes(b"x")
+    assert cache.clean(max_age=-1) == 1
+    assert not (tmp_path / "http" / "old.part").exists()
+
+
+def test_fetch_remote_template_uses_the_cache(tmp_path, server, monkeypatch):
+    monkeypatch.setenv("BLDRX_CACHE_DIR", str(tmp_path / "cache"))
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w:gz") as tf:
+        info = tarfile.TarInfo("web/hello.txt")
+        info.size = 2
+        tf.addfile(info, io.BytesIO(b"hi"))
+    server.body = buf.getvalue()
+    engine = Engine(
+        templates_root=tmp_path / "templates", user_templates_root=tmp_path / "u"
+    )
+    installed = engine.fetch_remote_template(server.url("web.tar.gz"))
+    assert (installed / "hello.txt").read_text() == "hi"
+    engine.fetch_remote_template(server.url("web.tar.gz"), force=True)
+    assert server.requests[-1].get("If-None-Match") == '"v1"'
+    assert len(list((tmp_path / "cache" / "http").glob("*.tar.gz"))) == 1
@@ -0,0 +1,82 @@
+import io
+import tarfile
+import threading
+import time
+
+from click.testing import CliRunner
+
+from bldrx.cli import cli
+from bldrx.engine import Engine
+
+
+def _dir(tmp_path, name, n=3):
+    d = tmp_path / "src" / name
+    d.mkdir(parents=True)
+    for i in range(n):
+        (d / f"f{i}.txt").write_text(f"{name} {i}")
+    return d
+
+
+def _tgz(tmp_path, name):
+    path = tmp_path / f"{name}.tar.gz"
+    with tarfile.open(path, "w:gz") as tf:
+        info = tarfile.TarInfo(f"{name}/README.md")
+        info.size = 2
+        tf.addfile(info, io.BytesIO(b"hi"))
+    return path
+
+
+def _engine(tmp_path):
+    return Engine(
+        templates_root=tmp_path / "templates", user_templates_root=tmp_path / "u"
+    )
+
+
+def test_install_many_runs_concurrently_and_isolates_failures(tmp_path, monkeypatch):
+    engine = _engine(tmp_path)
+    sources = [str(_dir(tmp_path, f"t{i}")) for i in range(4)]
+    sources.insert(2, str(tmp_path / "missing.tar.gz"))
+    sources.append({"source": str(_tgz(tmp_path, "arch")), "name": "renamed"})
+
+    active, peak = [0], [0]
+    lock = threading.Lock()
+    real = Engine.fetch_remote_template
+
+    def slow(self, *a, **kw):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        try:
+            time.sleep(0.05)
+            return real(self, *a, **kw)
+        finally:
+            with lock:
+                active[0] -= 1
+
+    monkeypatch.setattr(Engine, "fetch_remote_template", slow)
+    results = engine.install_many(sources, workers=3)
+
+    assert [r["ok"] for r in results] == [True, True, False, True, True, True]
+    assert "missing.tar.gz" in results[2]["error"]
+    assert results[-1]["name"] == "renamed"
+    assert (tmp_path / "u" / "renamed" / "README.md").read_text() == "hi"
+    assert (tmp_path / "u" / "t3" / "f2.txt").read_text() == "t3 2"
+    assert 1 < peak[0] <= 3
+
+
+def test_cli_from_file_prints_summary(tmp_path, monkeypatch):
+    a = _dir(tmp_path, "a")
+    listing = tmp_path / "templates.txt"
+    listing.write_text(
+        f"# bootstrap list\n{a}\n\n{_tgz(tmp_path, 'b')} bee  # archive\n"
+        f"{tmp_path / 'nope'}\n"
+    )
+    monkeypatch.setenv("BLDRX_TEMPLATES_DIR", str(tmp_path / "u"))
+    res = CliRunner().invoke(
+        cli, ["install-template", "--from-file", str(listing), "--jobs", "2"]
+    )
+    assert res.exit_code == 1
+    assert "ok    a <-" in res.output and "ok    bee <-" in res.output
+    assert "FAIL" in res.output
+    assert "Installed 2 of 3 templates." in res.output
+    assert (tmp_path / "u" / "bee" / "README.md").exists()
@@ -0,0 +1,119 @@
+import os
+import threading
+import time
+
+import pytest
+from click.testing import CliRunner
+
+from bldrx.cli import cli
+from bldrx.engine import Engine
+from bldrx.journal import Journal, recover
+
+
+def _setup(tmp_path):
+    templates = tmp_path / "templates"
+    t = templates / "txn"
+    t.mkdir(parents=True)
+    (t / "a.txt.j2").write_text("A {{ project_name }}\n")
+    (t / "b.txt.j2").write_text("B {{ project_name }}\n")
+    (t / "c.txt").write_text("C raw\n")
+    dest = tmp_path / "project"
+    dest.mkdir()
+    (dest / "a.txt").write_text("OLD A\n")
+    engine = Engine(
+        templates_root=templates, user_templates_root=tmp_path / "user_templates"
+    )
+    return engine, dest
+
+
+def test_journaled_apply_and_undo(tmp_path):
+    engine, dest = _setup(tmp_path)
+    list(
+        engine.apply_template(
+            "txn", dest, {"project_name": "X"}, force=True, journal=True
+        )
+    )
+    assert (dest / "a.txt").read_text() == "A X"
+    journals = Journal.list(dest)
+    assert len(journals) == 1 and journals[0].committed
+    # original moved aside by rename, not copied into backups
+    assert not (dest / ".bldrx" / "backups").exists()
+
+    res = CliRunner().invoke(cli, ["undo", str(dest), "--yes"])
+    assert res.exit_code == 0, res.output
+    assert (dest / "a.txt").read_text() == "OLD A\n"
+    assert not (dest / "b.txt").exists()
+    assert not (dest / "c.txt").exists()
+    assert Journal.list(dest) == []
+
+
+def test_journaled_apply_rolls_back_on_failure(tmp_path, monkeypatch):
+    engine, dest = _setup(tmp_path)
+    orig_replace = os.replace
+
+    def fake_replace(src, dst):
+        if str(dst).endswith("c.txt"):
+            raise OSError("simulated replace failure")
+        return orig_replace(src, dst)
+
+    monkeypatch.setattr("os.replace", fake_replace)
+    with pytest.raises(RuntimeError):
+        list(
+            engine.apply_template(
+                "txn", dest, {"project_name": "Y"}, force=True, journal=True
+            )
+        )
+    assert (dest / "a.txt").read_text() == "OLD A\n"
+    assert not (dest / "b.txt").exists()
+    assert Journal.list(dest) == []
+    assert not list(dest.glob("*.bldrx.tmp.*"))
+
+
+def test_recover_interrupted_apply(tmp_path):
+    engine, dest = _setup(tmp_path)
+    gen = engine.apply_template(
+        "txn", dest, {"project_name": "Z"}, force=True, journal=True
+    )
+    # consume one file then abandon the apply, as if the process died (which also drops its apply lock)
+    next(gen)
+    gen.close()
+    pending = Journal.list(dest)
+    assert len(pending) == 1 and not pending[0].committed
+    # a new journaled apply refuses to start on top of an interrupted one
+    with pytest.raises(RuntimeError):
+        list(engine.apply_template("txn", dest, {"project_name": "Z"}, journal=True))
+
+    results = recover(dest)
+    assert len(results) == 1
+    assert (dest / "a.txt").read_text() == "OLD A\n"
+    assert sorted(p.name for p in dest.iterdir()) == [".bldrx", "a.txt"]
+    assert Journal.list(dest) == []
+
+
+@pytest.mark.parametrize("command", [["recover"], ["undo", "--yes"]])
+def test_recover_and_undo_wait_for_running_apply(tmp_path, command):
+    engine, dest = _setup(tmp_path)
+    gen = engine.apply_template(
+        "txn", dest, {"project_name": "W"}, force=True, journal=True
+    )
+    next(gen)  # the apply is in flight and holds the destination lock
+    results = []
+    t = threading.Thread(
+        target=lambda: results.append(CliRunner().invoke(cli, command + [str(dest)])),
+        daemon=True,
+    )
+    t.start()
+    try:
+        time.sleep(0.3)
+        assert t.is_alive()
+        assert not Journal.list(dest)[0].committed
+    finally:
+        list(gen)
+    t.join(5)
+    assert results and results[0].exit_code == 0, results[0].output
+    if command == ["recover"]:
+        # the finished apply was committed, not rolled back underneath it
+        assert "Nothing to recover." in results[0].output
+        assert (dest / "a.txt").read_text() == "A W"
+    else:
+        assert (dest / "a.txt").read_text() == "OLD A\n"
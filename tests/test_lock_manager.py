@@ -0,0 +1,103 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from bldrx.engine import Engine
+from bldrx.locks import LockManager, LockTimeout, fcntl, file_lock
+
+posix_only = pytest.mark.skipif(fcntl is None, reason="requires fcntl.flock")
+
+
+def _hold(path, seconds, shared=False, started=None):
+    with file_lock(path, shared=shared):
+        if started is not None:
+            started.set()
+        time.sleep(seconds)
+
+
+def test_exclusive_lock_waits_then_acquires(tmp_path):
+    lock = tmp_path / "x.lock"
+    started = threading.Event()
+    t = threading.Thread(target=_hold, args=(lock, 0.3), kwargs={"started": started})
+    t.start()
+    started.wait()
+    start = time.time()
+    with file_lock(lock, timeout=5):
+        elapsed = time.time() - start
+    t.join()
+    assert elapsed >= 0.2
+
+
+@posix_only
+def test_shared_locks_coexist_and_exclude_writers(tmp_path):
+    lock = tmp_path / "s.lock"
+    started = threading.Event()
+    t = threading.Thread(
+        target=_hold, args=(lock, 0.5), kwargs={"shared": True, "started": started}
+    )
+    t.start()
+    started.wait()
+    with file_lock(lock, shared=True, timeout=0.1):
+        pass
+    with pytest.raises(LockTimeout):
+        with file_lock(lock, timeout=0.1):
+            pass
+    t.join()
+
+
+def test_lock_released_when_holder_dies(tmp_path):
+    lock = tmp_path / "dead.lock"
+    code = (
+        "import os, sys\n"
+        "from bldrx.locks import file_lock\n"
+        "with file_lock(sys.argv[1]):\n"
+        "    os._exit(0)\n"
+    )
+    root = str(Path(__file__).resolve().parents[1])
+    env = dict(
+        os.environ, PYTHONPATH=os.pathsep.join([root, os.getenv("PYTHONPATH", "")])
+    )
+    subprocess.run([sys.executable, "-c", code, str(lock)], check=True, env=env)
+    # the lock file is still there, but the OS dropped the lock with the process
+    assert lock.exists()
+    with file_lock(lock, timeout=0.1):
+        pass
+
+
+def test_concurrent_applies_to_same_destination_are_serialized(tmp_path):
+    templates = tmp_path / "templates"
+    (templates / "t").mkdir(parents=True)
+    (templates / "t" / "a.txt").write_text("a")
+    engine = Engine(
+        templates_root=templates,
+        user_templates_root=tmp_path / "user_templates",
+        locks_root=tmp_path / "locks",
+    )
+    dest = tmp_path / "project"
+    dest.mkdir()
+    locks = LockManager(tmp_path / "locks")
+    started = threading.Event()
+    release = threading.Event()
+
+    def holder():
+        with locks.destination(dest):
+            started.set()
+            release.wait(5)
+
+    t = threading.Thread(target=holder)
+    t.start()
+    started.wait()
+    with pytest.raises(LockTimeout):
+        list(engine.apply_template("t", dest, {}, lock_timeout=0.1))
+    # dry runs do not write and therefore do not wait for the lock
+    assert list(engine.apply_template("t", dest, {}, dry_run=True, lock_timeout=0.1))
+    release.set()
+    t.join()
+    assert list(engine.apply_template("t", dest, {}, lock_timeout=1)) == [
+        (str(dest / "a.txt"), "copied")
+    ]
@@ -0,0 +1,145 @@
+import json
+import os
+import shutil
+import time
+
+import pytest
+from click.testing import CliRunner
+
+import bldrx.hashing as hashing
+from bldrx.cli import cli
+from bldrx.engine import Engine
+
+
+def _setup(tmp_path, monkeypatch):
+    monkeypatch.setenv("BLDRX_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("BLDRX_TEMPLATES_DIR", str(tmp_path / "u"))
+    t = tmp_path / "u" / "web"
+    (t / "docs").mkdir(parents=True)
+    (t / "README.md.j2").write_text("# {{ project_name }} by {{ author_name }}\n")
+    (t / "docs" / "guide.txt").write_text("guide")
+    old = time.time() - 60
+    for p in t.rglob("*"):
+        os.utime(p, (old, old))
+    project = tmp_path / "proj"
+    project.mkdir()
+    return t, project
+
+
+def test_lock_records_source_hashes_and_metadata(tmp_path, monkeypatch):
+    t, project = _setup(tmp_path, monkeypatch)
+    (t / "bldrx-manifest.json").write_text(json.dumps({"version": "1.2.0"}))
+    engine = Engine(templates_root=tmp_path / "pkg")
+    data = engine.lock_templates(project, ["web"], {"author_name": "Ada"})
+
+    on_disk = json.loads((project / "bldrx.lock").read_text())
+    assert on_disk == data and data["version"] == 1
+    entry = data["templates"]["web"]
+    # recorded relative to its source root, so the lockfile works on other machines
+    assert entry["source"] == "user" and entry["path"] == "web"
+    assert entry["version"] == "1.2.0" and entry["algorithm"] == "sha256"
+    # the manifest itself is not part of the locked content
+    (t / "bldrx-manifest.json").write_text(json.dumps({"version": "1.2.0", "x": 1}))
+    assert engine.check_lock(project, metadata={"author_name": "Ada"}) == {
+        "web": t.resolve()
+    }
+
+
+def test_lock_is_portable_across_template_roots(tmp_path, monkeypatch):
+    t, project = _setup(tmp_path, monkeypatch)
+    extra = tmp_path / "extra" / "licenses" / "MIT"
+    extra.mkdir(parents=True)
+    (extra / "LICENSE").write_text("MIT")
+    engine = Engine(templates_root=tmp_path / "pkg")
+    engine.lock_templates(
+        project, ["web", "licenses/MIT"], templates_dir=tmp_path / "extra"
+    )
+    locked = json.loads((project / "bldrx.lock").read_text())["templates"]
+    assert locked["licenses/MIT"] == dict(
+        locked["licenses/MIT"], source="templates-dir", path="licenses/MIT"
+    )
+
+    # another checkout: same templates under different roots
+    other = tmp_path / "elsewhere"
+    shutil.copytree(tmp_path / "u", other / "u")
+    shutil.copytree(tmp_path / "extra", other / "extra")
+    monkeypatch.setenv("BLDRX_TEMPLATES_DIR", str(other / "u"))
+    moved = Engine(templates_root=tmp_path / "pkg")
+    assert moved.check_lock(project, templates_dir=other / "extra") == {
+        "licenses/MIT": (other / "extra" / "licenses" / "MIT").resolve(),
+        "web": (other / "u" / "web").resolve(),
+    }
+    with pytest.raises(RuntimeError, match="pass its templates dir"):
+        moved.check_lock(project)
+    (other / "u" / "web" / "docs" / "guide.txt").write_text("edited")
+    with pytest.raises(RuntimeError, match="web: files changed"):
+        moved.check_lock(project, ["web"])
+
+
+def test_check_lock_fails_fast_on_changes(tmp_path, monkeypatch):
+    t, project = _setup(tmp_path, monkeypatch)
+    engine = Engine(templates_root=tmp_path / "pkg")
+    engine.lock_templates(project, ["web"], {"author_name": "Ada"})
+
+    with pytest.raises(RuntimeError, match="metadata differs"):
+        engine.check_lock(project, metadata={"author_name": "Bob"})
+    with pytest.raises(RuntimeError, match="other: not in bldrx.lock"):
+        engine.check_lock(project, ["web", "other"])
+    (t / "docs" / "guide.txt").write_text("edited")
+    with pytest.raises(RuntimeError, match="web: files changed"):
+        engine.check_lock(project)
+
+
+def test_matching_lock_only_stats_files(tmp_path, monkeypatch):
+    _t, project = _setup(tmp_path, monkeypatch)
+    engine = Engine(templates_root=tmp_path / "pkg")
+    engine.lock_templates(project, ["web"])
+    hashed = []
+    real = hashing.hash_files
+
+    def spy(paths, *a, **kw):
+        paths = list(paths)
+        hashed.append(paths)
+        return real(paths, *a, **kw)
+
+    monkeypatch.setattr(hashing, "hash_files", spy)
+    engine.check_lock(project)
+    assert hashed == [[]]
+    engine.check_lock(project, paranoid=True)
+    assert len(hashed[-1]) == 2
+
+
+def test_cli_lock_and_locked_apply(tmp_path, monkeypatch):
+    t, project = _setup(tmp_path, monkeypatch)
+    runner = CliRunner()
+    res = runner.invoke(
+        cli, ["lock", str(project), "--templates", "web", "--author", "Ada"]
+    )
+    assert res.exit_code == 0, res.output
+    assert "web - " in res.output and (project / "bldrx.lock").exists()
+
+    def resolve_fails(*a, **kw):
+        raise AssertionError("locked apply must not resolve templates")
+
+    monkeypatch.setattr(Engine, "_find_template_src", resolve_fails)
+    res = runner.invoke(
+        cli, ["add-templates", str(project), "--locked", "--author", "Ada"]
+    )
+    assert res.exit_code == 0, res.output
+    assert (project / "README.md").read_text() == "# proj by Ada"
+    assert (project / "docs" / "guide.txt").read_text() == "guide"
+
+    (t / "README.md.j2").write_text("tampered")
+    res = runner.invoke(
+        cli, ["add-templates", str(project), "--locked", "--author", "Ada", "--force"]
+    )
+    assert res.exit_code == 1
+    assert "web: files changed" in res.output
+    assert (project / "README.md").read_text() == "# proj by Ada"
+
+
+def test_cli_locked_without_lockfile(tmp_path, monkeypatch):
+    _t, project = _setup(tmp_path, monkeypatch)
+    res = CliRunner().invoke(cli, ["add-templates", str(project), "--locked"])
+    assert res.exit_code == 1
+    assert "No bldrx.lock" in res.output
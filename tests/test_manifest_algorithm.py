@@ -0,0 +1,78 @@
+import hashlib
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from bldrx.cli import cli
+from bldrx.engine import Engine
+from bldrx.registry import Registry
+
+
+def _engine(tmp_path, monkeypatch):
+    monkeypatch.setenv("BLDRX_CACHE_DIR", str(tmp_path / "cache"))
+    t = tmp_path / "templates" / "alg"
+    (t / "sub").mkdir(parents=True)
+    (t / "a.txt").write_bytes(b"A")
+    (t / "sub" / "b.bin").write_bytes(b"\x00" * 5000)
+    engine = Engine(
+        templates_root=tmp_path / "templates", user_templates_root=tmp_path / "u"
+    )
+    return engine, t
+
+
+def test_blake2b_manifest_round_trip(tmp_path, monkeypatch):
+    engine, t = _engine(tmp_path, monkeypatch)
+    m = engine.generate_manifest("alg", write=True, algorithm="blake2b", merkle=True)
+    assert m["algorithm"] == "blake2b"
+    assert m["files"]["a.txt"] == hashlib.blake2b(b"A").hexdigest()
+    assert engine.verify_template("alg")["ok"]
+    (t / "a.txt").write_bytes(b"B")
+    assert engine.verify_template("alg")["mismatches"] == ["a.txt"]
+
+
+def test_default_is_sha256_and_old_manifests_still_verify(tmp_path, monkeypatch):
+    engine, t = _engine(tmp_path, monkeypatch)
+    assert engine.generate_manifest("alg")["algorithm"] == "sha256"
+    legacy = {"files": {"a.txt": hashlib.sha256(b"A").hexdigest()}}
+    (t / "bldrx-manifest.json").write_text(json.dumps(legacy))
+    assert engine.verify_template("alg")["ok"]
+
+
+def test_unknown_algorithm_is_rejected(tmp_path, monkeypatch):
+    engine, t = _engine(tmp_path, monkeypatch)
+    with pytest.raises(ValueError):
+        engine.generate_manifest("alg", algorithm="md5")
+    (t / "bldrx-manifest.json").write_text(
+        json.dumps({"algorithm": "md5", "files": {}})
+    )
+    with pytest.raises(ValueError):
+        engine.verify_template("alg")
+
+
+def test_publish_and_cli_accept_algorithm(tmp_path, monkeypatch):
+    engine, t = _engine(tmp_path, monkeypatch)
+    meta = Registry(root=tmp_path / "reg").publish(t, name="alg", algorithm="blake2b")
+    assert meta["manifest"]["algorithm"] == "blake2b"
+    assert meta["manifest"]["files"]["a.txt"] == hashlib.blake2b(b"A").hexdigest()
+
+    runner = CliRunner()
+    out = tmp_path / "m.json"
+    res = runner.invoke(
+        cli,
+        [
+            "manifest",
+            "create",
+            "alg",
+            "--templates-dir",
+            str(tmp_path / "templates"),
+            "--output",
+            str(out),
+            "--algorithm",
+            "blake2b",
+        ],
+    )
+    assert res.exit_code == 0, res.output
+    # a bare directory is hashed with the manifest's algorithm before diffing
+    res = runner.invoke(cli, ["manifest", "diff", str(out), str(t)])
+    assert "No differences" in res.output
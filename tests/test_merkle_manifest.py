@@ -0,0 +1,123 @@
+import json
+
+from click.testing import CliRunner
+
+import bldrx.hashing as hashing
+from bldrx import merkle
+from bldrx.cli import cli
+from bldrx.engine import Engine
+
+
+def _template(tmp_path, name="mk"):
+    t = tmp_path / "templates" / name
+    (t / "docs" / "api").mkdir(parents=True)
+    (t / "src").mkdir()
+    (t / "README.md.j2").write_text("{{ project_name }}")
+    (t / "docs" / "index.md").write_text("index")
+    (t / "docs" / "api" / "ref.md").write_text("ref")
+    (t / "src" / "main.py").write_text("print(1)")
+    engine = Engine(
+        templates_root=tmp_path / "templates", user_templates_root=tmp_path / "u"
+    )
+    return engine, t
+
+
+def test_tree_hashes_change_only_along_the_modified_path():
+    files = {"a": "1", "d/b": "2", "d/e/c": "3", "x/y": "4"}
+    before = merkle.tree_hashes(files)
+    assert set(before) == {"", "d", "d/e", "x"}
+    after = merkle.tree_hashes({**files, "d/e/c": "9"})
+    assert {d for d in before if before[d] != after[d]} == {"", "d", "d/e"}
+    assert merkle.root_hash(dict(reversed(list(files.items())))) == before[""]
+
+
+def test_diff_skips_identical_subtrees():
+    a = {"keep/x": "1", "keep/y": "2", "mod/z": "3", "gone/w": "4", "f": "5"}
+    b = {"keep/x": "1", "keep/y": "2", "mod/z": "9", "new/v": "6", "f": "5"}
+    assert merkle.diff(a, b) == {
+        "added": ["new/v"],
+        "removed": ["gone/w"],
+        "changed": ["mod/z"],
+    }
+    assert merkle.diff(a, dict(a)) == {"added": [], "removed": [], "changed": []}
+    # Merkle manifests take the subtree walk, flat ones a plain comparison (no tree hashing)
+    assert merkle.diff(a, b, merkle.tree_hashes(a), merkle.tree_hashes(b)) == (
+        merkle.diff(a, b)
+    )
+
+
+def test_flat_diff_does_not_hash_directories(monkeypatch):
+    def boom(*args, **kwargs):
+        raise AssertionError("tree hashes computed for a flat diff")
+
+    monkeypatch.setattr(merkle, "tree_hashes", boom)
+    monkeypatch.setattr(merkle, "_Index", boom)
+    res = merkle.diff({"a/b": "1", "c": "2"}, {"a/b": "3", "d": "4"}, {"": "x"}, None)
+    assert res == {"added": ["d"], "removed": ["c"], "changed": ["a/b"]}
+
+
+def test_signed_merkle_manifest_verifies_and_detects_tampering(tmp_path, monkeypatch):
+    monkeypatch.setenv("BLDRX_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("BLDRX_MANIFEST_KEY", "k")
+    engine, t = _template(tmp_path)
+    m = engine.generate_manifest("mk", write=True, sign=True, merkle=True)
+    assert m["root"] == m["tree"][""] and "docs/api" in m["tree"]
+    res = engine.verify_template("mk")
+    assert res["ok"] and res["signature_valid"] and res["tree_valid"]
+
+    # editing a digest in the manifest breaks the tree even though the HMAC only covers the root
+    m["files"]["src/main.py"] = "0" * 64
+    (t / "bldrx-manifest.json").write_text(json.dumps(m))
+    res = engine.verify_template("mk", only=["docs"])
+    assert not res["ok"] and res["tree_valid"] is False
+
+
+def test_only_hashes_selected_subtrees(tmp_path, monkeypatch):
+    monkeypatch.setenv("BLDRX_CACHE_DIR", str(tmp_path / "cache"))
+    engine, t = _template(tmp_path)
+    engine.generate_manifest("mk", write=True, merkle=True)
+    (t / "src" / "main.py").write_text("tampered")
+    hashed = []
+    real = hashing.hash_files
+
+    def spy(paths, *a, **kw):
+        paths = list(paths)
+        hashed.extend(str(p.relative_to(t)).replace("\\", "/") for p in paths)
+        return real(paths, *a, **kw)
+
+    monkeypatch.setattr(hashing, "hash_files", spy)
+    assert engine.verify_template("mk", only=["docs", "README.md"])["ok"]
+    assert sorted(hashed) == ["README.md.j2", "docs/api/ref.md", "docs/index.md"]
+    assert engine.verify_template("mk", only=["src"])["mismatches"] == ["src/main.py"]
+
+    # apply with --only verifies just what it writes
+    dest = tmp_path / "out"
+    list(
+        engine.apply_template(
+            "mk",
+            dest,
+            {"project_name": "P"},
+            verify=True,
+            only_files=["docs/index.md", "README.md"],
+        )
+    )
+    assert (dest / "docs" / "index.md").exists() and (dest / "README.md").exists()
+
+
+def test_cli_manifest_diff(tmp_path):
+    engine, t = _template(tmp_path)
+    engine.generate_manifest("mk", out_path=tmp_path / "old.json", write=True)
+    (t / "docs" / "index.md").write_text("changed")
+    (t / "src" / "extra.py").write_text("")
+    runner = CliRunner()
+    res = runner.invoke(
+        cli, ["manifest", "diff", str(tmp_path / "old.json"), str(t), "--json"]
+    )
+    assert res.exit_code == 0, res.output
+    assert json.loads(res.output) == {
+        "added": ["src/extra.py"],
+        "removed": [],
+        "changed": ["docs/index.md"],
+    }
+    res = runner.invoke(cli, ["manifest", "diff", str(t), str(t)])
+    assert "No differences" in res.output
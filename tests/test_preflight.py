@@ -0,0 +1,183 @@
+import os
+
+import pytest
+from click.testing import CliRunner
+
+from bldrx.cli import cli
+from bldrx.engine import Engine, PreflightError
+
+
+def _engine(tmp_path):
+    t = tmp_path / "templates" / "pf"
+    (t / "docs").mkdir(parents=True)
+    (t / "a.txt.j2").write_text("{{ project_name }}")
+    (t / "docs" / "b.md.j2").write_text("{{ owner }} {{ maybe | default('x') }}")
+    (t / "raw.bin").write_bytes(b"\x00\x01")
+    return Engine(
+        templates_root=tmp_path / "templates", user_templates_root=tmp_path / "user"
+    )
+
+
+def test_missing_variables_reported_without_rendering(tmp_path):
+    engine = _engine(tmp_path)
+    report = engine.preflight(["pf"], tmp_path / "out", {"project_name": "X"})
+    assert not report["ok"]
+    assert report["checked"] == 3
+    assert [(p["check"], p["path"]) for p in report["problems"]] == [
+        ("variables", str(tmp_path / "out" / "docs" / "b.md"))
+    ]
+    assert "owner" in report["problems"][0]["message"]
+    assert "maybe" not in report["problems"][0]["message"]
+
+
+def test_apply_rejected_before_any_write(tmp_path):
+    engine = _engine(tmp_path)
+    dest = tmp_path / "out"
+    with pytest.raises(PreflightError) as ei:
+        list(
+            engine.apply_template(
+                "pf", dest, {"project_name": "X"}, atomic=True, preflight=True
+            )
+        )
+    assert "owner" in str(ei.value)
+    assert not (dest / "a.txt").exists()
+    assert not (dest / "raw.bin").exists()
+
+
+def test_skipped_files_are_not_checked(tmp_path):
+    engine = _engine(tmp_path)
+    dest = tmp_path / "out"
+    (dest / "docs").mkdir(parents=True)
+    (dest / "docs" / "b.md").write_text("keep")
+    # without --force the existing file is skipped, so its variables do not matter
+    report = engine.preflight(["pf"], dest, {"project_name": "X"})
+    assert report["ok"] and report["checked"] == 2
+
+
+def test_merge_into_binary_file_is_rejected(tmp_path):
+    engine = _engine(tmp_path)
+    dest = tmp_path / "out"
+    dest.mkdir()
+    (dest / "a.txt").write_bytes(b"\xff\xfe\x00")
+    report = engine.preflight(
+        ["pf"], dest, {"project_name": "X", "owner": "o"}, merge="append"
+    )
+    assert [p["check"] for p in report["problems"]] == ["merge"]
+
+
+def test_file_in_place_of_directory_is_reported(tmp_path):
+    engine = _engine(tmp_path)
+    dest = tmp_path / "out"
+    dest.mkdir()
+    (dest / "docs").write_text("not a directory")
+    report = engine.preflight(["pf"], dest, {"project_name": "X", "owner": "o"})
+    assert [(p["check"], p["path"]) for p in report["problems"]] == [
+        ("writable", str(dest / "docs" / "b.md"))
+    ]
+
+
+@pytest.mark.skipif(
+    os.name == "nt" or getattr(os, "geteuid", lambda: 1)() == 0,
+    reason="needs POSIX permissions enforced for the current user",
+)
+def test_unwritable_directory_is_reported(tmp_path):
+    engine = _engine(tmp_path)
+    dest = tmp_path / "out"
+    (dest / "docs").mkdir(parents=True)
+    (dest / "docs").chmod(0o555)
+    try:
+        report = engine.preflight(["pf"], dest, {"project_name": "X", "owner": "o"})
+    finally:
+        (dest / "docs").chmod(0o755)
+    assert [(p["check"], p["path"]) for p in report["problems"]] == [
+        ("writable", str(dest / "docs" / "b.md"))
+    ]
+
+
+def test_cli_runs_preflight_by_default(tmp_path):
+    _engine(tmp_path)
+    dest = tmp_path / "proj"
+    dest.mkdir()
+    runner = CliRunner()
+    res = runner.invoke(
+        cli,
+        [
+            "add-templates",
+            str(dest),
+            "--templates",
+            "pf",
+            "--templates-dir",
+            str(tmp_path / "templates"),
+        ],
+    )
+    assert res.exit_code == 1
+    assert "Pre-flight check failed" in res.output
+    assert not (dest / "a.txt").exists()
+
+
+def test_variables_used_only_under_a_condition_are_warnings(tmp_path):
+    t = tmp_path / "templates" / "cond"
+    t.mkdir(parents=True)
+    (t / "LICENSE.j2").write_text(
+        "{% if license == 'MIT' %}{{ holder }}{% endif %}"
+        "{{ year if show_year else '' }}{% for a in authors %}{{ email }}{% endfor %}"
+    )
+    (t / "README.md.j2").write_text("{{ license }} {{ flag and extra }}")
+    engine = Engine(
+        templates_root=tmp_path / "templates", user_templates_root=tmp_path / "user"
+    )
+    dest = tmp_path / "out"
+    meta = {"license": "Apache-2.0", "authors": [], "show_year": False, "flag": False}
+
+    report = engine.preflight(["cond"], dest, meta)
+    assert report["ok"] and report["problems"] == []
+    messages = sorted(w["message"] for w in report["warnings"])
+    assert "email, holder" in messages[0] and "extra" in messages[1]
+
+    # the branch never runs, so the apply succeeds with preflight on
+    res = list(engine.apply_template("cond", dest, meta, atomic=True, preflight=True))
+    assert len(res) == 2 and (dest / "LICENSE").read_text() == ""
+    # a condition that reads a missing name is still an error
+    report = engine.preflight(["cond"], dest, {"authors": []}, force=True)
+    assert [p["check"] for p in report["problems"]] == ["variables", "variables"]
+
+
+def test_guarded_and_unguarded_reads_of_one_name(tmp_path):
+    t = tmp_path / "templates" / "mixed"
+    t.mkdir(parents=True)
+    (t / "a.txt.j2").write_text("{{ owner | default('') }} {{ owner }}")
+    (t / "b.txt.j2").write_text(
+        "{% if tag is defined %}{{ tag }}{% endif %}{{ note if note is defined }}"
+    )
+    engine = Engine(
+        templates_root=tmp_path / "templates", user_templates_root=tmp_path / "user"
+    )
+    dest = tmp_path / "out"
+
+    report = engine.preflight(["mixed"], dest, {})
+    # the bare `{{ owner }}` fails under StrictUndefined, so the default() guard elsewhere does not help
+    assert [(p["check"], p["path"]) for p in report["problems"]] == [
+        ("variables", str(dest / "a.txt"))
+    ]
+    assert "owner" in report["problems"][0]["message"]
+    assert report["warnings"] == []
+    with pytest.raises(PreflightError):
+        list(engine.apply_template("mixed", dest, {}, atomic=True, preflight=True))
+    assert not dest.exists() or not any(dest.iterdir())
+
+
+def test_merge_target_is_validated_in_chunks(tmp_path):
+    from bldrx import engine as engine_mod
+
+    engine = _engine(tmp_path)
+    dest = tmp_path / "out"
+    dest.mkdir()
+    size = engine_mod._STREAM_CHUNK_SIZE
+    # a multi-byte character straddling the chunk boundary is valid
+    (dest / "a.txt").write_bytes(b"x" * (size - 1) + "é".encode("utf-8") * 3)
+    meta = {"project_name": "X", "owner": "o"}
+    assert engine.preflight(["pf"], dest, meta, merge="append")["ok"]
+    # a character cut off at end of file is not
+    (dest / "a.txt").write_bytes(b"x" * size + "é".encode("utf-8")[:1])
+    report = engine.preflight(["pf"], dest, meta, merge="append")
+    assert [p["check"] for p in report["problems"]] == ["merge"]
@@ -0,0 +1,85 @@
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from bldrx.cli import cli
+from bldrx.registry import Registry
+
+
+def _template(tmp_path, name="tmpl"):
+    t = tmp_path / name
+    t.mkdir()
+    (t / "a.txt").write_text("a")
+    return t
+
+
+def _no_entry_reads(monkeypatch, reg):
+    """Fail if anything but the index is parsed."""
+    real = json.loads
+    index = reg.index_path.read_text(encoding="utf-8")
+
+    def guarded(s, *a, **kw):
+        assert s == index, "query parsed an entry file"
+        return real(s, *a, **kw)
+
+    monkeypatch.setattr(json, "loads", guarded)
+
+
+def test_publish_and_remove_keep_the_index_current(tmp_path, monkeypatch):
+    reg = Registry(root=tmp_path / "reg")
+    t = _template(tmp_path)
+    reg.publish(t, name="web", version="1.0.0", description="Web", tags=["ci"])
+    reg.publish(t, name="web", version="1.1.0", tags=["ci", "docs"])
+    reg.publish(t, name="cli", version="0.1.0")
+
+    index = json.loads(reg.index_path.read_text())["names"]
+    assert sorted(index) == ["cli", "web"] and sorted(index["web"]) == [
+        "1.0.0",
+        "1.1.0",
+    ]
+    assert index["web"]["1.0.0"]["file"] == "web-1.0.0.json"
+    assert "manifest" not in index["web"]["1.0.0"]
+
+    _no_entry_reads(monkeypatch, reg)
+    hits = reg.search("docs")
+    assert [(h["name"], h["version"]) for h in hits] == [("web", "1.1.0")]
+    assert hits[0]["path"] == str(tmp_path / "reg" / "web-1.1.0.json")
+    assert len(reg.list_entries()) == 3
+    monkeypatch.undo()
+
+    # get opens only the matching entry file and returns the full metadata
+    full = reg.get("web", "1.0.0")
+    assert full["description"] == "Web" and "a.txt" in full["manifest"]["files"]
+    removed = reg.remove("web")
+    assert [e["version"] for e in removed] == ["1.0.0", "1.1.0"]
+    assert [e["name"] for e in reg.list_entries()] == ["cli"]
+    assert not (tmp_path / "reg" / "web-1.0.0.json").exists()
+
+
+def test_missing_index_is_built_from_existing_entries(tmp_path):
+    reg = Registry(root=tmp_path / "reg")
+    reg.publish(_template(tmp_path), name="old", version="1.0.0")
+    reg.index_path.unlink()
+    assert [e["name"] for e in Registry(root=tmp_path / "reg").search("")] == ["old"]
+    assert reg.index_path.exists()
+
+
+def test_reindex_repairs_drift(tmp_path, monkeypatch):
+    monkeypatch.setenv("BLDRX_REGISTRY_DIR", str(tmp_path / "reg"))
+    reg = Registry()
+    reg.publish(_template(tmp_path), name="a", version="1.0.0")
+    # entries copied in or deleted by hand
+    entry = json.loads((tmp_path / "reg" / "a-1.0.0.json").read_text())
+    (tmp_path / "reg" / "b-2.0.0.json").write_text(
+        json.dumps(dict(entry, name="b", version="2.0.0"))
+    )
+    (tmp_path / "reg" / "a-1.0.0.json").unlink()
+    with pytest.raises(KeyError, match="reindex"):
+        reg.get("a")
+    assert reg.search("b") == []
+
+    res = CliRunner().invoke(cli, ["catalog", "reindex"])
+    assert res.exit_code == 0 and "Indexed 1 catalog entries." in res.output
+    assert [e["name"] for e in reg.list_entries()] == ["b"]
+    assert reg.get("b")["version"] == "2.0.0"
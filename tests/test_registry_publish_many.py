@@ -0,0 +1,146 @@
+import json
+import os
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from bldrx.cli import cli
+from bldrx.registry import Registry, SqliteRegistry
+
+
+def _templates(tmp_path, names=("api", "cli", "web")):
+    root = tmp_path / "templates"
+    for name in names:
+        (root / name).mkdir(parents=True)
+        (root / name / "README.md").write_text(f"# {name}")
+    return root
+
+
+@pytest.mark.parametrize("backend", [Registry, SqliteRegistry])
+def test_publish_many_skips_unchanged(tmp_path, backend):
+    root = _templates(tmp_path)
+    (root / "web" / "bldrx-manifest.json").write_text(
+        json.dumps({"version": "2.1.0", "description": "Web kit", "tags": ["web"]})
+    )
+    reg = backend(tmp_path / "reg")
+    sources = sorted(root.iterdir())
+
+    first = reg.publish_many(sources, version="1.0.0")
+    assert [(r["name"], r["version"], r["status"]) for r in first] == [
+        ("api", "1.0.0", "published"),
+        ("cli", "1.0.0", "published"),
+        ("web", "2.1.0", "published"),
+    ]
+    assert reg.get("web")["tags"] == ["web"]
+
+    (root / "cli" / "README.md").write_text("# cli, changed")
+    second = reg.publish_many(sources, version="1.1.0")
+    assert [(r["name"], r["version"], r["status"]) for r in second] == [
+        ("api", "1.0.0", "unchanged"),
+        ("cli", "1.1.0", "published"),
+        ("web", "2.1.0", "unchanged"),
+    ]
+    assert reg.versions("api") == ["1.0.0"]
+    assert reg.versions("cli") == ["1.0.0", "1.1.0"]
+
+
+@pytest.mark.parametrize("backend", [Registry, SqliteRegistry])
+def test_conflict_writes_nothing(tmp_path, backend):
+    root = _templates(tmp_path)
+    reg = backend(tmp_path / "reg")
+    reg.publish(root / "api", version="1.0.0")
+    (root / "api" / "README.md").write_text("# api, changed")
+
+    with pytest.raises(FileExistsError):
+        reg.publish_many(sorted(root.iterdir()), version="1.0.0")
+    assert [e["name"] for e in reg.list_entries()] == ["api"]
+    with pytest.raises(ValueError, match="more than once"):
+        reg.publish_many([root / "cli", {"src": root / "web", "name": "cli"}])
+    with pytest.raises(FileNotFoundError):
+        reg.publish_many([root / "cli", root / "missing"])
+    assert [e["name"] for e in reg.list_entries()] == ["api"]
+
+    results = reg.publish_many(sorted(root.iterdir()), version="1.0.0", force=True)
+    assert {r["status"] for r in results} == {"published"}
+    assert (
+        reg.get("api")["manifest"]["files"]
+        == reg.get("api", "1.0.0")["manifest"]["files"]
+    )
+
+
+def test_json_index_written_once(tmp_path, monkeypatch):
+    root = _templates(tmp_path)
+    reg = Registry(tmp_path / "reg")
+    reg.list_entries()  # builds the (empty) index
+    writes = []
+    real = reg._write_index
+    monkeypatch.setattr(reg, "_write_index", lambda n: writes.append(1) or real(n))
+
+    reg.publish_many(sorted(root.iterdir()))
+    assert writes == [1]
+    assert sorted(json.loads(reg.index_path.read_text())["names"]) == [
+        "api",
+        "cli",
+        "web",
+    ]
+    assert not list((tmp_path / "reg").glob(".*.tmp"))
+
+
+def test_cli_publish_all(tmp_path, monkeypatch):
+    monkeypatch.setenv("BLDRX_REGISTRY_DIR", str(tmp_path / "reg"))
+    monkeypatch.delenv("BLDRX_REGISTRY_BACKEND", raising=False)
+    root = _templates(tmp_path)
+    (root / ".git").mkdir()
+    runner = CliRunner()
+
+    res = runner.invoke(
+        cli, ["catalog", "publish-all", str(root), "--version", "1.0.0"]
+    )
+    assert res.exit_code == 0, res.output
+    assert "published  web 1.0.0" in res.output
+    assert "Published 3 of 3 templates (0 unchanged)." in res.output
+
+    res = runner.invoke(cli, ["catalog", "publish-all", str(root), "--json"])
+    assert res.exit_code == 0, res.output
+    assert {r["status"] for r in json.loads(res.output)} == {"unchanged"}
+
+    (root / "api" / "README.md").write_text("# api, changed")
+    res = runner.invoke(
+        cli, ["catalog", "publish-all", str(root), "--version", "1.0.0"]
+    )
+    assert res.exit_code == 1 and "already exists" in res.output
+
+
+def test_interrupted_commit_is_rolled_forward(tmp_path, monkeypatch):
+    root = _templates(tmp_path)
+    reg = Registry(tmp_path / "reg")
+    reg.publish(root / "api", version="0.1.0")
+    renamed = []
+    real = os.replace
+
+    def crash(src, dst):
+        # die after the first entry file of the batch was renamed into place
+        if not Path(dst).name.startswith("."):
+            if renamed:
+                raise KeyboardInterrupt
+            renamed.append(dst)
+        return real(src, dst)
+
+    monkeypatch.setattr(os, "replace", crash)
+    with pytest.raises(KeyboardInterrupt):
+        reg.publish_many(sorted(root.iterdir()), version="1.0.0")
+    monkeypatch.undo()
+    assert (tmp_path / "reg" / ".publish-pending.json").exists()
+
+    assert (tmp_path / "reg" / "cli-1.0.0.json").exists()
+    assert not (tmp_path / "reg" / "web-1.0.0.json").exists()
+    # the next read completes the batch and rebuilds the index
+    fresh = Registry(tmp_path / "reg")
+    assert [(e["name"], e["version"]) for e in fresh.list_entries()] == [
+        ("api", "0.1.0"),
+        ("cli", "1.0.0"),
+        ("web", "1.0.0"),
+    ]
+    assert not (tmp_path / "reg" / ".publish-pending.json").exists()
+    assert not list((tmp_path / "reg").glob(".*.tmp"))
@@ -0,0 +1,97 @@
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from bldrx.cli import cli
+from bldrx.registry import Registry, SqliteRegistry
+
+
+def _publish_many(reg, tmp_path, n=12):
+    t = tmp_path / "tmpl"
+    t.mkdir(exist_ok=True)
+    (t / "a.txt").write_text("a")
+    for i in range(n):
+        reg.publish(t, name=f"web{i:02d}", version="1.0.0", description="web kit")
+    reg.publish(t, name="cli", version="1.0.0", description="terminal")
+
+
+@pytest.mark.parametrize("backend", [Registry, SqliteRegistry])
+def test_pages_and_projections(tmp_path, backend):
+    reg = backend(tmp_path / "reg")
+    _publish_many(reg, tmp_path)
+
+    page = reg.search("web", limit=5, offset=10, fields=["name", "version"])
+    assert page == [
+        {"name": "web10", "version": "1.0.0"},
+        {"name": "web11", "version": "1.0.0"},
+    ]
+    assert len(reg.search("web", limit=5)) == 5
+    assert reg.search("web", limit=0) == []
+    # keys outside the index come from the entry itself
+    full = reg.search("terminal", fields=["name", "manifest"])
+    assert full[0]["name"] == "cli" and "a.txt" in full[0]["manifest"]["files"]
+    with pytest.raises(ValueError):
+        reg.search("web", offset=-1)
+
+
+def test_iter_search_is_lazy(tmp_path, monkeypatch):
+    reg = Registry(tmp_path / "reg")
+    _publish_many(reg, tmp_path)
+    loads = []
+    real = reg._load_record
+    monkeypatch.setattr(reg, "_load_record", lambda rec: loads.append(1) or real(rec))
+
+    results = reg.iter_search("web", fields=["name", "source"])
+    assert loads == []
+    first = next(results)
+    assert first["name"] == "web00" and first["source"] and loads == [1]
+    results.close()
+
+
+def test_cli_limit_offset_jsonl(tmp_path, monkeypatch):
+    monkeypatch.setenv("BLDRX_REGISTRY_DIR", str(tmp_path / "reg"))
+    _publish_many(Registry(), tmp_path, n=4)
+    runner = CliRunner()
+
+    res = runner.invoke(
+        cli, ["catalog", "search", "web", "--limit", "2", "--offset", "1", "--jsonl"]
+    )
+    assert res.exit_code == 0, res.output
+    lines = [json.loads(line) for line in res.output.splitlines()]
+    assert lines == [
+        {"name": "web01", "version": "1.0.0", "description": "web kit"},
+        {"name": "web02", "version": "1.0.0", "description": "web kit"},
+    ]
+
+    res = runner.invoke(cli, ["catalog", "search", "--fields", "name,tags"])
+    assert json.loads(res.output)[0] == {"name": "cli", "tags": []}
+    res = runner.invoke(cli, ["catalog", "search", "--limit", "-1"])
+    assert res.exit_code != 0
+
+
+@pytest.mark.parametrize("backend", [Registry, SqliteRegistry])
+def test_empty_query_pages_in_semver_order(tmp_path, backend):
+    t = tmp_path / "tmpl"
+    t.mkdir()
+    (t / "a.txt").write_text("a")
+    reg = backend(tmp_path / "reg")
+    versions = ["0.10.0", "0.9.0", "1.0.0", "1.0.0-rc.2", "1.0.0-rc.10", "nightly"]
+    for v in versions:
+        reg.publish(t, name="web", version=v, description="web kit")
+    reg.publish(t, name="api", version="2.0.0")
+
+    pages = [
+        [e["version"] for e in reg.search("", limit=3, offset=o, fields=["version"])]
+        for o in (0, 3, 6)
+    ]
+    assert pages == [
+        ["2.0.0", "nightly", "0.9.0"],
+        ["0.10.0", "1.0.0-rc.2", "1.0.0-rc.10"],
+        ["1.0.0"],
+    ]
+    # ties in relevance are broken the same way
+    assert [e["version"] for e in reg.search("web", limit=2, offset=1)] == [
+        "0.9.0",
+        "0.10.0",
+    ]
@@ -0,0 +1,112 @@
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from bldrx.cli import cli
+from bldrx.registry import Registry, SqliteRegistry
+from bldrx.semver import resolve, sort_key, split_spec
+
+VERSIONS = ["0.9.0", "0.10.0", "1.0.0", "1.2.0", "1.2.5", "1.10.0"]
+VERSIONS += ["2.0.0-rc.1", "2.0.0", "2.1.3"]
+
+
+@pytest.mark.parametrize(
+    "spec,expected",
+    [
+        (None, "2.1.3"),
+        ("latest", "2.1.3"),
+        ("1.2.0", "1.2.0"),
+        ("^1.2", "1.10.0"),
+        ("^0.9", "0.9.0"),
+        ("~1.2", "1.2.5"),
+        ("~=2.0", "2.1.3"),
+        ("~=1.2.0", "1.2.5"),
+        ("1.x", "1.10.0"),
+        ("1.2.*", "1.2.5"),
+        (">=1.2, <1.10", "1.2.5"),
+        ("2.0.0-rc.1", "2.0.0-rc.1"),
+        (">=3", None),
+    ],
+)
+def test_resolve(spec, expected):
+    assert resolve(VERSIONS, spec) == expected
+
+
+def test_ordering_and_name_specs():
+    assert sorted(
+        ["0.10.0", "0.9.0", "1.0.0-rc.2", "1.0.0-rc.10", "1.0.0"], key=sort_key
+    ) == [
+        "0.9.0",
+        "0.10.0",
+        "1.0.0-rc.2",
+        "1.0.0-rc.10",
+        "1.0.0",
+    ]
+    # prereleases only match specs that name one; non-semver labels match exactly
+    assert resolve(["1.0.0", "1.1.0-beta"], "^1") == "1.0.0"
+    assert resolve(["nightly", "1.0.0"], "nightly") == "nightly"
+    with pytest.raises(ValueError):
+        resolve(VERSIONS, ">=banana")
+    assert split_spec("web@^1") == ("web", "^1")
+    assert split_spec("@org/web") == ("@org/web", None)
+
+
+@pytest.mark.parametrize("backend", [Registry, SqliteRegistry])
+def test_get_resolves_semver_ranges(tmp_path, backend):
+    t = tmp_path / "tmpl"
+    t.mkdir()
+    (t / "a.txt").write_text("a")
+    reg = backend(tmp_path / "reg")
+    for v in ["0.9.0", "0.10.0", "1.2.0", "1.4.1", "2.0.0-rc.1"]:
+        reg.publish(t, name="web", version=v, description=v)
+    reg.publish(t, name="other", version="5.0.0")
+
+    assert reg.get("web")["version"] == "1.4.1"
+    assert reg.get("web", "^0.9")["version"] == "0.9.0"
+    assert reg.get("web", "~=0.9")["version"] == "0.10.0"
+    assert reg.get("web", "^2.0.0-rc")["version"] == "2.0.0-rc.1"
+    assert reg.versions("web") == ["0.9.0", "0.10.0", "1.2.0", "1.4.1", "2.0.0-rc.1"]
+    with pytest.raises(KeyError, match="available: 0.9.0, 0.10.0"):
+        reg.get("web", "^3")
+    with pytest.raises(KeyError, match="not found"):
+        reg.get("missing")
+
+
+def test_get_reads_only_the_chosen_entry(tmp_path, monkeypatch):
+    t = tmp_path / "tmpl"
+    t.mkdir()
+    (t / "a.txt").write_text("a")
+    reg = Registry(tmp_path / "reg")
+    for v in ["1.0.0", "1.1.0"]:
+        reg.publish(t, name="web", version=v)
+    reg.publish(t, name="other", version="1.0.0")
+    reads = []
+    real = json.loads
+
+    def spy(s, *a, **kw):
+        out = real(s, *a, **kw)
+        reads.append("index" if "names" in out else out["version"])
+        return out
+
+    monkeypatch.setattr(json, "loads", spy)
+    assert reg.get("web", "^1")["version"] == "1.1.0"
+    assert reads == ["index", "1.1.0"]
+
+
+def test_cli_info_accepts_name_at_spec(tmp_path, monkeypatch):
+    monkeypatch.setenv("BLDRX_REGISTRY_DIR", str(tmp_path / "reg"))
+    t = tmp_path / "tmpl"
+    t.mkdir()
+    (t / "a.txt").write_text("a")
+    reg = Registry()
+    for v in ["1.0.0", "1.3.0", "2.0.0"]:
+        reg.publish(t, name="web", version=v)
+    runner = CliRunner()
+    res = runner.invoke(cli, ["catalog", "info", "web@^1"])
+    assert res.exit_code == 0, res.output
+    assert json.loads(res.output)["version"] == "1.3.0"
+    res = runner.invoke(cli, ["catalog", "info", "web", "--version", "~=1.0"])
+    assert json.loads(res.output)["version"] == "1.3.0"
+    res = runner.invoke(cli, ["catalog", "info", "web@^3"])
+    assert res.exit_code == 1 and "No version of catalog entry 'web'" in res.output
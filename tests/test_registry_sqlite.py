@@ -0,0 +1,104 @@
+import sqlite3
+import threading
+
+import pytest
+from click.testing import CliRunner
+
+from bldrx.cli import cli
+from bldrx.registry import Registry, SqliteRegistry, open_registry
+
+
+def _template(tmp_path, name="tmpl"):
+    t = tmp_path / name
+    t.mkdir(exist_ok=True)
+    (t / "a.txt").write_text("a")
+    return t
+
+
+def test_publish_get_remove_and_wal(tmp_path):
+    reg = SqliteRegistry(tmp_path / "reg")
+    t = _template(tmp_path)
+    meta = reg.publish(t, name="web", version="1.0.0", tags=["ci"])
+    with pytest.raises(FileExistsError):
+        reg.publish(t, name="web", version="1.0.0")
+    reg.publish(t, name="web", version="1.0.0", description="v2", force=True)
+    assert reg.get("web", "1.0.0")["description"] == "v2"
+    assert reg.get("web")["manifest"] == meta["manifest"]
+    with pytest.raises(KeyError):
+        reg.get("web", "9.9.9")
+
+    db = sqlite3.connect(str(tmp_path / "reg" / "registry.db"))
+    assert db.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+    db.close()
+
+    assert [e["version"] for e in reg.remove("web")] == ["1.0.0"]
+    assert reg.list_entries() == []
+    with pytest.raises(KeyError):
+        reg.remove("web")
+
+
+def test_search_is_ranked_full_text(tmp_path):
+    reg = SqliteRegistry(tmp_path / "reg")
+    t = _template(tmp_path)
+    reg.publish(t, name="docs", version="1.0.0", description="docs for web apps")
+    reg.publish(t, name="site", version="1.0.0", tags=["website"])
+    reg.publish(t, name="webapp", version="1.0.0", description="a starter")
+    reg.publish(t, name="cli", version="1.0.0", description="command line")
+
+    hits = [e["name"] for e in reg.search("web")]
+    # name match first, then tag, then description; 'cli' does not match
+    assert hits == ["webapp", "site", "docs"]
+    assert "manifest" not in reg.search("web")[0]
+    assert [e["name"] for e in reg.search("command lin")] == ["cli"]
+    assert len(reg.search("")) == 4
+    assert reg.rebuild_index() == 4
+    assert [e["name"] for e in reg.search("starter")] == ["webapp"]
+
+
+def test_concurrent_writers(tmp_path):
+    root = tmp_path / "reg"
+    SqliteRegistry(root)
+    t = _template(tmp_path)
+    errors = []
+
+    def publish(i):
+        try:
+            SqliteRegistry(root).publish(t, name=f"t{i}", version="1.0.0")
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+
+    threads = [threading.Thread(target=publish, args=(i,)) for i in range(8)]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+    assert not errors
+    assert len(SqliteRegistry(root).list_entries()) == 8
+
+
+def test_migrate_from_json_and_backend_selection(tmp_path, monkeypatch):
+    monkeypatch.setenv("BLDRX_REGISTRY_DIR", str(tmp_path / "reg"))
+    monkeypatch.delenv("BLDRX_REGISTRY_BACKEND", raising=False)
+    t = _template(tmp_path)
+    json_reg = Registry()
+    json_reg.publish(t, name="a", version="1.0.0", description="first")
+    json_reg.publish(t, name="b", version="2.0.0")
+    assert type(open_registry()) is Registry
+
+    runner = CliRunner()
+    res = runner.invoke(cli, ["catalog", "migrate"])
+    assert res.exit_code == 0, res.output
+    assert "Migrated 2 of 2 catalog entries" in res.output
+    res = runner.invoke(cli, ["catalog", "migrate"])
+    assert "Migrated 0 of 2" in res.output and "(2 already present)" in res.output
+
+    reg = open_registry()
+    assert isinstance(reg, SqliteRegistry)
+    assert reg.get("a")["description"] == "first"
+    res = runner.invoke(cli, ["catalog", "info", "b"])
+    assert res.exit_code == 0 and "2.0.0" in res.output
+
+    monkeypatch.setenv("BLDRX_REGISTRY_BACKEND", "json")
+    assert type(open_registry()) is Registry
+    with pytest.raises(ValueError):
+        open_registry(backend="postgres")
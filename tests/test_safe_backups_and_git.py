@@ -1,5 +1,6 @@
 import subprocess
 
+from bldrx.backups import BackupStore
 from bldrx.engine import Engine
 
 
@@ -35,13 +36,14 @@ def test_backup_created_before_apply(tmp_path):
     # assert: backups dir exists with previous content
     backups_root = dest / ".bldrx" / "backups"
     assert backups_root.exists(), "Backups root should exist"
-    # there should be a backup directory with the original file content preserved
-    found = False
-    for candidate in backups_root.rglob("existing.txt"):
-        if candidate.read_text() == "OLD CONTENT":
-            found = True
-            break
-    assert found, "Original file content should be present in backups"
+    # the backup run should index the original file, stored as a content-addressed blob
+    store = BackupStore(dest)
+    runs = store.list_runs()
+    assert len(runs) == 1
+    digest = runs[0]["files"]["existing.txt"]["hash"]
+    assert (
+        store.blobs.path_for(digest).read_text() == "OLD CONTENT"
+    ), "Original file content should be present in backups"
 
 
 def test_git_commit_created_on_apply(tmp_path):
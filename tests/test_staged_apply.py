@@ -0,0 +1,112 @@
+import os
+
+import pytest
+
+from bldrx.engine import Engine
+from bldrx.journal import Journal, recover
+
+
+def _setup(tmp_path, bad=False):
+    templates = tmp_path / "templates"
+    t = templates / "stg"
+    t.mkdir(parents=True)
+    (t / "a.txt.j2").write_text("A {{ project_name }}")
+    (t / "b.txt").write_text("B raw")
+    (t / "docs" / "empty").mkdir(parents=True)
+    # rendered after a.txt/b.txt; references an undefined variable when `bad`
+    (t / "z.txt.j2").write_text("Z {{ missing }}" if bad else "Z {{ project_name }}")
+    dest = tmp_path / "project"
+    dest.mkdir()
+    (dest / "a.txt").write_text("OLD A")
+    engine = Engine(
+        templates_root=templates, user_templates_root=tmp_path / "user_templates"
+    )
+    return engine, dest
+
+
+def test_staged_apply_writes_all_files(tmp_path):
+    engine, dest = _setup(tmp_path)
+    res = list(
+        engine.apply_template(
+            "stg", dest, {"project_name": "X"}, force=True, staged=True
+        )
+    )
+    assert sorted(status for _, status in res) == ["copied", "rendered", "rendered"]
+    assert (dest / "a.txt").read_text() == "A X"
+    assert (dest / "z.txt").read_text() == "Z X"
+    assert (dest / "docs" / "empty").is_dir()
+    # staging tree is removed after commit
+    assert not any((dest / ".bldrx" / "staging").iterdir())
+
+
+def test_staged_apply_failed_render_leaves_dest_untouched(tmp_path, monkeypatch):
+    engine, dest = _setup(tmp_path, bad=True)
+    replaced = []
+    orig_replace = os.replace
+
+    def spy_replace(src, dst):
+        replaced.append(dst)
+        return orig_replace(src, dst)
+
+    monkeypatch.setattr("os.replace", spy_replace)
+    with pytest.raises(Exception):
+        list(
+            engine.apply_template(
+                "stg", dest, {"project_name": "X"}, force=True, staged=True
+            )
+        )
+    # nothing was renamed into place, so there was nothing to roll back
+    assert replaced == []
+    assert (dest / "a.txt").read_text() == "OLD A"
+    assert not (dest / "b.txt").exists()
+    # template directories are only created by the commit phase
+    assert not (dest / "docs").exists()
+
+
+def test_staged_commit_failure_rolls_back_by_rename(tmp_path, monkeypatch):
+    engine, dest = _setup(tmp_path)
+    orig_replace = os.replace
+
+    def fake_replace(src, dst):
+        if str(dst).endswith("z.txt"):
+            raise OSError("simulated replace failure")
+        return orig_replace(src, dst)
+
+    monkeypatch.setattr("os.replace", fake_replace)
+    with pytest.raises(RuntimeError):
+        list(
+            engine.apply_template(
+                "stg", dest, {"project_name": "X"}, force=True, staged=True
+            )
+        )
+    assert (dest / "a.txt").read_text() == "OLD A"
+    assert not (dest / "b.txt").exists()
+
+
+def test_prepared_staged_journal_is_replayed(tmp_path, monkeypatch):
+    engine, dest = _setup(tmp_path)
+
+    def crash(*args, **kwargs):
+        raise KeyboardInterrupt
+
+    # simulate the process dying right after the journal was prepared, before any rename
+    monkeypatch.setattr("os.replace", crash)
+    with pytest.raises(KeyboardInterrupt):
+        list(
+            engine.apply_template(
+                "stg",
+                dest,
+                {"project_name": "X"},
+                force=True,
+                staged=True,
+                journal=True,
+            )
+        )
+    monkeypatch.undo()
+    pending = Journal.list(dest)
+    assert pending and pending[0].prepared and not pending[0].committed
+
+    results = recover(dest)
+    assert results[0]["action"] == "replayed"
+    assert (dest / "a.txt").read_text() == "A X"
+    assert (dest / "z.txt").read_text() == "Z X"
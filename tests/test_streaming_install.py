@@ -0,0 +1,119 @@
+import hashlib
+import io
+import json
+import shutil
+import tarfile
+import zipfile
+
+import pytest
+
+from bldrx.engine import Engine
+
+
+def _engine(tmp_path):
+    return Engine(
+        templates_root=tmp_path / "templates",
+        user_templates_root=tmp_path / "user_templates",
+    )
+
+
+def _tar(tmp_path, members, name="rem.tar.gz"):
+    """members: list of (arcname, bytes) written in order."""
+    path = tmp_path / name
+    with tarfile.open(path, "w:gz") as tf:
+        for arcname, data in members:
+            info = tarfile.TarInfo(arcname)
+            info.size = len(data)
+            tf.addfile(info, io.BytesIO(data))
+    return path
+
+
+def _manifest(files, algorithm="sha256"):
+    return json.dumps(
+        {
+            "algorithm": algorithm,
+            "files": {
+                rel: hashlib.new(algorithm, data).hexdigest()
+                for rel, data in files.items()
+            },
+        }
+    ).encode()
+
+
+def _no_copies(monkeypatch):
+    def boom(*a, **kw):
+        raise AssertionError("install must not copy the tree a second time")
+
+    monkeypatch.setattr(shutil, "copytree", boom)
+    monkeypatch.setattr(shutil, "copy2", boom)
+
+
+def test_tar_members_stream_into_place(tmp_path, monkeypatch):
+    files = {"a.txt": b"A", "sub/b.txt": b"B" * 3000}
+    # manifest last, with a non-default algorithm: early members are re-read, not re-written
+    tar = _tar(
+        tmp_path,
+        [("rem/" + k, v) for k, v in files.items()]
+        + [("rem/bldrx-manifest.json", _manifest(files, "blake2b"))],
+    )
+    engine = _engine(tmp_path)
+    _no_copies(monkeypatch)
+    installed = engine.fetch_remote_template(tar.as_uri())
+    assert installed == tmp_path / "user_templates" / "rem"
+    assert (installed / "sub" / "b.txt").read_bytes() == b"B" * 3000
+    # nothing but the installed template (and its lock file) is left behind
+    assert [p.name for p in (tmp_path / "user_templates").iterdir() if p.is_dir()] == [
+        "rem"
+    ]
+
+
+def test_mismatch_leaves_nothing_installed(tmp_path):
+    files = {"a.txt": b"A"}
+    tar = _tar(
+        tmp_path,
+        [("rem/bldrx-manifest.json", _manifest(files)), ("rem/a.txt", b"tampered")],
+    )
+    engine = _engine(tmp_path)
+    with pytest.raises(RuntimeError, match="mismatches"):
+        engine.fetch_remote_template(tar.as_uri())
+    root = tmp_path / "user_templates"
+    assert not [p for p in root.iterdir() if p.is_dir()]
+    assert engine.list_templates() == []
+
+
+def test_link_members_are_rejected(tmp_path):
+    path = tmp_path / "links.tar.gz"
+    with tarfile.open(path, "w:gz") as tf:
+        info = tarfile.TarInfo("rem/evil")
+        info.type = tarfile.SYMTYPE
+        info.linkname = "/etc/passwd"
+        tf.addfile(info)
+    with pytest.raises(RuntimeError, match="Unsafe archive"):
+        _engine(tmp_path).fetch_remote_template(path.as_uri())
+
+
+def test_force_replaces_existing_and_flat_archives_use_archive_name(tmp_path):
+    engine = _engine(tmp_path)
+    zpath = tmp_path / "flat.zip"
+    with zipfile.ZipFile(zpath, "w") as zf:
+        zf.writestr("one.txt", "1")
+        zf.writestr("two.txt", "2")
+    installed = engine.fetch_remote_template(str(zpath))
+    assert installed.name == "flat" and (installed / "two.txt").read_text() == "2"
+    with pytest.raises(FileExistsError):
+        engine.fetch_remote_template(str(zpath))
+    (installed / "stale.txt").write_text("old")
+    engine.fetch_remote_template(str(zpath), force=True)
+    assert not (installed / "stale.txt").exists()
+    assert sorted(p.name for p in installed.iterdir()) == ["one.txt", "two.txt"]
+
+
+def test_directory_source_is_copied_once(tmp_path, monkeypatch):
+    src = tmp_path / "src" / "dirtpl"
+    (src / "x").mkdir(parents=True)
+    (src / "x" / "f.txt").write_text("f")
+    (src / "bldrx-manifest.json").write_bytes(_manifest({"x/f.txt": b"f"}))
+    engine = _engine(tmp_path)
+    _no_copies(monkeypatch)
+    installed = engine.fetch_remote_template(str(src))
+    assert (installed / "x" / "f.txt").read_text() == "f"
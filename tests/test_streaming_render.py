@@ -0,0 +1,72 @@
+import pytest
+
+from bldrx.engine import Engine
+
+
+def _make_template(tmp_path):
+    templates = tmp_path / "templates"
+    t = templates / "big"
+    t.mkdir(parents=True)
+    (t / "CODEOWNERS.j2").write_text(
+        "{% for i in range(count) %}/pkg{{ i }}/ @{{ owner }}\n{% endfor %}"
+    )
+    engine = Engine(
+        templates_root=templates, user_templates_root=tmp_path / "user_templates"
+    )
+    return engine
+
+
+def test_stream_matches_in_memory_render(tmp_path):
+    engine = _make_template(tmp_path)
+    meta = {"count": 5000, "owner": "team"}
+    a = tmp_path / "a"
+    b = tmp_path / "b"
+    list(engine.apply_template("big", a, meta, atomic=True))
+    list(engine.apply_template("big", b, meta, atomic=True, stream=True))
+    assert (a / "CODEOWNERS").read_bytes() == (b / "CODEOWNERS").read_bytes()
+    # no temp files left behind
+    assert [p.name for p in b.iterdir()] == ["CODEOWNERS"]
+
+
+def test_stream_does_not_materialize_output(tmp_path, monkeypatch):
+    engine = _make_template(tmp_path)
+
+    def _no_render(self, *args, **kwargs):
+        raise AssertionError("Template.render should not be used when streaming")
+
+    monkeypatch.setattr("jinja2.Template.render", _no_render)
+    dest = tmp_path / "project"
+    res = list(
+        engine.apply_template(
+            "big", dest, {"count": 3, "owner": "x"}, atomic=False, stream=True
+        )
+    )
+    assert res == [(str(dest / "CODEOWNERS"), "rendered")]
+
+
+@pytest.mark.parametrize("merge", ["append", "prepend"])
+def test_stream_merge_matches_in_memory(tmp_path, merge):
+    engine = _make_template(tmp_path)
+    meta = {"count": 3, "owner": "team"}
+    results = []
+    for name, stream in (("mem", False), ("stream", True)):
+        dest = tmp_path / name
+        dest.mkdir()
+        (dest / "CODEOWNERS").write_text("* @existing\n\n\n")
+        list(
+            engine.apply_template(
+                "big", dest, meta, atomic=True, merge=merge, stream=stream
+            )
+        )
+        results.append((dest / "CODEOWNERS").read_text())
+    assert results[0] == results[1]
+    assert "* @existing" in results[1]
+
+
+def test_stream_render_error_leaves_no_temp_file(tmp_path):
+    engine = _make_template(tmp_path)
+    dest = tmp_path / "project"
+    with pytest.raises(Exception):
+        # `owner` missing: StrictUndefined raises while streaming
+        list(engine.apply_template("big", dest, {"count": 2}, atomic=True, stream=True))
+    assert list(dest.iterdir()) == []
@@ -0,0 +1,161 @@
+import contextlib
+import io
+import os
+import shutil
+import tarfile
+
+import pytest
+from click.testing import CliRunner
+
+from bldrx.cli import cli
+from bldrx.engine import Engine
+from bldrx.install import StagedInstall
+from bldrx.store import BlobStore, TemplateStore
+
+
+def _src(tmp_path, name, files):
+    src = tmp_path / "src" / name
+    for rel, data in files.items():
+        (src / rel).parent.mkdir(parents=True, exist_ok=True)
+        (src / rel).write_text(data)
+    return src
+
+
+def _engine(tmp_path):
+    return Engine(
+        templates_root=tmp_path / "templates",
+        user_templates_root=tmp_path / "home" / "templates",
+    )
+
+
+def test_linked_installs_share_blobs_and_gc_by_refcount(tmp_path):
+    engine = _engine(tmp_path)
+    store = engine.template_store
+    assert store.root == tmp_path / "home" / "store"
+    a = engine.install_user_template(
+        _src(tmp_path, "a", {"LICENSE": "MIT", "a.txt": "A"}), link=True
+    )
+    b = engine.install_user_template(
+        _src(tmp_path, "b", {"LICENSE": "MIT", "ci/lint.yml": "x"}), link=True
+    )
+    assert os.stat(a / "LICENSE").st_ino == os.stat(b / "LICENSE").st_ino
+    assert store.stats() == {"installs": 2, "blobs": 3, "bytes": 5}
+
+    engine.uninstall_user_template("a")
+    assert store.stats()["blobs"] == 2  # a.txt gone, LICENSE still used by b
+    assert (b / "LICENSE").read_text() == "MIT"
+    engine.uninstall_user_template("b")
+    assert store.stats() == {"installs": 0, "blobs": 0, "bytes": 0}
+
+
+def test_reinstall_only_stores_changed_files(tmp_path, monkeypatch):
+    engine = _engine(tmp_path)
+    files = {f"f{i}.txt": str(i) for i in range(10)}
+    src = _src(tmp_path, "t", files)
+    engine.install_user_template(src, link=True)
+    (src / "f3.txt").write_text("changed")
+    stored = []
+    real = BlobStore.put_file
+
+    def spy(self, path, *a, **kw):
+        stored.append(path.name)
+        return real(self, path, *a, **kw)
+
+    monkeypatch.setattr(BlobStore, "put_file", spy)
+    dest = engine.install_user_template(src, link=True, force=True)
+    assert stored == ["f3.txt"]
+    assert (dest / "f3.txt").read_text() == "changed"
+    # the replaced blob lost its only reference
+    assert engine.template_store.stats()["blobs"] == 10
+
+
+def test_executable_bit_is_part_of_the_blob_key(tmp_path):
+    engine = _engine(tmp_path)
+    a = _src(tmp_path, "a", {"run.sh": "echo"})
+    b = _src(tmp_path, "b", {"run.sh": "echo"})
+    os.chmod(b / "run.sh", 0o755)
+    ia = engine.install_user_template(a, link=True)
+    ib = engine.install_user_template(b, link=True)
+    assert os.stat(ib / "run.sh").st_mode & 0o111
+    assert not os.stat(ia / "run.sh").st_mode & 0o111
+
+
+def test_fetch_remote_can_link_and_gc_drops_stale_records(tmp_path):
+    engine = _engine(tmp_path)
+    engine.install_user_template(_src(tmp_path, "a", {"LICENSE": "MIT"}), link=True)
+    tar = tmp_path / "rem.tar.gz"
+    with tarfile.open(tar, "w:gz") as tf:
+        info = tarfile.TarInfo("rem/LICENSE")
+        info.size = 3
+        tf.addfile(info, io.BytesIO(b"MIT"))
+    rem = engine.fetch_remote_template(tar.as_uri(), link=True)
+    assert (
+        os.stat(rem / "LICENSE").st_ino
+        == os.stat(engine.user_templates_root / "a" / "LICENSE").st_ino
+    )
+
+    # removing install dirs behind bldrx's back leaves stale records for gc
+    shutil.rmtree(rem)
+    shutil.rmtree(engine.user_templates_root / "a")
+    env = {"BLDRX_TEMPLATES_DIR": str(engine.user_templates_root)}
+    res = CliRunner().invoke(cli, ["store", "gc"], env=env)
+    assert res.exit_code == 0, res.output
+    assert "Removed 2 stale installs and 1 blobs" in res.output
+
+
+def test_failed_linked_install_leaves_no_blobs(tmp_path, monkeypatch):
+    engine = _engine(tmp_path)
+    store = engine.template_store
+    engine.install_user_template(
+        _src(tmp_path, "t", {"LICENSE": "MIT", "a.txt": "A"}), link=True
+    )
+    before = sorted(store.blobs.digests())
+    new = _src(tmp_path, "t2", {"LICENSE": "MIT", "b.txt": "new"})
+
+    # the destination check runs before anything is linked into the store
+    with pytest.raises(FileExistsError):
+        engine.install_user_template(new, name="t", link=True)
+    assert sorted(store.blobs.digests()) == before
+
+    # a commit that fails after linking releases the blobs it added, but not shared ones
+    def fail(self, *a, **kw):
+        raise OSError("simulated rename failure")
+
+    monkeypatch.setattr(StagedInstall, "commit", fail)
+    with pytest.raises(OSError):
+        engine.install_user_template(new, name="t", link=True, force=True)
+    tar = tmp_path / "rem.tar"
+    with tarfile.open(tar, "w") as tf:
+        info = tarfile.TarInfo("rem/c.txt")
+        info.size = 3
+        tf.addfile(info, io.BytesIO(b"new"))
+    with pytest.raises(OSError):
+        engine.fetch_remote_template(str(tar), link=True)
+    assert sorted(store.blobs.digests()) == before
+    assert (engine.user_templates_root / "t" / "a.txt").read_text() == "A"
+
+
+def test_install_paths_take_template_lock_before_store_lock(tmp_path, monkeypatch):
+    engine = _engine(tmp_path)
+    events = []
+    real_template, real_store = engine.locks.user_template, TemplateStore.lock
+
+    @contextlib.contextmanager
+    def _logged(tag, cm):
+        with cm:
+            events.append(tag)
+            yield
+
+    monkeypatch.setattr(
+        engine.locks,
+        "user_template",
+        lambda *a, **kw: _logged("template", real_template(*a, **kw)),
+    )
+    monkeypatch.setattr(
+        TemplateStore, "lock", lambda self: _logged("store", real_store(self))
+    )
+    src = _src(tmp_path, "t", {"a.txt": "A"})
+    engine.install_user_template(src, link=True)
+    engine.install_user_template(src, force=True)  # copy over a linked install
+    engine.fetch_remote_template(str(src), name="t", link=True, force=True)
+    assert events == ["template", "store"] * 3
@@ -0,0 +1,98 @@
+import json
+import os
+import time
+
+import bldrx.hashing as hashing
+from bldrx.engine import Engine
+
+
+def _age(path, seconds=60):
+    t = time.time() - seconds
+    os.utime(path, (t, t))
+
+
+def _setup(tmp_path, monkeypatch):
+    monkeypatch.setenv("BLDRX_CACHE_DIR", str(tmp_path / "cache"))
+    t = tmp_path / "templates" / "vc"
+    t.mkdir(parents=True)
+    for i in range(4):
+        (t / f"f{i}.txt").write_text(f"content {i}")
+    engine = Engine(
+        templates_root=tmp_path / "templates", user_templates_root=tmp_path / "u"
+    )
+    engine.generate_manifest("vc", write=True)
+    for p in t.iterdir():
+        _age(p)
+    hashed = []
+    real = hashing.hash_files
+
+    def spy(paths, *a, **kw):
+        paths = list(paths)
+        hashed.append(sorted(p.name for p in paths))
+        return real(paths, *a, **kw)
+
+    monkeypatch.setattr(hashing, "hash_files", spy)
+    return engine, t, hashed
+
+
+def test_repeat_verification_only_rehashes_changed_files(tmp_path, monkeypatch):
+    engine, t, hashed = _setup(tmp_path, monkeypatch)
+    assert engine.verify_template("vc")["ok"]
+    assert hashed[-1] == ["f0.txt", "f1.txt", "f2.txt", "f3.txt"]
+    assert list((tmp_path / "cache" / "verify").glob("*.json"))
+
+    assert engine.verify_template("vc")["ok"]
+    assert hashed[-1] == []
+
+    # same size and restored mtime: only the ctime gives the change away
+    st = (t / "f2.txt").stat()
+    (t / "f2.txt").write_text("content X")
+    os.utime(t / "f2.txt", ns=(st.st_atime_ns, st.st_mtime_ns))
+    res = engine.verify_template("vc")
+    assert not res["ok"] and res["mismatches"] == ["f2.txt"]
+    assert hashed[-1] == ["f2.txt"]
+
+
+def test_paranoid_rehashes_everything(tmp_path, monkeypatch):
+    engine, _t, hashed = _setup(tmp_path, monkeypatch)
+    engine.verify_template("vc")
+    assert engine.verify_template("vc", paranoid=True)["ok"]
+    assert len(hashed[-1]) == 4
+
+
+def test_recently_modified_files_are_not_cached(tmp_path, monkeypatch):
+    engine, t, hashed = _setup(tmp_path, monkeypatch)
+    (t / "f0.txt").write_text("content 0")  # same content, fresh mtime
+    engine.verify_template("vc")
+    engine.verify_template("vc")
+    assert hashed[-1] == ["f0.txt"]
+
+
+def test_cache_files_are_bounded_and_drop_deleted_files(tmp_path):
+    cache_dir = tmp_path / "cache"
+    roots = []
+    for i in range(3):
+        root = tmp_path / f"root{i}"
+        root.mkdir()
+        for name in ("a.txt", "b.txt"):
+            (root / name).write_text(name)
+            _age(root / name)
+        roots.append(root)
+
+    def _cached(root):
+        cache = hashing.HashCache(root, cache_dir=cache_dir, limit=2)
+        hashing.hash_tree(root, cache=cache)
+        return cache.path
+
+    first, second = _cached(roots[0]), _cached(roots[1])
+    _age(first, 30)
+    _age(second, 20)
+    # using a cache (even without changes) marks it as recently used
+    _cached(roots[0])
+    third = _cached(roots[2])
+    assert sorted((cache_dir / "verify").iterdir()) == sorted([first, third])
+
+    (roots[2] / "b.txt").unlink()
+    cache = hashing.HashCache(roots[2], cache_dir=cache_dir, limit=2)
+    hashing.hash_tree(roots[2], cache=cache)
+    assert list(json.loads(cache.path.read_text())["entries"]) == ["a.txt"]